@@ -152,7 +152,8 @@ general = (
     Dependency('scipy', 'Used for some image processing calculation'),
     Dependency('skimage',
                'Used to read popular image formats (jpeg, png, etc.)',
-               'scikit-image'))
+               'scikit-image'),
+    Dependency('pyarrow', 'Used to read Apache Arrow tables and Parquet/Feather files'))
 
 
 ipython = (
@@ -18,7 +18,7 @@ from glue.main import load_plugins
 from glue.icons.qt import get_icon
 from glue.utils.qt import get_qapp
 from glue.app.qt.actions import action
-from glue.dialogs.data_wizard.qt import data_wizard
+from glue.dialogs.data_wizard.qt import data_wizard, GlueDataDialog
 from glue.dialogs.link_editor.qt import LinkEditor
 from glue.app.qt.edit_subset_mode_toolbar import EditSubsetModeToolBar
 from glue.app.qt.mdi_area import GlueMdiArea, GlueMdiSubWindow
@@ -305,6 +305,25 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
 
         self.addToolBar(self._mode_toolbar)
 
+        # Progress of files being loaded in the background
+
+        self._load_progress = QtWidgets.QProgressBar()
+        self._load_progress.setMaximumWidth(200)
+        self._load_progress.setRange(0, 100)
+        self._load_progress.hide()
+
+        self._button_cancel_load = QtWidgets.QToolButton()
+        self._button_cancel_load.setText("Cancel")
+        self._button_cancel_load.clicked.connect(nonpartial(self.cancel_loading))
+        self._button_cancel_load.hide()
+
+        self.statusBar().addPermanentWidget(self._load_progress)
+        self.statusBar().addPermanentWidget(self._button_cancel_load)
+
+        self._load_timer = QtCore.QTimer()
+        self._load_timer.setInterval(100)
+        self._load_timer.timeout.connect(self.process_loaded_data)
+
         # Error console toolbar
 
         self._console_toolbar = QtWidgets.QToolBar()
@@ -605,8 +624,10 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
         menu.addAction("Version information", show_glue_info)
 
     def _choose_load_data(self, data_importer=None):
-        if data_importer is None:
-            self.add_datasets(self.data_collection, data_wizard())
+        if data_importer is None or data_importer is data_wizard:
+            paths, factory = GlueDataDialog(parent=self).choose_files()
+            if paths:
+                self.load_data_async(paths, factory=factory.function)
         else:
             data = data_importer()
             if not isinstance(data, list):
@@ -839,7 +860,7 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
         return ga
 
     @staticmethod
-    def restore_session(path, show=True):
+    def restore_session(path, show=True, lazy=None):
         """
         Reload a previously-saved session
 
@@ -849,13 +870,16 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
             Path to the file to load
         show : bool, optional
             If True (the default), immediately show the widget
+        lazy : bool, optional
+            If True, only read data files once their values are needed (see
+            :meth:`glue.core.application_base.Application.restore_session`)
 
         Returns
         -------
         app : :class:`glue.app.qt.application.GlueApplication`
             The loaded application
         """
-        ga = Application.restore_session(path)
+        ga = Application.restore_session(path, lazy=lazy)
         if show:
             ga.start(block=False)
         return ga
@@ -957,6 +981,8 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
 
         urls = event.mimeData().urls()
 
+        paths = []
+
         for url in urls:
 
             # Get path to file
@@ -968,7 +994,9 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
                 if path.startswith('/') and path[2] == ':':
                     path = path[1:]
 
-            self.load_data(path)
+            paths.append(path)
+
+        self.load_data_async(paths)
         event.accept()
 
     def closeEvent(self, event):
@@ -977,9 +1005,45 @@ class GlueApplication(Application, QtWidgets.QMainWindow):
             for viewer in tab:
                 viewer.close(warn=False)
         self._log.close()
+        self._load_timer.stop()
+        self._loader.shutdown()
         self._hub.broadcast(ApplicationClosedMessage(None))
         event.accept()
 
+    def load_data_async(self, paths, factory=None, **kwargs):
+        tasks = super(GlueApplication, self).load_data_async(paths, factory=factory, **kwargs)
+        self._load_timer.start()
+        return tasks
+
+    load_data_async.__doc__ = Application.load_data_async.__doc__
+
+    def process_loaded_data(self):
+        # Opening the merge dialog or an error message runs a nested event
+        # loop, so we make sure we don't process datasets recursively.
+        if getattr(self, '_processing_loaded_data', False):
+            return
+        self._processing_loaded_data = True
+        try:
+            super(GlueApplication, self).process_loaded_data()
+        finally:
+            self._processing_loaded_data = False
+        if self._loader.busy:
+            self._update_load_progress()
+        else:
+            self._load_timer.stop()
+
+    def _on_load_progress(self, finished, total):
+        super(GlueApplication, self)._on_load_progress(finished, total)
+        self._update_load_progress()
+
+    def _update_load_progress(self):
+        finished, total = self._loader.progress
+        loading = finished < total
+        self._load_progress.setFormat("Loading data ({0}/{1})".format(finished, total))
+        self._load_progress.setValue(int(100 * self._loader.fraction))
+        self._load_progress.setVisible(loading)
+        self._button_cancel_load.setVisible(loading)
+
     def report_error(self, message, detail):
         """
         Display an error in a modal
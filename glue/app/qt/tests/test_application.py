@@ -176,9 +176,10 @@ class TestGlueApplication(object):
         e = MagicMock()
         e.mimeData.return_value = m
         load = MagicMock()
-        self.app.load_data = load
+        self.app.load_data_async = load
         self.app.dropEvent(e)
         assert load.call_count == 1
+        assert load.call_args[0][0] == ['test.fits']
 
     def test_subset_facet(self):
         # regression test for 335
@@ -696,3 +696,19 @@ settings.add('BACKGROUND_COLOR', '#FFFFFF')
 settings.add('FOREGROUND_COLOR', '#000000')
 settings.add('SHOW_LARGE_DATA_WARNING', True, validator=bool)
 settings.add('INDIVIDUAL_SUBSET_COLOR', False, validator=bool)
+settings.add('SUBSET_MASK_CACHE_SIZE', 128 * 1024 ** 2, validator=int)
+settings.add('SPATIAL_INDEX_MIN_SIZE', 1000000, validator=int)
+settings.add('DERIVED_COMPONENT_CACHE_SIZE', 128 * 1024 ** 2, validator=int)
+settings.add('EXPRESSION_CHUNK_SIZE', 1024 ** 2, validator=int)
+settings.add('ROW_GROUP_CACHE_SIZE', 256 * 1024 ** 2, validator=int)
+settings.add('FLOAT32_COMPONENTS', False, validator=bool)
+settings.add('DATA_LOADER_WORKERS', 4, validator=int)
+settings.add('FITS_DECOMPRESS_THREADS', 4, validator=int)
+settings.add('HDF5_CHUNK_CACHE_SIZE', 256 * 1024 ** 2, validator=int)
+settings.add('TABLE_STREAMING_MIN_SIZE', 16 * 1024 ** 2, validator=int)
+settings.add('DATA_CACHE', False, validator=bool)
+settings.add('DATA_CACHE_DIR', os.path.join(CFG_DIR, 'data_cache'))
+settings.add('DATA_CACHE_SIZE', 8 * 1024 ** 3, validator=int)
+settings.add('LAZY_SESSION_RESTORE', False, validator=bool)
+settings.add('HISTOGRAM_CACHE_SIZE', 512 * 1024 ** 2, validator=int)
+settings.add('SPATIAL_INDEX_CACHE_SIZE', 512 * 1024 ** 2, validator=int)
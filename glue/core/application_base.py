@@ -8,7 +8,7 @@ from glue.core.edit_subset_mode import EditSubsetMode
 from glue.core.hub import HubListener
 from glue.core import Data, Subset
 from glue.core import command
-from glue.core.data_factories import load_data
+from glue.core.data_factories import load_data, start_deferred_loading, DataLoader
 from glue.core.data_collection import DataCollection
 from glue.config import settings
 from glue.utils import as_list, PropertySetMixin
@@ -63,6 +63,11 @@ class Application(HubListener):
         for key, value, validator in settings:
             self._settings[key] = [value, validator]
 
+        self._loader = DataLoader(on_load=self._on_data_loaded,
+                                  on_error=self._on_load_error,
+                                  on_progress=self._on_load_progress)
+        self._loaded = []
+
     @property
     def session(self):
         return self._session
@@ -98,15 +103,21 @@ class Application(HubListener):
 
         Note: Saving of client is not currently supported. Thus,
         restoring this session will lose all current viz windows
+
+        If ``include_data`` is `True`, the session is saved as a bundle in
+        which the arrays are stored in binary form next to the JSON state.
         """
         from glue.core.state import GlueSerializer
         gs = GlueSerializer(self, include_data=include_data)
+        if include_data:
+            gs.dump_bundle(path, indent=2)
+            return
         state = gs.dumps(indent=2)
         with open(path, 'w') as out:
             out.write(state)
 
     @staticmethod
-    def restore_session(path):
+    def restore_session(path, lazy=None):
         """
         Reload a previously-saved session
 
@@ -114,18 +125,35 @@ class Application(HubListener):
         ----------
         path : str
             Path to the file to load
+        lazy : bool, optional
+            If `True`, data files referenced by the session are only read
+            once their values are needed. The files for datasets shown in
+            viewers are read straight away in the background, while others
+            are read the first time they are used (e.g. by a subset or link).
+            Defaults to the ``LAZY_SESSION_RESTORE`` setting.
 
         Returns
         -------
         app : :class:`Application`
             The loaded application
         """
-        from glue.core.state import GlueUnSerializer
+        from glue.core.state import GlueUnSerializer, is_bundle
 
-        with open(path) as infile:
-            state = GlueUnSerializer.load(infile)
+        if is_bundle(path):
+            state = GlueUnSerializer.load_bundle(path)
+        else:
+            with open(path) as infile:
+                state = GlueUnSerializer.load(infile)
 
-        return state.object('__main__')
+        if lazy is None:
+            lazy = settings.LAZY_SESSION_RESTORE
+
+        state.defer_loading = lazy
+
+        try:
+            return state.object('__main__')
+        finally:
+            state.close()
 
     def new_tab(self):
         raise NotImplementedError()
@@ -170,6 +198,48 @@ class Application(HubListener):
         self.add_datasets(self.data_collection, d)
         return d
 
+    def load_data_async(self, paths, factory=None, **kwargs):
+        """
+        Start loading one or more files in the background.
+
+        Each `Data` object is added to the data collection as soon as its file
+        has been read, and merges are suggested once all the files have been
+        read. Files are only added when :meth:`process_loaded_data` is called,
+        which subclasses should do regularly (e.g. from a timer).
+
+        This returns a list of :class:`~glue.core.data_factories.LoadTask`.
+        """
+        return self._loader.submit(paths, factory=factory, **kwargs)
+
+    def process_loaded_data(self):
+        """
+        Add the datasets read in the background since the last call to the
+        data collection.
+        """
+        self._loader.process()
+
+    def cancel_loading(self):
+        """
+        Cancel the loading of files started with :meth:`load_data_async`.
+        """
+        self._loader.cancel()
+
+    def _on_data_loaded(self, task):
+        datasets = as_flat_data_list(task.result)
+        self.data_collection.extend(datasets)
+        self._loaded.extend(datasets)
+
+    def _on_load_error(self, task):
+        self.report_error("Could not load data from {0}\n{1}".format(task.path, task.error),
+                          task.detail)
+
+    def _on_load_progress(self, finished, total):
+        if finished == total and self._loaded:
+            # Datasets may have been removed while other files were loading
+            loaded = [data for data in self._loaded if data in self.data_collection]
+            self._loaded = []
+            self._suggest_merges(self.data_collection, loaded)
+
     @catch_error("Could not add data")
     def add_data(self, *args, **kwargs):
         """
@@ -248,6 +318,10 @@ class Application(HubListener):
 
         datasets = as_flat_data_list(datasets)
         data_collection.extend(datasets)
+        cls._suggest_merges(data_collection, datasets)
+
+    @classmethod
+    def _suggest_merges(cls, data_collection, datasets):
 
         # We now check whether any of the datasets can be merged. We need to
         # make sure that datasets are only ever shown once, as we don't want
@@ -314,6 +388,8 @@ class Application(HubListener):
         # manually register the newly-created session, which
         # the viewers need
         context.register_object(rec['session'], self.session)
+        if context.defer_loading:
+            cls._start_deferred_loading(rec, context)
         for i, tab in enumerate(rec['viewers']):
             if self.tab(i) is None:
                 self.new_tab()
@@ -322,6 +398,32 @@ class Application(HubListener):
                 self.add_widget(viewer, tab=i, hold_position=True)
         return self
 
+    @staticmethod
+    def _start_deferred_loading(rec, context):
+        # Start reading the files for the datasets shown in viewers, so that
+        # they are read in parallel rather than one after the other as each
+        # viewer is restored.
+        for tab in rec['viewers']:
+            for v in tab:
+                for layer in context._rec[v].get('layers', []):
+                    # Viewers based on state classes save the layer in the
+                    # record of the layer state, which we read rather than
+                    # restore the state, since that can access the data.
+                    if 'layer' in layer:
+                        layer = layer['layer']
+                    elif 'state' in layer:
+                        state = context._rec.get(layer['state'], {})
+                        layer = state.get('values', {}).get('layer')
+                    else:
+                        continue
+                    if layer is None:
+                        continue
+                    layer = context.object(layer)
+                    if isinstance(layer, Subset):
+                        layer = layer.data
+                    if isinstance(layer, Data):
+                        start_deferred_loading(layer)
+
 
 class ViewerBase(HubListener, PropertySetMixin):
 
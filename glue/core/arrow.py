@@ -0,0 +1,138 @@
+"""
+This module provides functions to create components and datasets from Apache
+Arrow arrays and tables (from the optional pyarrow package).
+
+Numerical columns without missing values are used without copying the
+underlying buffers, and string columns are dictionary-encoded by Arrow (if
+they are not already), after which the dictionary indices are used directly
+as the codes of a :class:`~glue.core.component.CategoricalComponent`, rather
+than being converted to Python strings and factorized again.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+
+__all__ = ['is_arrow_array', 'arrow_to_numpy', 'arrow_to_component', 'arrow_to_data']
+
+
+def is_arrow_array(data):
+    """
+    Return whether ``data`` is an Arrow array or chunked array.
+    """
+    # We check the module name to avoid importing pyarrow when it is not
+    # needed, since this is called for all new components.
+    if not type(data).__module__.startswith('pyarrow'):
+        return False
+    import pyarrow as pa
+    return isinstance(data, (pa.Array, pa.ChunkedArray))
+
+
+def _chunks(array):
+    import pyarrow as pa
+    if isinstance(array, pa.ChunkedArray):
+        return array.chunks
+    else:
+        return [array]
+
+
+def _to_numpy(chunks):
+    """
+    Convert a list of Arrow arrays to a single Numpy array. If there is a
+    single chunk without missing values, the buffer is shared if possible.
+    """
+    arrays = [chunk.to_numpy(zero_copy_only=False) for chunk in chunks]
+    if len(arrays) == 0:
+        return np.zeros(0)
+    elif len(arrays) == 1:
+        return arrays[0]
+    else:
+        return np.concatenate(arrays)
+
+
+def arrow_to_numpy(array):
+    """
+    Convert an Arrow array or chunked array to a Numpy array, sharing the
+    underlying buffer if possible. Missing numerical values are set to NaN.
+    """
+    return _to_numpy(_chunks(array))
+
+
+def _dictionary_to_codes(array):
+    """
+    Return the codes and categories for a dictionary-encoded Arrow array, where
+    missing values are given a code of -1.
+    """
+
+    import pyarrow as pa
+
+    if isinstance(array, pa.ChunkedArray):
+        # Make sure all chunks use the same dictionary
+        array = array.unify_dictionaries()
+
+    chunks = _chunks(array)
+
+    if len(chunks) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=object)
+
+    categories = chunks[0].dictionary.to_numpy(zero_copy_only=False)
+    codes = _to_numpy([chunk.indices.fill_null(-1) for chunk in chunks])
+
+    return codes, categories
+
+
+def arrow_to_component(array, units=None):
+    """
+    Convert an Arrow array or chunked array to a component.
+
+    Dictionary-encoded and string arrays are converted to categorical
+    components, numerical and boolean arrays are converted to regular
+    components (with missing values set to NaN), and other types are
+    converted to Numpy arrays and passed to
+    :meth:`~glue.core.component.Component.autotyped`.
+
+    Parameters
+    ----------
+    array : `pyarrow.Array` or `pyarrow.ChunkedArray`
+        The array to convert
+    units : str, optional
+        The units of the values
+    """
+
+    import pyarrow as pa
+    from glue.core.component import Component, CategoricalComponent
+
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        array = array.dictionary_encode()
+
+    if pa.types.is_dictionary(array.type):
+        codes, categories = _dictionary_to_codes(array)
+        return CategoricalComponent.from_codes(codes, categories, units=units)
+
+    if (pa.types.is_integer(array.type) or pa.types.is_floating(array.type) or
+            pa.types.is_boolean(array.type)):
+        return Component(arrow_to_numpy(array), units=units)
+
+    return Component.autotyped(arrow_to_numpy(array), units=units)
+
+
+def arrow_to_data(table, label=""):
+    """
+    Convert an Arrow table or record batch to a
+    :class:`~glue.core.data.Data` object, with one component per column.
+
+    Parameters
+    ----------
+    table : `pyarrow.Table` or `pyarrow.RecordBatch`
+        The table to convert
+    label : str, optional
+        The label of the dataset
+    """
+
+    from glue.core.data import Data
+
+    result = Data(label=label)
+    for name, column in zip(table.column_names, table.columns):
+        result.add_component(arrow_to_component(column), str(name))
+
+    return result
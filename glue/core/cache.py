@@ -0,0 +1,113 @@
+"""
+This module provides a least-recently-used cache for arrays computed by glue
+(such as subset masks or the values of derived components), which is bounded
+by the total size of the cached arrays rather than by the number of items.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import numbers
+from collections import OrderedDict
+
+from glue.config import settings
+
+__all__ = ['ArrayCache', 'view_key']
+
+
+class ArrayCache(object):
+    """
+    A least-recently-used cache for arrays.
+
+    Once the total size of the cached arrays exceeds the memory budget, the
+    least recently used arrays are discarded.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached arrays, in bytes. If not
+        specified, the value of the setting given by ``size_setting`` is used.
+    """
+
+    # The name of the setting that gives the default memory budget
+    size_setting = None
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._arrays = OrderedDict()
+        self._size = 0
+
+    @property
+    def max_size(self):
+        """
+        The maximum total size of the cached arrays, in bytes
+        """
+        if self._max_size is None:
+            return getattr(settings, self.size_setting)
+        else:
+            return self._max_size
+
+    @property
+    def size(self):
+        """
+        The total size of the cached arrays, in bytes
+        """
+        return self._size
+
+    def __len__(self):
+        return len(self._arrays)
+
+    def __contains__(self, key):
+        return key in self._arrays
+
+    def get(self, key):
+        """
+        Return the array for ``key``, or `None` if it is not in the cache.
+        """
+        try:
+            array = self._arrays.pop(key)
+        except KeyError:
+            return None
+        # Re-insert the array so that it is marked as the most recently used
+        self._arrays[key] = array
+        return array
+
+    def set(self, key, array):
+        """
+        Add an array to the cache, evicting older arrays if needed.
+        """
+
+        if key in self._arrays:
+            self._size -= self._arrays.pop(key).nbytes
+
+        # Arrays that would not fit in the cache even if empty are not stored
+        if array.nbytes > self.max_size:
+            return
+
+        self._arrays[key] = array
+        self._size += array.nbytes
+
+        while self._size > self.max_size:
+            _, oldest = self._arrays.popitem(last=False)
+            self._size -= oldest.nbytes
+
+    def clear(self):
+        """
+        Remove all arrays from the cache.
+        """
+        self._arrays.clear()
+        self._size = 0
+
+
+def view_key(view):
+    """
+    Convert a view to a hashable key. Raises a `TypeError` if the view cannot
+    be represented by a key, e.g. for boolean or integer index arrays.
+    """
+    if view is None or view is Ellipsis or isinstance(view, numbers.Integral):
+        return view
+    elif isinstance(view, slice):
+        return (slice, view.start, view.stop, view.step)
+    elif isinstance(view, tuple):
+        return tuple(view_key(v) for v in view)
+    else:
+        raise TypeError("Cannot use view of type {0} as a key".format(type(view)))
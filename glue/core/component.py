@@ -1,7 +1,9 @@
 from __future__ import absolute_import, division, print_function
 
 import logging
+import numbers
 import operator
+import threading
 import warnings
 
 import numpy as np
@@ -13,13 +15,14 @@ from glue.core.subset import (RoiSubsetState, RangeSubsetState,
                               CategoricalROISubsetState2D)
 from glue.core.roi import (PolygonalROI, CategoricalROI, RangeROI, XRangeROI,
                            YRangeROI, RectangularROI)
-from glue.core.util import row_lookup
+from glue.core.cache import ArrayCache, view_key
+from glue.core.arrow import is_arrow_array, arrow_to_component
 from glue.utils import (unique, shape_to_string, coerce_numeric, check_sorted,
                         polygon_line_intersections, broadcast_to)
 
 
 __all__ = ['Component', 'DerivedComponent', 'CategoricalComponent',
-           'CoordinateComponent']
+           'CoordinateComponent', 'LazyComponent', 'DerivedValueCache']
 
 
 class Component(object):
@@ -92,6 +95,34 @@ class Component(object):
         logging.debug("Using %s to index data of shape %s", key, self.shape)
         return self._data[key]
 
+    def _append(self, values):
+        """
+        Append values to a one-dimensional component.
+
+        Returns `True` if the existing values are unchanged, which is always
+        the case for numerical components.
+        """
+        values = coerce_numeric(np.asarray(values))
+        # Appending floating-point values shouldn't change the precision of
+        # floating-point components (e.g. if they were converted to float32)
+        if values.dtype.kind == 'f' and self._data.dtype.kind == 'f':
+            values = values.astype(self._data.dtype, copy=False)
+        self._data, self._buffer = _append_values(self._data,
+                                                  getattr(self, '_buffer', None),
+                                                  values)
+        return True
+
+    def to_float32(self):
+        """
+        Convert double-precision floating-point values to single precision,
+        which halves the memory used. Other types of values are left
+        unchanged.
+        """
+        if isinstance(self._data, np.ndarray) and self._data.dtype == np.float64:
+            self._data = self._data.astype(np.float32)
+            self._data.setflags(write=False)
+            self._buffer = None
+
     @property
     def numeric(self):
         """
@@ -200,6 +231,21 @@ class Component(object):
 
         :returns: A Component (or subclass)
         """
+        if is_arrow_array(data):
+            return arrow_to_component(data, units=units)
+
+        if _is_lazy_array(data) and np.issubdtype(data.dtype, np.number):
+            return LazyComponent(data, units=units)
+
+        # Pandas categorical data can be used directly without finding the
+        # unique labels again
+        if (isinstance(data, (pd.Series, pd.Categorical)) and
+                str(data.dtype) == 'category'):
+            categorical = data.cat if isinstance(data, pd.Series) else data
+            return CategoricalComponent.from_codes(categorical.codes,
+                                                   categorical.categories.values,
+                                                   units=units)
+
         data = np.asarray(data)
 
         if np.issubdtype(data.dtype, np.object_):
@@ -220,9 +266,261 @@ class Component(object):
             return Component(n, units=units)
 
 
+class LazyComponent(Component):
+    """
+    A component whose values are read on demand from an array-like object.
+
+    This is used to wrap arrays that may not fit in memory, such as h5py
+    datasets, memory-mapped arrays, or dask arrays. The values are only read
+    in when they are accessed, and when a view is given, only the values
+    inside the view are read in.
+    """
+
+    def __init__(self, array, units=None):
+        """
+        :param array: An array-like object that supports ``shape``, ``dtype``
+                      and slicing
+        :param units: Optional unit label
+        :type units: str
+        """
+        super(LazyComponent, self).__init__(None, units=units)
+        self._data = array
+        self._dtype = None
+
+    @property
+    def array(self):
+        """ The underlying array-like object """
+        return self._data
+
+    @property
+    def data(self):
+        """ The values of the whole component as a :class:`numpy.ndarray` """
+        return self[Ellipsis]
+
+    def __getitem__(self, key):
+        logging.debug("Using %s to read lazy data of shape %s", key, self.shape)
+        if _is_basic_view(key):
+            result = _materialize(self._data[key])
+        else:
+            # h5py and other array-like objects only support limited forms of
+            # fancy indexing, so for index arrays we read in the block of
+            # values that contains all the indexed elements, and otherwise
+            # the whole array.
+            bounds = _bounding_view(key, self.shape)
+            if bounds is None:
+                result = _materialize(self._data[...])[key]
+            else:
+                block, local = bounds
+                result = _materialize(self._data[block])[local]
+        result = coerce_numeric(result)
+        if self._dtype is not None:
+            result = result.astype(self._dtype, copy=False)
+        return result
+
+    def to_float32(self):
+        """
+        Convert double-precision floating-point values to single precision
+        as they are read.
+        """
+        if self._data.dtype == np.float64:
+            self._dtype = np.dtype(np.float32)
+
+    @property
+    def numeric(self):
+        return np.can_cast(self._data.dtype, np.complex128)
+
+    def chunk_statistics(self):
+        """
+        Return statistics about the chunks of the array along the first
+        dimension, if the array-like object provides them, or `None`.
+
+        Array-like objects that know the range of values in each chunk (e.g.
+        from the row group statistics in Parquet files) can provide a
+        ``chunk_statistics`` method returning a list of ``(start, stop,
+        vmin, vmax, has_missing)`` tuples, where ``vmin`` and ``vmax`` can be
+        `None` if unknown, and ``has_missing`` indicates whether the chunk may
+        contain missing or NaN values. This is used to avoid reading chunks
+        when computing masks for range selections.
+        """
+        statistics = getattr(self._data, 'chunk_statistics', None)
+        if statistics is None:
+            return None
+        return statistics()
+
+    def _append(self, values):
+        raise TypeError("Cannot append values to a LazyComponent")
+
+
+def _append_values(array, buffer, values):
+    """
+    Append values to a one-dimensional array.
+
+    Space is reserved at the end of the buffer holding the array, so that
+    appending values repeatedly does not require copying the existing values
+    each time. Returns the new (read-only) array, and the buffer holding it.
+    """
+
+    n, k = len(array), len(values)
+
+    dtype = np.result_type(array.dtype, values.dtype)
+
+    if (buffer is None or array.base is not buffer or
+            buffer.dtype != dtype or len(buffer) < n + k):
+        buffer = np.empty(2 * (n + k), dtype=dtype)
+        buffer[:n] = array
+
+    buffer[n:n + k] = values
+
+    array = buffer[:n + k]
+    array.setflags(write=False)
+
+    return array, buffer
+
+
+def _is_lazy_array(data):
+    """
+    Whether data is a chunked array-like object that should not be loaded
+    into memory in one go (e.g. an h5py dataset or a dask array).
+    """
+    return (not isinstance(data, np.ndarray) and
+            hasattr(data, 'chunks') and
+            hasattr(data, 'shape') and
+            hasattr(data, 'dtype'))
+
+
+def _is_basic_view(view):
+    """
+    Whether a view only consists of integers, slices with positive steps and
+    ellipses, which are supported by all lazy array-like objects.
+    """
+    if not isinstance(view, tuple):
+        view = (view,)
+    for v in view:
+        if isinstance(v, slice):
+            if v.step is not None and v.step <= 0:
+                return False
+        elif v is not Ellipsis and not isinstance(v, numbers.Integral):
+            return False
+    return True
+
+
+def _bounding_view(view, shape):
+    """
+    For a view containing integer or boolean index arrays, return a basic
+    view for the block of the array that contains all the selected elements,
+    and the view to apply to this block to get the selected elements. Returns
+    `None` for views that do not contain index arrays, or that can't be
+    handled in this way.
+    """
+
+    if not isinstance(view, tuple):
+        view = (view,)
+
+    # Boolean arrays are equivalent to the integer arrays of the indices of
+    # the selected elements along the dimensions they span.
+    expanded = []
+    for v in view:
+        if isinstance(v, (list, np.ndarray)):
+            v = np.asarray(v)
+            if v.dtype == bool:
+                dims = len(expanded)
+                if (any(e is Ellipsis for e in expanded) or v.ndim == 0 or
+                        v.shape != tuple(shape[dims:dims + v.ndim])):
+                    return None
+                expanded.extend(np.nonzero(v))
+                continue
+            if v.dtype.kind not in 'iu':
+                return None
+        expanded.append(v)
+
+    ellipses = [i for i, v in enumerate(expanded) if v is Ellipsis]
+    if len(ellipses) > 1:
+        return None
+    elif ellipses:
+        index = ellipses[0]
+        n_missing = len(shape) - len(expanded) + 1
+        expanded[index:index + 1] = [slice(None)] * n_missing
+
+    if len(expanded) > len(shape):
+        return None
+
+    block, local = [], []
+    has_arrays = False
+
+    for v, size in zip(expanded, shape):
+        if isinstance(v, np.ndarray):
+            has_arrays = True
+            v = np.where(v < 0, v + size, v)
+            if v.size == 0:
+                start, stop = 0, 0
+            else:
+                start, stop = v.min(), v.max() + 1
+                if start < 0 or stop > size:
+                    return None
+            block.append(slice(int(start), int(stop)))
+            local.append(v - start)
+        elif isinstance(v, numbers.Integral):
+            # Keep the dimension in the block so that the local view has the
+            # same structure as the original one, since integers are treated
+            # as index arrays when combined with them.
+            if v < 0:
+                v += size
+            block.append(slice(v, v + 1))
+            local.append(0)
+        elif isinstance(v, slice) and (v.step is None or v.step > 0):
+            block.append(v)
+            local.append(slice(None))
+        elif isinstance(v, slice):
+            block.append(slice(None))
+            local.append(v)
+        else:
+            return None
+
+    if not has_arrays:
+        return None
+
+    return tuple(block), tuple(local)
+
+
+def _materialize(values):
+    """
+    Convert values read from a lazy array into a :class:`numpy.ndarray`
+    """
+    if hasattr(values, 'compute'):  # dask arrays
+        values = values.compute()
+    return np.asarray(values)
+
+
+class DerivedValueCache(ArrayCache):
+    """
+    A least-recently-used cache for the values of derived components.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached values, in bytes. If not
+        specified, the ``DERIVED_COMPONENT_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'DERIVED_COMPONENT_CACHE_SIZE'
+
+
+# The values of all derived components are kept in a single cache, so that
+# DERIVED_COMPONENT_CACHE_SIZE limits the total memory used. The cache can be
+# used from the DataLoader worker threads, so is only accessed while holding
+# _derived_lock.
+_derived_values = DerivedValueCache()
+_derived_lock = threading.Lock()
+
+
 class DerivedComponent(Component):
 
-    """ A component which derives its data from a function """
+    """ A component which derives its data from a function
+
+    The computed values are cached for each view, and the cache is
+    invalidated when the values in the parent data are modified. The
+    cached arrays are shared between calls, so are returned read-only.
+    """
 
     def __init__(self, data, link, units=None):
         """
@@ -236,10 +534,15 @@ class DerivedComponent(Component):
         """
         super(DerivedComponent, self).__init__(data, units=units)
         self._link = link
+        self._cache = _derived_values
+        self._cache_token = object()
 
     def set_parent(self, data):
         """ Reassign the Data object that this DerivedComponent operates on """
         self._data = data
+        # Values cached for the previous parent are no longer reachable, and
+        # are eventually evicted from the cache.
+        self._cache_token = object()
 
     @property
     def hidden(self):
@@ -248,7 +551,7 @@ class DerivedComponent(Component):
     @property
     def data(self):
         """ Return the numerical data as a numpy array """
-        return self._link.compute(self._data)
+        return self._compute()
 
     @property
     def link(self):
@@ -256,7 +559,38 @@ class DerivedComponent(Component):
         return self._link
 
     def __getitem__(self, key):
-        return self._link.compute(self._data, key)
+        return self._compute(key)
+
+    def _evaluate(self, view=None):
+        if view is None:
+            return self._link.compute(self._data)
+        else:
+            return self._link.compute(self._data, view)
+
+    def _compute(self, view=None):
+
+        version = getattr(self._data, 'version', None)
+
+        try:
+            key = self._cache_token, self._link, version, view_key(view)
+        except TypeError:
+            key = None
+
+        if key is None or version is None:
+            return self._evaluate(view)
+
+        with _derived_lock:
+            result = self._cache.get(key)
+
+        if result is None:
+            result = self._evaluate(view)
+            if isinstance(result, np.ndarray):
+                result = result.view()
+                result.setflags(write=False)
+                with _derived_lock:
+                    self._cache.set(key, result)
+
+        return result
 
 
 class CoordinateComponent(Component):
@@ -281,95 +615,16 @@ class CoordinateComponent(Component):
         if self.world:
 
             # Calculating the world coordinates can be a bottleneck if we aren't
-            # careful, so we need to make sure that if not all dimensions depend
-            # on each other, we use smart broadcasting.
-
-            # The unoptimized way to do this for an N-dimensional dataset would
-            # be to construct N-dimensional arrays of pixel values for each
-            # coordinate. However, if we are computing the coordinates for axis
-            # i, and axis i is not dependent on any other axis, then the result
-            # will be an N-dimensional array where the same 1D array of
-            # coordinates will be repeated over and over.
-
-            # To optimize this, we therefore essentially consider only the
-            # dependent dimensions and then broacast the result to the full
-            # array size at the very end.
-
-            # view=None actually adds a dimension which is never what we really
-            # mean, at least in glue.
-            if view is None:
-                view = Ellipsis
-
-            # For 1D arrays, slice can be given as a single slice but we need
-            # to wrap it in a list to make the following code work correctly,
-            # as it is then consistent with higher-dimensional cases.
-            if isinstance(view, slice) or np.isscalar(view):
-                view = [view]
-
-            # Some views, e.g. with lists of integer arrays, can give arbitrarily
-            # complex (copied) subsets of arrays, so in this case we don't do any
-            # optimization
-            if view is Ellipsis:
-                optimize_view = False
-            else:
-                for v in view:
-                    if not np.isscalar(v) and not isinstance(v, slice):
-                        optimize_view = False
-                        break
-                else:
-                    optimize_view = True
-
-            pix_coords = []
-            dep_coords = self._data.coords.dependent_axes(self.axis)
-
-            final_slice = []
-            final_shape = []
-
-            for i in range(self._data.ndim):
+            # careful. The coordinates object caches the world coordinates
+            # computed only along the dimensions that this axis depends on,
+            # which we then broadcast to the full shape of the data without
+            # making a copy. Any view is then applied to the broadcast array,
+            # so that only the requested values are ever materialized.
 
-                if optimize_view and i < len(view) and np.isscalar(view[i]):
-                    final_slice.append(0)
-                else:
-                    final_slice.append(slice(None))
-
-                # We set up a 1D pixel axis along that dimension.
-                pix_coord = np.arange(self._data.shape[i])
-
-                # If a view was specified, we need to take it into account for
-                # that axis.
-                if optimize_view and i < len(view):
-                    pix_coord = pix_coord[view[i]]
-                    if not np.isscalar(view[i]):
-                        final_shape.append(len(pix_coord))
-                else:
-                    final_shape.append(self._data.shape[i])
-
-                if i not in dep_coords:
-                    # The axis is not dependent on this instance's axis, so we
-                    # just compute the values once and broadcast along this
-                    # dimension later.
-                    pix_coord = 0
-
-                pix_coords.append(pix_coord)
-
-            # We build the list of N arrays, one for each pixel coordinate
-            pix_coords = np.meshgrid(*pix_coords, indexing='ij', copy=False)
+            world_coords = self._data.coords.world_grid(self._data.shape, self.axis)
+            world_coords = broadcast_to(world_coords, self._data.shape)
 
-            # Finally we convert these to world coordinates
-            axis = self._data.ndim - 1 - self.axis
-            world_coords = self._data.coords.pixel2world_single_axis(*pix_coords[::-1],
-                                                                     axis=axis)
-
-            # We get rid of any dimension for which using the view should get
-            # rid of that dimension.
-            if optimize_view:
-                world_coords = world_coords[tuple(final_slice)]
-
-            # We then broadcast the final array back to what it should be
-            world_coords = broadcast_to(world_coords, tuple(final_shape))
-
-            # We apply the view if we weren't able to optimize before
-            if optimize_view:
+            if view is None:
                 return world_coords
             else:
                 return world_coords[view]
@@ -416,17 +671,74 @@ class CoordinateComponent(Component):
         return False
 
 
+def _code_dtype(n_categories):
+    """
+    Return the smallest signed integer dtype that can hold the codes for
+    ``n_categories`` categories, as well as -1 for values that are not in the
+    categories.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+JITTER_SEED = 1234567890
+
+
+def _uniform_jitter(indices, seed=JITTER_SEED):
+    """
+    Return pseudo-random offsets between -0.5 and 0.5 for the given indices.
+
+    The offset for each index only depends on the index and the seed, so that
+    offsets can be computed for any part of an array without computing them
+    for the whole array. This uses the SplitMix64 hash function.
+    """
+    z = np.asarray(indices).astype(np.uint64)
+    z += np.uint64((seed * 0x9E3779B97F4A7C15) % 2 ** 64)
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return (z >> np.uint64(11)) * 2. ** -53 - 0.5
+
+
+def _view_indices(size, view):
+    """
+    Return the indices of the elements of a one-dimensional array of length
+    ``size`` selected by ``view``.
+    """
+    if isinstance(view, tuple) and len(view) == 1:
+        view = view[0]
+    if view is None or view is Ellipsis:
+        return np.arange(size)
+    elif isinstance(view, slice):
+        return np.arange(*view.indices(size))
+    else:
+        return np.arange(size)[view]
+
+
 class CategoricalComponent(Component):
 
     """
     Container for categorical data.
+
+    The values are stored as integer codes giving the index of the category
+    for each value, using the smallest integer type that can hold all the
+    codes. The original labels can be released with :meth:`release_labels`,
+    in which case they are reconstructed from the codes and categories when
+    needed.
     """
 
-    def __init__(self, categorical_data, categories=None, jitter=None, units=None):
+    def __init__(self, categorical_data, categories=None, jitter=None,
+                 units=None, keep_labels=True):
         """
         :param categorical_data: The underlying :class:`numpy.ndarray`
         :param categories: List of unique values in the data
         :jitter: Strategy for jittering the data
+        :param keep_labels: Whether to keep the original labels, rather than
+                            reconstructing them from the codes when needed
         """
 
         super(CategoricalComponent, self).__init__(None, units)
@@ -439,27 +751,174 @@ class CategoricalComponent(Component):
         self._categorical_data.setflags(write=False)
 
         self._categories = categories
-        self._jitter_method = jitter
-        self._is_jittered = False
+        self._jitter_method = None
         self._data = None
         if self._categories is None:
             self._update_categories()
         else:
             self._update_data()
 
+        self.jitter(method=jitter)
+
+        if not keep_labels:
+            self.release_labels()
+
+    @classmethod
+    def from_codes(cls, codes, categories, jitter=None, units=None):
+        """
+        Create a categorical component from integer codes and the categories
+        they refer to, without having to find the unique labels again.
+
+        Codes of -1 indicate missing values, which are given an empty label
+        (or NaN for numerical categories). As for components created from
+        labels, the categories are sorted and unused categories are dropped.
+        The labels are not stored, but are reconstructed from the codes when
+        needed.
+
+        :param codes: The index of the category for each value
+        :param categories: The categories
+        :param jitter: Strategy for jittering the data
+        :param units: Optional unit label
+        """
+
+        codes = np.asarray(codes)
+        if codes.ndim > 1:
+            raise ValueError("Categorical Data must be 1-dimensional")
+        codes = codes.astype(np.intp)
+
+        categories = np.asarray(categories)
+
+        missing = codes < 0
+        if np.any(missing):
+            if categories.dtype.kind in 'OSU':
+                categories = np.append(categories.astype(object), '')
+            else:
+                categories = np.append(categories.astype(float), np.nan)
+            codes[missing] = len(categories) - 1
+
+        # Keep only the categories that are used, in sorted order
+        used = np.bincount(codes, minlength=len(categories)) > 0
+        order = np.argsort(categories, kind='mergesort')
+        order = order[used[order]]
+        lookup = np.zeros(len(categories), dtype=np.intp)
+        lookup[order] = np.arange(len(order))
+        categories = categories[order]
+        codes = lookup[codes]
+
+        # Remove duplicate categories (e.g. if the empty label was present)
+        if len(categories) > 1:
+            keep = np.ones(len(categories), dtype=bool)
+            keep[1:] = categories[1:] != categories[:-1]
+            if not np.all(keep):
+                codes = (np.cumsum(keep) - 1)[codes]
+                categories = categories[keep]
+
+        component = cls.__new__(cls)
+        super(CategoricalComponent, component).__init__(None, units)
+
+        component._categorical_data = None
+        component._categories = categories
+        component._jitter_method = None
+        component._set_codes(codes)
+        component.jitter(method=jitter)
+
+        return component
+
+    @property
+    def _data(self):
+        return self._codes
+
+    @_data.setter
+    def _data(self, codes):
+        # The floating-point values computed from the codes are cached with
+        # this token in the key, so we need a new token whenever the codes
+        # are replaced.
+        self._codes = codes
+        self._codes_token = object()
+
+    def _set_codes(self, codes):
+        """
+        Store the codes using the smallest integer type that can hold them,
+        with -1 for values that are not in the categories.
+        """
+        self._data = np.asarray(codes).astype(_code_dtype(len(self._categories)))
+        self._data.setflags(write=False)
+        self._has_missing = bool(np.any(self._data < 0))
+        self._buffer = None
+
+    def _values(self, view=None):
+        """
+        Return the codes as floating-point values (with NaN for values that
+        are not in the categories), with jitter applied if enabled.
+
+        The values are kept in the cache used for derived components, for
+        each array of codes, jitter method and view.
+        """
+
+        try:
+            key = self._codes_token, self._jitter_method, view_key(view)
+        except TypeError:
+            return self._compute_values(view)
+
+        with _derived_lock:
+            values = _derived_values.get(key)
+
+        if values is None:
+            values = self._compute_values(view)
+            if isinstance(values, np.ndarray):
+                with _derived_lock:
+                    _derived_values.set(key, values)
+
+        return values
+
+    def _compute_values(self, view=None):
+
+        codes = self._data if view is None else self._data[view]
+
+        values = np.array(codes, dtype=float)
+        if self._has_missing:
+            values[np.asarray(codes) < 0] = np.nan
+
+        if self._jitter_method == 'uniform':
+            values += _uniform_jitter(_view_indices(len(self._data), view))
+
+        if values.ndim == 0:
+            return values[()]
+
+        values.setflags(write=False)
+        return values
+
+    def __getitem__(self, key):
+        logging.debug("Using %s to index data of shape %s", key, self.shape)
+        return self._values(key)
+
     @property
     def codes(self):
         """
         The index of the category for each value in the array.
+
+        The codes are returned as floating-point values, including the jitter
+        if enabled, and NaN for values that are not in the categories.
         """
-        return self._data
+        return self._values()
 
     @property
     def labels(self):
         """
         The original categorical data.
         """
-        return self._categorical_data
+        if self._categorical_data is None:
+            # Values that are not in the categories have codes of -1, which
+            # refer to the empty label (or NaN) added at the end.
+            labels = np.asarray(self._categories)
+            if self._has_missing:
+                if labels.dtype.kind in 'OSU':
+                    labels = np.append(labels, '')
+                else:
+                    labels = np.append(labels.astype(float), np.nan)
+            return labels[self._data]
+        else:
+            return self._categorical_data
 
     @property
     def categories(self):
@@ -483,6 +942,56 @@ class CategoricalComponent(Component):
     def categorical(self):
         return True
 
+    def release_labels(self):
+        """
+        Release the array of original labels to save memory.
+
+        The labels are then reconstructed from the codes and categories when
+        they are needed. This is only possible if all the values are in the
+        categories.
+        """
+        if self._has_missing:
+            raise ValueError("Cannot release labels for components with "
+                             "values that are not in the categories")
+        self._categorical_data = None
+        self._label_buffer = None
+
+    def isin(self, labels, view=None):
+        """
+        Return a boolean mask of the values that have one of the given labels.
+
+        The mask is computed from the codes rather than by comparing labels.
+
+        :param labels: The labels to select
+        :param view: An optional view of the values
+        """
+        selected = pd.Index(self._categories).isin(np.asarray(labels).ravel())
+        return self._code_lookup(selected)[self._integer_codes(view)]
+
+    def _integer_codes(self, view=None):
+        """
+        Return the codes as integers, with -1 for values that are not in the
+        categories, and without jitter.
+
+        :param view: An optional view of the values
+        """
+        if view is None:
+            return self._data
+        else:
+            return self._data[view]
+
+    def _code_lookup(self, selected):
+        """
+        Given an array of boolean values for each category, return an array
+        that can be indexed by the integer codes to find whether each value is
+        selected. Values that are not in the categories are never selected.
+
+        :param selected: Whether each category is selected
+        """
+        lookup = np.zeros(len(self._categories) + 1, dtype=bool)
+        lookup[:-1] = selected
+        return lookup
+
     def _update_categories(self, categories=None):
         """
         :param categories: A sorted array of categories to find in the dataset.
@@ -490,34 +999,66 @@ class CategoricalComponent(Component):
         :return: None
         """
         if categories is None:
-            categories, inv = unique(self._categorical_data)
+            categories, inv = unique(self.labels)
             self._categories = categories
-            self._data = inv.astype(np.float)
-            self._data.setflags(write=False)
-            self.jitter(method=self._jitter_method)
+            self._set_codes(inv)
         else:
             if check_sorted(categories):
+                labels = self.labels
                 self._categories = categories
-                self._update_data()
+                self._update_data(labels)
             else:
                 raise ValueError("Provided categories must be Sorted")
 
-    def _update_data(self):
+    def _update_data(self, labels=None):
         """
         Converts the categorical data into the numeric representations given
         self._categories
         """
-        self._is_jittered = False
+        if labels is None:
+            labels = self.labels
+        self._set_codes(pd.Index(self._categories).get_indexer(labels))
 
-        self._data = row_lookup(self._categorical_data, self._categories)
-        self.jitter(method=self._jitter_method)
-        self._data.setflags(write=False)
+    def _append(self, values):
+        """
+        Append labels to the component.
+
+        Returns `True` if the codes of the existing values are unchanged, and
+        `False` if new categories had to be added, in which case all the codes
+        are recomputed.
+        """
+
+        values = np.asarray(values)
+
+        keep_labels = self._categorical_data is not None
+
+        if not np.all(pd.Index(values).isin(self._categories)):
+            labels = self.labels
+            self._categorical_data, self._label_buffer = \
+                _append_values(labels, getattr(self, '_label_buffer', None), values)
+            self._update_categories()
+            if not keep_labels:
+                self.release_labels()
+            return False
+
+        if keep_labels:
+            self._categorical_data, self._label_buffer = \
+                _append_values(self._categorical_data,
+                               getattr(self, '_label_buffer', None), values)
+
+        codes = pd.Index(self._categories).get_indexer(values)
+        self._data, self._buffer = _append_values(self._data, self._buffer,
+                                                  codes.astype(self._data.dtype))
+        return True
 
     def jitter(self, method=None):
         """
         Jitter the data so the density of points can be easily seen in a
         scatter plot.
 
+        The jitter is not stored, but is computed when the codes are accessed,
+        and is always the same for a given value.
+
         :param method: None | 'uniform':
 
         * None: No jittering is done (or any jittering is undone).
@@ -530,17 +1071,6 @@ class CategoricalComponent(Component):
         if method not in set(['uniform', None]):
             raise ValueError('%s jitter not supported' % method)
         self._jitter_method = method
-        seed = 1234567890
-        rand_state = np.random.RandomState(seed)
-
-        if (self._jitter_method is None) and self._is_jittered:
-            self._update_data()
-        elif (self._jitter_method is 'uniform') and not self._is_jittered:
-            iswrite = self._data.flags['WRITEABLE']
-            self._data.setflags(write=True)
-            self._data += rand_state.uniform(-0.5, 0.5, size=self._data.shape)
-            self._is_jittered = True
-            self._data.setflags(write=iswrite)
 
     def subset_from_roi(self, att, roi, other_comp=None, other_att=None,
                         coord='x', is_nested=False):
@@ -691,5 +1221,5 @@ class CategoricalComponent(Component):
         :return: pandas.Series
         """
 
-        return pd.Series(self._categorical_data.ravel(),
+        return pd.Series(self.labels.ravel(),
                          dtype=np.object, **kwargs)
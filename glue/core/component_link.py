@@ -9,6 +9,7 @@ import numpy as np
 from glue.external.six import add_metaclass
 from glue.core.contracts import contract, ContractsMeta
 from glue.core.subset import InequalitySubsetState
+from glue.core.expression import compile_expression, NotCompilable
 from glue.core.util import join_component_view
 
 
@@ -397,6 +398,17 @@ class BinaryComponentLink(ComponentLink):
             self._right.replace_ids(old, new)
 
     def compute(self, data, view=None):
+
+        # When computing the whole component, we evaluate the whole tree of
+        # links chunk by chunk rather than computing each link separately.
+        if view is None or view is Ellipsis:
+            expression = compile_expression(self)
+            if expression is not None:
+                try:
+                    return expression.evaluate(data)
+                except NotCompilable:
+                    pass
+
         l = self._left
         r = self._right
         if not isinstance(self._left, numbers.Number):
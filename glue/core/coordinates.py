@@ -83,9 +83,12 @@ class Coordinates(object):
 
         original_shape = pixel[0].shape
         pixel_new = []
-        dep_axes = self.dependent_axes(axis)
+        # dependent_axes uses the Numpy axis order, while the arguments and
+        # axis are in the WCS order
+        ndim = len(pixel)
+        dep_axes = self.dependent_axes(ndim - 1 - axis)
         for ip, p in enumerate(pixel):
-            if ip in dep_axes:
+            if ndim - 1 - ip in dep_axes:
                 pixel_new.append(unbroadcast(p))
             else:
                 pixel_new.append(p.flat[0])
@@ -125,9 +128,12 @@ class Coordinates(object):
 
         original_shape = world[0].shape
         world_new = []
-        dep_axes = self.dependent_axes(axis)
+        # dependent_axes uses the Numpy axis order, while the arguments and
+        # axis are in the WCS order
+        ndim = len(world)
+        dep_axes = self.dependent_axes(ndim - 1 - axis)
         for iw, w in enumerate(world):
-            if iw in dep_axes:
+            if ndim - 1 - iw in dep_axes:
                 world_new.append(unbroadcast(w))
             else:
                 world_new.append(w.flat[0])
@@ -166,6 +172,64 @@ class Coordinates(object):
         return self.pixel2world_single_axis(*pixel[::-1],
                                             axis=data.ndim - 1 - axis)
 
+    def world_grid(self, shape, axis):
+        """
+        Find the world coordinates along a given dimension for all pixels in
+        an array.
+
+        To avoid computing and storing full-size arrays, the world coordinates
+        are only computed along the dimensions that ``axis`` depends on (see
+        ``dependent_axes``), and the result has a size of one along all other
+        dimensions, so that it can be broadcast to ``shape``. For example,
+        for a spectral axis this is a 1D lookup table, while for celestial
+        axes this is a 2D table which is re-used for all spectral channels.
+
+        The results are cached, so the returned array should not be modified
+        in-place.
+
+        Parameters
+        ----------
+        shape : tuple
+            The shape of the data
+        axis : int
+            The axis to compute, in Numpy axis order
+        """
+
+        shape = tuple(shape)
+
+        # Only the grids for the most recently used shape are kept
+        cache = self.__dict__.setdefault('_world_grids', {})
+
+        if axis in cache and cache[axis][0] == shape:
+            return cache[axis][1]
+
+        dep_axes = self.dependent_axes(axis)
+
+        pixel = []
+        for i, s in enumerate(shape):
+            pix_shape = [1] * len(shape)
+            if i in dep_axes:
+                pix_shape[i] = s
+                pixel.append(np.arange(s).reshape(pix_shape))
+            else:
+                pixel.append(np.zeros(pix_shape, dtype=int))
+        pixel = np.broadcast_arrays(*pixel)
+
+        # The pixel arrays only span the dependent dimensions, so we can call
+        # pixel2world directly.
+        world = self.pixel2world(*pixel[::-1])[len(shape) - 1 - axis]
+        world = np.array(broadcast_to(world, pixel[0].shape))
+        world.setflags(write=False)
+
+        cache[axis] = shape, world
+
+        return world
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_world_grids', None)
+        return state
+
     def world_axis_unit(self, axis):
         """
         Return the unit of the world coordinate given by ``axis`` (assuming the
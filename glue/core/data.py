@@ -3,6 +3,7 @@ from __future__ import absolute_import, division, print_function
 from collections import OrderedDict
 
 import uuid
+import threading
 import numpy as np
 import pandas as pd
 
@@ -10,8 +11,7 @@ from glue.external import six
 from glue.core.message import (DataUpdateMessage, DataRemoveComponentMessage,
                                DataAddComponentMessage, NumericalDataChangedMessage,
                                SubsetCreateMessage, ComponentsChangedMessage,
-                               ComponentReplacedMessage)
-from glue.core.decorators import clear_cache
+                               ComponentReplacedMessage, DataRowsAppendedMessage)
 from glue.core.util import split_component_view
 from glue.core.hub import Hub
 from glue.core.subset import Subset, SubsetState
@@ -22,16 +22,41 @@ from glue.core.visual import VisualAttributes
 from glue.core.coordinates import Coordinates
 from glue.core.contracts import contract
 from glue.config import settings
-from glue.utils import view_shape
+from glue.utils import view_shape, bin_indices
+from glue.core.cache import ArrayCache
 
 
 # Note: leave all the following imports for component and component_id since
 # they are here for backward-compatibility (the code used to live in this
 # file)
-from glue.core.component import Component, CoordinateComponent, DerivedComponent
+from glue.core.component import (Component, CoordinateComponent, DerivedComponent,
+                                 LazyComponent)
 from glue.core.component_id import ComponentID, ComponentIDDict, PixelComponentID
 
-__all__ = ['Data']
+__all__ = ['Data', 'HistogramCache']
+
+
+class HistogramCache(ArrayCache):
+    """
+    A least-recently-used cache for the bin indices of the values of
+    components, used to compute histograms.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached indices, in bytes. If not
+        specified, the ``HISTOGRAM_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'HISTOGRAM_CACHE_SIZE'
+
+
+# The bin indices for all datasets are kept in a single cache, so that
+# HISTOGRAM_CACHE_SIZE limits the total memory used. The cache can be used
+# from the DataLoader worker threads, so is only accessed while holding
+# _histogram_lock.
+_histogram_indices = HistogramCache()
+_histogram_lock = threading.Lock()
 
 
 class Data(object):
@@ -95,6 +120,25 @@ class Data(object):
 
         self._coordinate_links = None
 
+        # Counter incremented whenever the numerical values change, which is
+        # used to know when cached values (e.g. subset masks) are stale
+        self._version = 0
+
+        # Number of rows at each version, for consecutive versions that only
+        # differ by appended rows (see append_rows)
+        self._append_history = OrderedDict()
+
+        # Region of the data that changed to reach each version, for
+        # consecutive versions that only differ in part of the data (see
+        # update_components)
+        self._region_history = OrderedDict()
+
+        # Bin indices of the values of components, used to compute histograms.
+        # These are cached for all datasets, with keys that start with a
+        # token unique to this dataset.
+        self._histogram_cache = _histogram_indices
+        self._histogram_token = object()
+
         self.data = self
         self.label = label
 
@@ -131,6 +175,43 @@ class Data(object):
         """
         return self._shape
 
+    @property
+    def version(self):
+        """
+        Counter that is incremented each time the values in the dataset change
+        """
+        return self._version
+
+    def _append_versions(self):
+        """
+        Return a list of ``(version, nrows)`` tuples, most recent first, for
+        the previous versions of the data which only differ from the current
+        one by appended rows, where ``nrows`` is the number of rows at that
+        version.
+        """
+        if self._version in self._append_history:
+            return [(version, nrows) for version, nrows in
+                    reversed(list(self._append_history.items()))
+                    if version != self._version]
+        else:
+            return []
+
+    def _region_versions(self):
+        """
+        Return a list of ``(version, regions)`` tuples, most recent first, for
+        the previous versions of the data which only differ from the current
+        one in some regions, where ``regions`` is the list of views that
+        include the changed values, in the order in which they changed.
+        """
+        result = []
+        regions = []
+        version = self._version
+        while version in self._region_history:
+            regions = [self._region_history[version]] + regions
+            version -= 1
+            result.append((version, regions))
+        return result
+
     @property
     def label(self):
         """ Convenience access to data set's label """
@@ -177,6 +258,7 @@ class Data(object):
         """
         if component_id in self._components:
             self._components.pop(component_id)
+            self._version += 1
             if self.hub:
                 msg = DataRemoveComponentMessage(self, component_id)
                 self.hub.broadcast(msg)
@@ -240,9 +322,6 @@ class Data(object):
 
         **Joining on multiple components**
 
-        .. note:: This mode is currently slow, and will be optimized
-                  significantly in future.
-
         Next, one can specify several components for each dataset: in this
         case, the number of components given should match for both datasets.
         This causes items in both datasets to be linked when (and only when)
@@ -404,6 +483,9 @@ class Data(object):
         is_present = component_id in self._components
         self._components[component_id] = component
 
+        if is_present:
+            self._version += 1
+
         first_component = len(self._components) == 1
         if first_component:
             if isinstance(component, DerivedComponent):
@@ -744,6 +826,9 @@ class Data(object):
         except ValueError:
             pass
 
+        if changed:
+            self._version += 1
+
         if changed and self.hub is not None:
             # promote hidden status
             new._hidden = new.hidden and old.hidden
@@ -853,6 +938,55 @@ class Data(object):
         except KeyError:
             raise IncompatibleAttribute(component_id)
 
+    def compute_histogram(self, cid, range, bins, log=False, subset_state=None):
+        """
+        Compute the histogram of the values of a component.
+
+        The bin that each value falls in is found once for a given component,
+        range, and number of bins, and is cached, so that the histograms of
+        the data and of any number of subsets can be computed by counting the
+        bins of the values in each subset, without binning the values again.
+
+        :param cid: The component to compute the histogram for
+        :param range: The lower and upper edges of the bins
+        :param bins: The number of bins
+        :param log: Whether the bins are spaced logarithmically
+        :param subset_state: If specified, only the values in this subset
+                             are counted
+
+        :returns: The number of values in each bin, and the edges of the bins
+        """
+
+        lo, hi = sorted(range)
+
+        if log:
+            edges = np.logspace(np.log10(lo), np.log10(hi), bins + 1)
+        else:
+            edges = np.linspace(lo, hi, bins + 1)
+
+        key = self._histogram_token, cid, self.version, lo, hi, bins, log
+
+        with _histogram_lock:
+            indices = self._histogram_cache.get(key)
+        if indices is None:
+            indices = bin_indices(self[cid], edges)
+            with _histogram_lock:
+                self._histogram_cache.set(key, indices)
+
+        if subset_state is not None:
+            indices = indices[self._subset_mask(subset_state).ravel()]
+
+        counts = np.bincount(indices, minlength=bins + 1)[:bins]
+
+        return counts, edges
+
+    def _subset_mask(self, subset_state):
+        # Use the cached mask of a subset with this state if there is one
+        for subset in self.subsets:
+            if subset.subset_state is subset_state:
+                return subset.to_mask()
+        return subset_state.to_mask(self)
+
     def to_dataframe(self, index=None):
         """ Convert the Data object into a pandas.DataFrame object
 
@@ -867,7 +1001,7 @@ class Data(object):
         return df[order]
 
     @contract(mapping="dict(inst($Component, $ComponentID):array_like)")
-    def update_components(self, mapping):
+    def update_components(self, mapping, region=None):
         """
         Change the numerical data associated with some of the Components
         in this Data object.
@@ -876,11 +1010,24 @@ class Data(object):
         which broadcasts the state change to the appropriate places.
 
         :param mapping: A dict mapping Components or ComponenIDs to arrays.
+        :param region: If only some of the values have changed, a view (e.g.
+            a slice, or a tuple of slices and indices) that includes all the
+            changed values. This is passed on to subscribers of
+            :class:`~glue.core.message.NumericalDataChangedMessage` so that
+            only this part of the data needs to be refreshed.
 
         This method has the following restrictions:
           - New compoments must have the same shape as old compoments
           - Component subclasses cannot be updated.
         """
+
+        if region is not None:
+            try:
+                view_shape(self.shape, region)
+            except IndexError:
+                raise ValueError("Region {0} is not a valid view of data with "
+                                 "shape {1}".format(region, self.shape))
+
         for comp, data in mapping.items():
             if isinstance(comp, ComponentID):
                 comp = self.get_component(comp)
@@ -890,13 +1037,85 @@ class Data(object):
 
             comp._data = data
 
+        self._version += 1
+
+        if region is None:
+            self._region_history.clear()
+        else:
+            self._region_history[self._version] = region
+            if len(self._region_history) > 32:
+                self._region_history.popitem(last=False)
+
         # alert hub of the change
         if self.hub is not None:
-            msg = NumericalDataChangedMessage(self)
+            msg = NumericalDataChangedMessage(self, region=region)
             self.hub.broadcast(msg)
 
-        for subset in self.subsets:
-            clear_cache(subset.subset_state.to_mask)
+    @contract(mapping="dict(inst($Component, $ComponentID):array_like)")
+    def append_rows(self, mapping):
+        """
+        Append rows to a one-dimensional dataset.
+
+        The values in the existing rows are left unchanged, and a
+        :class:`~glue.core.message.DataRowsAppendedMessage` giving the range
+        of the new rows is broadcast, so that viewers and subsets can process
+        only the new rows. Space for new rows is reserved ahead of time, so
+        that appending rows repeatedly is efficient.
+
+        :param mapping: A dict mapping Components or ComponentIDs to arrays.
+            Values should be given for all the components in the data, except
+            for coordinate and derived components.
+        """
+
+        if self.ndim != 1:
+            raise ValueError("Rows can only be appended to one-dimensional data")
+
+        values = {}
+        for comp, data in mapping.items():
+            if isinstance(comp, ComponentID):
+                comp = self.get_component(comp)
+            values[comp] = data
+
+        components = [self.get_component(cid) for cid in self.primary_components]
+        components = [comp for comp in components
+                      if not isinstance(comp, CoordinateComponent)]
+
+        if set(values) != set(components):
+            raise ValueError("Values should be given for all the "
+                             "non-coordinate components in the data")
+
+        lengths = set(len(data) for data in values.values())
+        if len(lengths) != 1:
+            raise ValueError("Values should have the same length for all components")
+
+        if any(isinstance(comp, LazyComponent) for comp in components):
+            raise TypeError("Cannot append rows to data with lazy components")
+
+        start = self.shape[0]
+        stop = start + lengths.pop()
+
+        # Note that we need to call _append for all components
+        unchanged = [comp._append(values[comp]) for comp in components]
+
+        self._shape = (stop,)
+
+        if all(unchanged):
+            if self._version not in self._append_history:
+                self._append_history.clear()
+                self._append_history[self._version] = start
+            self._version += 1
+            self._append_history[self._version] = stop
+            if len(self._append_history) > 32:
+                self._append_history.popitem(last=False)
+        else:
+            self._version += 1
+
+        if self.hub is not None:
+            if all(unchanged):
+                msg = DataRowsAppendedMessage(self, start, stop)
+            else:
+                msg = NumericalDataChangedMessage(self)
+            self.hub.broadcast(msg)
 
     def update_values_from_data(self, data):
         """
@@ -946,6 +1165,11 @@ class Data(object):
                 comp_old = self.get_component(cname)
                 comp_new = data.get_component(cname)
                 comp_old._data = comp_new._data
+                if comp_old.categorical and comp_new.categorical:
+                    # The codes only make sense with the matching categories
+                    comp_old._categories = comp_new._categories
+                    comp_old._categorical_data = comp_new._categorical_data
+                    comp_old._has_missing = comp_new._has_missing
 
         # Add components that didn't exist in original one. As above, we try
         # and preserve the order of components as much as possible.
@@ -962,14 +1186,13 @@ class Data(object):
         # Update data coordinates
         self.coords = data.coords
 
+        self._version += 1
+
         # alert hub of the change
         if self.hub is not None:
             msg = NumericalDataChangedMessage(self)
             self.hub.broadcast(msg)
 
-        for subset in self.subsets:
-            clear_cache(subset.subset_state.to_mask)
-
 
 @contract(i=int, ndim=int)
 def pixel_label(i, ndim):
@@ -36,6 +36,8 @@ class DataCollection(HubListener):
         super(DataCollection, self).__init__()
         self._link_manager = LinkManager()
         self._data = []
+        self._updating_components = False
+        self._sync_pending = False
 
         self.hub = None
 
@@ -111,8 +113,31 @@ class DataCollection(HubListener):
             for link in d.coordinate_links:
                 self._link_manager.add_link(link)
 
-        for d in self._data:
-            self._link_manager.update_data_components(d)
+        self._update_data_components()
+
+    def _update_data_components(self):
+        """ Update the DerivedComponents in each data set.
+
+        Adding derived components broadcasts a DataAddComponentMessage for
+        each new component, which would otherwise cause the components of
+        all data sets to be updated again while the update is in progress.
+        Instead, these are deferred until the current update is complete.
+        """
+        self._updating_components = True
+        try:
+            for d in self._data:
+                self._link_manager.update_data_components(d)
+        finally:
+            self._updating_components = False
+        if self._sync_pending:
+            self._sync_pending = False
+            self._sync_link_manager()
+
+    def _on_add_component(self, msg):
+        if self._updating_components:
+            self._sync_pending = True
+        else:
+            self._sync_link_manager()
 
     @property
     def links(self):
@@ -132,8 +157,7 @@ class DataCollection(HubListener):
            instances, or a :class:`~glue.core.link_helpers.LinkCollection`
         """
         self._link_manager.add_link(links)
-        for d in self._data:
-            self._link_manager.update_data_components(d)
+        self._update_data_components()
 
     def remove_link(self, links):
         """
@@ -147,8 +171,7 @@ class DataCollection(HubListener):
            instances, or a :class:`~glue.core.link_helpers.LinkCollection`
         """
         self._link_manager.remove_link(links)
-        for d in self._data:
-            self._link_manager.update_data_components(d)
+        self._update_data_components()
 
 
     def _merge_link(self, link):
@@ -165,8 +188,7 @@ class DataCollection(HubListener):
         for link in links:
             self._link_manager.add_link(link)
 
-        for d in self._data:
-            self._link_manager.update_data_components(d)
+        self._update_data_components()
 
     def register_to_hub(self, hub):
         """ Register managed data objects to a hub.
@@ -191,7 +213,7 @@ class DataCollection(HubListener):
                 s.register()
 
         hub.subscribe(self, DataAddComponentMessage,
-                      lambda msg: self._sync_link_manager(),
+                      self._on_add_component,
                       filter=lambda x: x.sender in self._data)
 
     def new_subset_group(self, label=None, subset_state=None):
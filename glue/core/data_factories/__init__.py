@@ -2,13 +2,16 @@ from __future__ import absolute_import, division, print_function
 
 from .astropy_table import *  # noqa
 from .dendrogram import *  # noqa
+from .disk_cache import *  # noqa
 from .excel import *  # noqa
 from .fits import *  # noqa
 from .hdf5 import *  # noqa
 from .helpers import *  # noqa
 from .image import *  # noqa
+from .loader import *  # noqa
 from .numpy import *  # noqa
 from .pandas import *  # noqa
+from .parquet import *  # noqa
 from .tables import *  # noqa
 
 
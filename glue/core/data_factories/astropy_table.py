@@ -1,8 +1,11 @@
 from __future__ import absolute_import, division, print_function
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-from glue.core.data_factories.helpers import has_extension
+from glue.core.data_factories.helpers import has_extension, sniff_file, _file_key
 from glue.core.data import Component, Data
 from glue.config import data_factory, qglue_parser
 
@@ -15,16 +18,55 @@ __all__ = ['astropy_tabular_data', 'sextractor_factory', 'cds_factory',
 # In this file, we define data factories based on the Astropy table reader.
 
 
+# The tables read by is_readable_by_astropy, keyed on the file and the
+# options, so that astropy_tabular_data doesn't need to parse the same file
+# again. Tables are removed once they are used, and any remaining ones are
+# dropped by clear_identified_tables once the data has been read, since
+# files can be identified without being read. At most the most recent
+# tables are kept in the mean time.
+IDENTIFIED_TABLES_SIZE = 2
+
+_identified_tables = OrderedDict()
+_identified_lock = threading.Lock()
+
+
+def clear_identified_tables():
+    """
+    Drop the tables read when identifying files that have not been used by
+    the factories.
+    """
+    with _identified_lock:
+        _identified_tables.clear()
+
+
+def _table_key(filename, kwargs):
+    try:
+        return _file_key(filename), repr(sorted(kwargs.items()))
+    except (IOError, OSError, TypeError):
+        return None
+
+
 def is_readable_by_astropy(filename, **kwargs):
     # This identifier is not efficient, because it involves actually trying
     # to read in the table. However, we only use this as the identifier for
     # the astropy_tabular_data factory which has a priority of 0 and is
-    # therefore only used as a last attempt if all else fails.
+    # therefore only used as a last attempt if all else fails. We reject
+    # binary files straight away since these can't be ASCII tables, and any
+    # binary format that Astropy can read has its own data factory.
+    sniff = sniff_file(filename)
+    if sniff.binary and not sniff.compressed:
+        return False
     try:
-        astropy_table_read(filename, **kwargs)
+        table = astropy_table_read(filename, **kwargs)
     except:
         return False
     else:
+        key = _table_key(filename, kwargs)
+        if key is not None:
+            with _identified_lock:
+                _identified_tables[key] = table
+                while len(_identified_tables) > IDENTIFIED_TABLES_SIZE:
+                    _identified_tables.popitem(last=False)
         return True
 
 
@@ -63,7 +105,13 @@ def astropy_tabular_data(*args, **kwargs):
 
     result = Data()
 
-    table = astropy_table_read(*args, **kwargs)
+    table = None
+    if len(args) == 1:
+        key = _table_key(args[0], kwargs)
+        with _identified_lock:
+            table = _identified_tables.pop(key, None)
+    if table is None:
+        table = astropy_table_read(*args, **kwargs)
 
     result.meta = table.meta
 
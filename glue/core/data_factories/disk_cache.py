@@ -0,0 +1,314 @@
+"""
+A persistent cache of the datasets read by data factories.
+
+Parsing large text files (such as CSV tables or ASCII catalogs) can take much
+longer than reading the same values back from a binary file, and this is done
+again every time a session that refers to the files is restored. When the
+``DATA_CACHE`` setting is enabled, the components of the datasets read from
+files are saved as ``.npy`` files in the cache directory given by the
+``DATA_CACHE_DIR`` setting, and are then memory-mapped rather than parsed
+again the next time the same file is read with the same factory and options.
+
+Entries are keyed on the absolute path, size and modification time of the
+file, the factory, and the keyword arguments passed to it, so that modified
+files are read again. The least recently used entries are removed once the
+total size of the cache exceeds the ``DATA_CACHE_SIZE`` setting.
+
+Only datasets that can be fully reconstructed from their components are
+cached, i.e. datasets without coordinate transformations or derived
+components, whose components hold numerical or categorical arrays in memory.
+Datasets with lazily-loaded or memory-mapped components are not cached since
+they are already cheap to open.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+
+import numpy as np
+
+from glue.external import six
+from glue.config import settings
+from glue.core.component import Component, CategoricalComponent
+from glue.core.coordinates import Coordinates
+from glue.core.data import Data
+from glue.logger import logger
+
+__all__ = ['DataCache', 'get_data_cache']
+
+MANIFEST = 'manifest.json'
+
+
+def _factory_name(factory):
+    name = getattr(factory, '__name__', None)
+    module = getattr(factory, '__module__', None)
+    if name is None or module is None or name.startswith('<'):
+        return None
+    return module + '.' + name
+
+
+def _categories_array(categories):
+    # Return the categories as an array that can be saved without pickling,
+    # or None if this is not possible.
+    categories = np.asarray(categories)
+    if categories.dtype.kind != 'O':
+        return categories
+    if all(isinstance(c, six.string_types) for c in categories):
+        return categories.astype(six.text_type)
+    return None
+
+
+class DataCache(object):
+    """
+    A cache of parsed datasets in a directory on disk.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The cache directory. Defaults to the ``DATA_CACHE_DIR`` setting.
+    max_size : int, optional
+        The maximum total size of the cached files, in bytes. Defaults to the
+        ``DATA_CACHE_SIZE`` setting.
+    """
+
+    def __init__(self, directory=None, max_size=None):
+        self._directory = directory
+        self._max_size = max_size
+
+    @property
+    def directory(self):
+        return self._directory or settings.DATA_CACHE_DIR
+
+    @property
+    def max_size(self):
+        if self._max_size is None:
+            return settings.DATA_CACHE_SIZE
+        else:
+            return self._max_size
+
+    def key(self, path, factory, kwargs):
+        """
+        The key of the cache entry for a file read with a factory, or `None`
+        if the result cannot be cached.
+        """
+        name = _factory_name(factory)
+        if name is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = repr((os.path.abspath(path), stat.st_size, stat.st_mtime,
+                    name, sorted(kwargs.items())))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, path, factory, kwargs):
+        """
+        Return the list of datasets cached for a file, or `None` if the file
+        is not in the cache.
+        """
+
+        key = self.key(path, factory, kwargs)
+        if key is None:
+            return None
+
+        entry = os.path.join(self.directory, key)
+        manifest = os.path.join(entry, MANIFEST)
+
+        try:
+            with open(manifest) as f:
+                records = json.load(f)
+            datasets = [self._load_data(entry, record) for record in records]
+        except (IOError, OSError, ValueError, KeyError) as exc:
+            if os.path.exists(manifest):
+                logger.info("Could not read cached data from %s: %s" % (entry, exc))
+            return None
+
+        # Mark the entry as recently used
+        try:
+            os.utime(manifest, None)
+        except OSError:
+            pass
+
+        return datasets
+
+    def set(self, path, factory, kwargs, datasets):
+        """
+        Save datasets read from a file to the cache, if possible. Returns
+        `True` if the datasets were cached.
+        """
+
+        key = self.key(path, factory, kwargs)
+        if key is None or not all(self._can_cache(data) for data in datasets):
+            return False
+
+        entry = os.path.join(self.directory, key)
+        if os.path.exists(entry):
+            return True
+
+        # Write the files to a temporary directory first, so that other
+        # processes (or threads) never see incomplete entries.
+        try:
+            if not os.path.exists(self.directory):
+                os.makedirs(self.directory)
+            tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        except OSError as exc:
+            logger.info("Could not create cache directory: %s" % exc)
+            return False
+
+        try:
+            records = [self._save_data(tmp, index, data)
+                       for index, data in enumerate(datasets)]
+            with open(os.path.join(tmp, MANIFEST), 'w') as f:
+                json.dump(records, f)
+            os.rename(tmp, entry)
+        except (IOError, OSError, ValueError) as exc:
+            logger.info("Could not cache data read from %s: %s" % (path, exc))
+            shutil.rmtree(tmp, ignore_errors=True)
+            return os.path.exists(entry)
+
+        self.evict()
+
+        return True
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the total size of the
+        cache is at most ``max_size``.
+
+        Other processes (or threads) may add or remove entries at the same
+        time, so entries that disappear while the cache is scanned are
+        skipped.
+        """
+
+        entries = []
+        total = 0
+
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            entry = os.path.join(self.directory, name)
+            manifest = os.path.join(entry, MANIFEST)
+            try:
+                if not os.path.exists(manifest):
+                    continue
+                size = sum(os.path.getsize(os.path.join(entry, filename))
+                           for filename in os.listdir(entry))
+                entries.append((os.path.getmtime(manifest), size, entry))
+            except OSError:
+                continue
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        if os.path.exists(self.directory):
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    @staticmethod
+    def _can_cache(data):
+
+        if not isinstance(data, Data) or type(data.coords) is not Coordinates:
+            return False
+
+        if data.derived_components:
+            return False
+
+        try:
+            json.dumps(data.meta)
+        except (TypeError, ValueError):
+            return False
+
+        for cid in data.primary_components:
+            if cid in data.coordinate_components:
+                continue
+            comp = data.get_component(cid)
+            if type(comp) is Component:
+                if (not isinstance(comp._data, np.ndarray) or
+                        isinstance(comp._data, np.memmap) or
+                        comp._data.dtype.kind == 'O'):
+                    return False
+            elif type(comp) is CategoricalComponent:
+                if _categories_array(comp.categories) is None:
+                    return False
+            else:
+                return False
+
+        return True
+
+    @staticmethod
+    def _save_data(directory, index, data):
+
+        components = []
+
+        for cid in data.primary_components:
+
+            if cid in data.coordinate_components:
+                continue
+
+            comp = data.get_component(cid)
+            prefix = '{0}-{1}'.format(index, len(components))
+            record = dict(label=cid.label, hidden=cid.hidden, units=comp.units)
+
+            if isinstance(comp, CategoricalComponent):
+                record['codes'] = prefix + '-codes.npy'
+                record['categories'] = prefix + '-categories.npy'
+                np.save(os.path.join(directory, record['codes']), comp._data)
+                np.save(os.path.join(directory, record['categories']),
+                        _categories_array(comp.categories))
+            else:
+                record['values'] = prefix + '.npy'
+                np.save(os.path.join(directory, record['values']), comp._data)
+
+            components.append(record)
+
+        return dict(label=data.label, meta=data.meta, components=components)
+
+    @staticmethod
+    def _load_data(directory, record):
+
+        data = Data(label=record['label'])
+        data.meta.update(record['meta'])
+
+        for comp in record['components']:
+            if 'codes' in comp:
+                codes = np.load(os.path.join(directory, comp['codes']))
+                categories = np.load(os.path.join(directory, comp['categories']))
+                component = CategoricalComponent.from_codes(codes, categories,
+                                                            units=comp['units'])
+            else:
+                values = np.load(os.path.join(directory, comp['values']), mmap_mode='r')
+                component = Component(values, units=comp['units'])
+            data.add_component(component, comp['label'], hidden=comp['hidden'])
+
+        return data
+
+
+_data_cache = None
+
+
+def get_data_cache():
+    """
+    Return the cache of parsed datasets, or `None` if the ``DATA_CACHE``
+    setting is disabled.
+    """
+    global _data_cache
+    if not settings.DATA_CACHE:
+        return None
+    if _data_cache is None:
+        _data_cache = DataCache()
+    return _data_cache
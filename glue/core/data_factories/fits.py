@@ -1,18 +1,36 @@
 from __future__ import absolute_import, division, print_function
 
 import warnings
+import numbers
 from os.path import basename
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
 
 from glue.core.coordinates import coordinates_from_header, WCSCoordinates
 from glue.core.data import Component, Data
-from glue.config import data_factory, qglue_parser
+from glue.config import data_factory, qglue_parser, settings
+from glue.core.data_factories.helpers import sniff_file
 
 
-__all__ = ['is_fits', 'fits_reader', 'is_casalike', 'casalike_cube']
+__all__ = ['is_fits', 'fits_reader', 'is_casalike', 'casalike_cube',
+           'FITSImageArray']
 
 
 def is_fits(filename):
+
+    # All uncompressed FITS files begin with the SIMPLE card, so we only need
+    # to open the file with Astropy for compressed files.
+    try:
+        sniff = sniff_file(filename)
+    except IOError:
+        return False
+    if sniff.header.startswith(b'SIMPLE  ='):
+        return True
+    elif not sniff.compressed:
+        return False
+
     from astropy.io import fits
     try:
         with warnings.catch_warnings():
@@ -87,14 +105,16 @@ def fits_reader(source, auto_merge=False, exclude_exts=None, label=None):
         extension_by_shape[shape] = hdu_name
         return data
 
+    # We only use the headers to find out which HDUs to read, and only access
+    # the data of image HDUs when components are accessed, so that opening
+    # files with many (or tile-compressed) extensions is fast.
     for extnum, hdu in enumerate(hdulist):
         hdu_name = hdu.name if hdu.name else "HDU{0}".format(extnum)
-        if (hdu.data is not None and
-                hdu.data.size > 0 and
-                hdu_name not in exclude_exts and
-                extnum not in exclude_exts):
+        if (hdu_name not in exclude_exts and
+                extnum not in exclude_exts and
+                _hdu_size(hdu) > 0):
             if is_image_hdu(hdu):
-                shape = hdu.data.shape
+                shape = _image_shape(hdu.header)
                 coords = coordinates_from_header(hdu.header)
                 if not auto_merge or has_wcs(coords):
                     data = new_data()
@@ -103,7 +123,7 @@ def fits_reader(source, auto_merge=False, exclude_exts=None, label=None):
                         data = groups[extension_by_shape[shape]]
                     except KeyError:
                         data = new_data()
-                data.add_component(component=hdu.data,
+                data.add_component(component=_image_array(hdu),
                                    label=hdu_name)
             elif is_table_hdu(hdu):
                 # Loop through columns and make component list
@@ -127,6 +147,169 @@ def fits_reader(source, auto_merge=False, exclude_exts=None, label=None):
 
 # Utilities
 
+BITPIX_DTYPES = {8: np.uint8, 16: np.int16, 32: np.int32, 64: np.int64,
+                 -32: np.float32, -64: np.float64}
+
+
+def _image_shape(header):
+    """
+    Return the shape of an image from its header, in Numpy order.
+    """
+    return tuple(header['NAXIS{0}'.format(axis)]
+                 for axis in range(header['NAXIS'], 0, -1))
+
+
+def _image_dtype(header):
+    """
+    Return the data type that Astropy uses for an image, from its header.
+    """
+    bitpix = header['BITPIX']
+    bscale = header.get('BSCALE', 1)
+    bzero = header.get('BZERO', 0)
+    if bscale == 1 and bzero == 0:
+        return np.dtype(BITPIX_DTYPES[bitpix])
+    elif bscale == 1 and bitpix == 8 and bzero == -128:
+        return np.dtype(np.int8)
+    elif bscale == 1 and bitpix in (16, 32, 64) and bzero == 2 ** (bitpix - 1):
+        return np.dtype('uint{0}'.format(bitpix))
+    elif bitpix in (8, 16, -32):
+        return np.dtype(np.float32)
+    else:
+        return np.dtype(np.float64)
+
+
+def _hdu_size(hdu):
+    """
+    Return the number of values in an HDU, using the header if the data has
+    not been read in yet.
+    """
+    if hdu.fileinfo() is None:
+        return 0 if hdu.data is None else hdu.data.size
+    elif is_image_hdu(hdu):
+        shape = _image_shape(hdu.header)
+        return int(np.prod(shape)) if shape else 0
+    elif is_table_hdu(hdu):
+        return hdu.header['NAXIS2']
+    elif hdu.data is None:
+        return 0
+    else:
+        return hdu.data.size
+
+
+def _image_array(hdu):
+    """
+    Return the values for an image HDU as a memory-mapped array, or if the
+    values need to be decompressed or scaled, as a `FITSImageArray`.
+    """
+    from astropy.io.fits.hdu import CompImageHDU
+
+    if hdu.fileinfo() is None:
+        return hdu.data  # data that is not in a file is already in memory
+
+    header = hdu.header
+    scaled = header.get('BSCALE', 1) != 1 or header.get('BZERO', 0) != 0
+
+    if isinstance(hdu, CompImageHDU) or scaled:
+        return FITSImageArray(hdu)
+    else:
+        return hdu.data
+
+
+def _expand_view(view, shape):
+    # Convert a view into a tuple with one integer or slice per dimension
+    if not isinstance(view, tuple):
+        view = (view,)
+    if Ellipsis in view:
+        index = view.index(Ellipsis)
+        n_missing = len(shape) - len(view) + 1
+        view = view[:index] + (slice(None),) * n_missing + view[index + 1:]
+    return view + (slice(None),) * (len(shape) - len(view))
+
+
+_decompress_pool = None
+
+
+def _get_decompress_pool():
+    global _decompress_pool
+    if _decompress_pool is None:
+        _decompress_pool = ThreadPool(settings.FITS_DECOMPRESS_THREADS)
+    return _decompress_pool
+
+
+class FITSImageArray(object):
+    """
+    An array-like object for a tile-compressed or scaled FITS image HDU,
+    which only decompresses or scales the values in the requested views.
+
+    Views of tile-compressed images spanning several rows of tiles are
+    decompressed in parallel, if the installed version of Astropy can read
+    sections of compressed images. Otherwise, the whole image is decompressed
+    the first time a view is requested.
+
+    Parameters
+    ----------
+    hdu : `~astropy.io.fits.ImageHDU` or `~astropy.io.fits.CompImageHDU`
+        The HDU to read from
+    """
+
+    def __init__(self, hdu):
+
+        from astropy.io.fits.hdu import CompImageHDU
+
+        self._hdu = hdu
+        self._compressed = isinstance(hdu, CompImageHDU)
+
+        self.shape = _image_shape(hdu.header)
+        self.ndim = len(self.shape)
+        self.dtype = _image_dtype(hdu.header)
+
+        if self._compressed:
+            # The binary table header of the HDU includes the tile sizes,
+            # which default to one row of the image at a time.
+            table_header = getattr(hdu, '_header', hdu.header)
+            tiles = [table_header.get('ZTILE{0}'.format(axis), 1)
+                     for axis in range(self.ndim, 1, -1)]
+            tiles.append(table_header.get('ZTILE1', self.shape[-1]))
+            self.chunks = tuple(min(t, s) for t, s in zip(tiles, self.shape))
+        else:
+            self.chunks = self.shape
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, view):
+
+        section = getattr(self._hdu, 'section', None)
+        if section is None:
+            return self._hdu.data[view]
+
+        view = _expand_view(view, self.shape)
+
+        if not self._compressed or isinstance(view[0], numbers.Integral):
+            return section[view]
+
+        # We split up the view into bands made up of whole rows of tiles along
+        # the first dimension, and decompress these in parallel.
+
+        start, stop, step = view[0].indices(self.shape[0])
+        n_threads = settings.FITS_DECOMPRESS_THREADS
+        n_tiles = self.chunks[0]
+        band = max(n_tiles, -(-(stop - start) // (n_threads * n_tiles)) * n_tiles)
+        if n_threads <= 1 or step < 0 or stop - start <= band:
+            return section[view]
+
+        bands = []
+        for band_start in range(start - start % n_tiles, stop, band):
+            first = max(start, band_start)
+            first += (start - first) % step  # align to the step
+            last = min(stop, band_start + band)
+            if first < last:
+                bands.append((slice(first, last, step),) + view[1:])
+
+        values = _get_decompress_pool().map(section.__getitem__, bands)
+        return np.concatenate(values)
+
+
 def is_image_hdu(hdu):
     from astropy.io.fits.hdu import PrimaryHDU, ImageHDU, CompImageHDU
     return isinstance(hdu, (PrimaryHDU, ImageHDU, CompImageHDU))
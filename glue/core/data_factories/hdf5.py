@@ -1,14 +1,22 @@
 from __future__ import absolute_import, division, print_function
 
 import os
+import numbers
 import warnings
+import itertools
+import threading
 from collections import OrderedDict
 
+import numpy as np
+
 from glue.core.data import Component, Data
+from glue.core.component import LazyComponent
+from glue.core.cache import ArrayCache
 from glue.config import data_factory
+from glue.core.data_factories.helpers import has_magic
 
 
-__all__ = ['is_hdf5', 'hdf5_reader']
+__all__ = ['is_hdf5', 'hdf5_reader', 'HDF5FileHandle', 'HDF5Dataset']
 
 
 def extract_hdf5_datasets(handle):
@@ -32,10 +40,187 @@ def extract_hdf5_datasets(handle):
     return datasets
 
 
+class HDF5ChunkCache(ArrayCache):
+    """
+    A least-recently-used cache for the chunks read from HDF5 datasets.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached chunks, in bytes. If not
+        specified, the ``HDF5_CHUNK_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'HDF5_CHUNK_CACHE_SIZE'
+
+
+# The chunks read from all files are kept in a single cache, so that
+# HDF5_CHUNK_CACHE_SIZE limits the total memory used. The cache can be used
+# from the DataLoader worker threads, so is only accessed while holding
+# _chunk_lock.
+_chunk_cache = HDF5ChunkCache()
+_chunk_lock = threading.Lock()
+
+
+class HDF5FileHandle(object):
+    """
+    A handle on an HDF5 file which is kept open while datasets from the file
+    are in use, and re-opened if it was closed in the mean time.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the HDF5 file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+        # Identifies the file in cache keys, so that chunks cached for a file
+        # that has since been modified or replaced are not used.
+        stat = os.stat(filename)
+        self.key = os.path.abspath(filename), stat.st_mtime, stat.st_size
+
+    @property
+    def file(self):
+        """
+        The open `h5py.File`
+        """
+        import h5py
+        if self._file is None or not self._file.id.valid:
+            self._file = h5py.File(self.filename, 'r')
+        return self._file
+
+    def close(self):
+        """
+        Close the file. It is re-opened if it is accessed again.
+        """
+        if self._file is not None and self._file.id.valid:
+            self._file.close()
+        self._file = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:  # h5py may already have been torn down on exit
+            pass
+
+
+def _chunk_ranges(index, size, chunk):
+    # Return the range of chunks along one dimension needed for an integer or
+    # slice (with a positive step) index.
+    if isinstance(index, numbers.Integral):
+        if index < 0:
+            index += size
+        return index // chunk, index // chunk + 1
+    start, stop, step = index.indices(size)
+    if stop <= start:
+        return 0, 0
+    last = start + (stop - start - 1) // step * step
+    return start // chunk, last // chunk + 1
+
+
+class HDF5Dataset(object):
+    """
+    An array-like object for a numerical HDF5 dataset, which reads the
+    values on demand, one chunk of the dataset at a time.
+
+    Only the chunks that intersect a view are read, and these are kept in a
+    cache, so that e.g. slicing through a cube only reads the chunks that
+    intersect the requested plane. Contiguous (non-chunked) datasets are read
+    directly for each view.
+
+    Parameters
+    ----------
+    handle : `HDF5FileHandle`
+        The file containing the dataset
+    name : str
+        The full name of the dataset in the file
+    cache : `HDF5ChunkCache`, optional
+        The cache to use for the chunks read. By default, the chunks are kept
+        in a cache shared by all datasets.
+    """
+
+    def __init__(self, handle, name, cache=None):
+
+        self._handle = handle
+        self._name = name
+        self._cache = _chunk_cache if cache is None else cache
+
+        dataset = self._dataset
+        self.shape = dataset.shape
+        self.ndim = len(self.shape)
+        self.dtype = dataset.dtype
+        self._chunked = dataset.chunks is not None
+        self.chunks = dataset.chunks if self._chunked else self.shape
+
+    @property
+    def _dataset(self):
+        return self._handle.file[self._name]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _read_chunk(self, chunk_index):
+        key = self._handle.key, self._name, chunk_index
+        with _chunk_lock:
+            values = self._cache.get(key)
+        if values is None:
+            view = tuple(slice(i * c, min((i + 1) * c, s))
+                         for i, c, s in zip(chunk_index, self.chunks, self.shape))
+            values = self._dataset[view]
+            values.setflags(write=False)
+            with _chunk_lock:
+                self._cache.set(key, values)
+        return values
+
+    def __getitem__(self, view):
+
+        if not isinstance(view, tuple):
+            view = (view,)
+
+        if Ellipsis in view:
+            index = view.index(Ellipsis)
+            n_missing = self.ndim - len(view) + 1
+            view = view[:index] + (slice(None),) * n_missing + view[index + 1:]
+        view = view + (slice(None),) * (self.ndim - len(view))
+
+        if not self._chunked or self.ndim == 0:
+            return self._dataset[view]
+
+        # Find the range of chunks along each dimension, and assemble the
+        # block of values covered by these chunks.
+
+        ranges = [_chunk_ranges(v, s, c) for v, s, c in zip(view, self.shape, self.chunks)]
+
+        if any(stop <= start for start, stop in ranges):
+            return self._dataset[view]
+
+        origin = [start * c for (start, _), c in zip(ranges, self.chunks)]
+        block_shape = [min(stop * c, s) - o for (_, stop), c, s, o
+                       in zip(ranges, self.chunks, self.shape, origin)]
+        block = np.empty(block_shape, dtype=self.dtype)
+
+        for chunk_index in itertools.product(*[range(*r) for r in ranges]):
+            target = tuple(slice(i * c - o, min((i + 1) * c, s) - o)
+                           for i, c, s, o in zip(chunk_index, self.chunks, self.shape, origin))
+            block[target] = self._read_chunk(chunk_index)
+
+        # Finally, we apply the view relative to the origin of the block
+        local = []
+        for v, s, o in zip(view, self.shape, origin):
+            if isinstance(v, numbers.Integral):
+                local.append((v + s if v < 0 else v) - o)
+            else:
+                start, stop, step = v.indices(s)
+                local.append(slice(start - o, stop - o, step))
+
+        return block[tuple(local)]
+
+
 def is_hdf5(filename):
     # All hdf5 files begin with the same sequence
-    with open(filename, 'rb') as infile:
-        return infile.read(8) == b'\x89HDF\r\n\x1a\n'
+    return has_magic(filename, b'\x89HDF\r\n\x1a\n')
 
 
 @data_factory(label="HDF5 file", identifier=is_hdf5, priority=100)
@@ -43,23 +228,21 @@ def hdf5_reader(filename, format='auto', auto_merge=False, **kwargs):
     """
     Read in all datasets from an HDF5 file
 
+    Numerical datasets are read lazily, one chunk at a time, when their values
+    are needed, and the file is kept open while the datasets are in use.
+
     Parameters
     ----------
-    source: str or HDUList
-        The pathname to the FITS file.
-        If an HDUList is passed in, simply use that.
+    source: str
+        The pathname to the HDF5 file.
     """
 
-    import h5py
     from astropy.table import Table
 
-    # Open file
-    file_handle = h5py.File(filename, 'r')
-
-    # Define function to read
+    handle = HDF5FileHandle(filename)
 
     # Read in all datasets
-    datasets = extract_hdf5_datasets(file_handle)
+    datasets = extract_hdf5_datasets(handle.file)
 
     label_base = os.path.basename(filename).rpartition('.')[0]
 
@@ -76,13 +259,18 @@ def hdf5_reader(filename, format='auto', auto_merge=False, **kwargs):
             key
         )
         if datasets[key].dtype.kind in ('f', 'i'):
-            if auto_merge and datasets[key].value.shape in data_by_shape:
-                data = data_by_shape[datasets[key].value.shape]
+            shape = datasets[key].shape
+            if auto_merge and shape in data_by_shape:
+                data = data_by_shape[shape]
             else:
                 data = Data(label=label)
-                data_by_shape[datasets[key].value.shape] = data
+                data_by_shape[shape] = data
                 groups[label] = data
-            data.add_component(component=datasets[key].value, label=key)
+            if len(shape) == 0:
+                component = Component(np.asarray(datasets[key][()]))
+            else:
+                component = LazyComponent(HDF5Dataset(handle, key))
+            data.add_component(component=component, label=key)
         else:
             table = Table.read(datasets[key], format='hdf5')
             data = Data(label=label)
@@ -96,7 +284,4 @@ def hdf5_reader(filename, format='auto', auto_merge=False, **kwargs):
                 else:
                     warnings.warn("HDF5: Ignoring vector column {0}".format(column_name))
 
-    # Close HDF5 file
-    file_handle.close()
-
     return [groups[idx] for idx in groups]
@@ -26,19 +26,37 @@ from __future__ import absolute_import, division, print_function
 
 import os
 import warnings
+import threading
+from contextlib import contextmanager
+from collections import namedtuple, OrderedDict
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
 
 from glue.core.contracts import contract
 from glue.core.data import Component, Data
-from glue.config import auto_refresh, data_factory
+from glue.core.component import CoordinateComponent, LazyComponent
+from glue.config import auto_refresh, data_factory, settings
 from glue.backends import get_timer
 from glue.utils import as_list
 from glue.logger import logger
 
-__all__ = ['FileWatcher', 'LoadLog',
+__all__ = ['DeferredArray', 'DeferredLoad', 'FileWatcher', 'LoadLog',
            'auto_data', 'data_label', 'find_factory',
-           'has_extension', 'load_data',
+           'has_extension', 'has_magic', 'load_data', 'sniff_file',
+           'progress_callback', 'report_progress', 'start_deferred_loading',
            '_extension']
 
+# The number of bytes read from the start of files to identify them. This is
+# the size of a FITS block, which is enough to include the magic bytes of all
+# the binary formats we know about as well as the first lines of text files.
+SNIFF_SIZE = 2880
+
+# The maximum number of files for which identification results are cached
+IDENTIFY_CACHE_SIZE = 128
+
+COMPRESSION_MAGIC = (b'\x1f\x8b', b'BZh')
+
 
 def _extension(path):
     # extract the extension type from a path
@@ -80,6 +98,123 @@ def has_extension(exts):
     return tester
 
 
+_progress = threading.local()
+
+
+def report_progress(fraction):
+    """
+    Report how much of a file a data factory has read so far.
+
+    Data factories that read large files in several steps can call this
+    regularly. This has no effect unless a callback was set for the current
+    thread with :func:`progress_callback`.
+
+    Parameters
+    ----------
+    fraction : float
+        The fraction of the file read, between 0 and 1
+    """
+    callback = getattr(_progress, 'callback', None)
+    if callback is not None:
+        callback(min(max(fraction, 0.), 1.))
+
+
+@contextmanager
+def progress_callback(callback):
+    """
+    Context manager to set the function called with the progress reported
+    by data factories running on the current thread.
+    """
+    previous = getattr(_progress, 'callback', None)
+    _progress.callback = callback
+    try:
+        yield
+    finally:
+        _progress.callback = previous
+
+
+class FileSniff(namedtuple('FileSniff', 'path extension header')):
+    """
+    The result of the cheap first stage of file identification: the absolute
+    path, the lower-case extension, and the first bytes of a file.
+    """
+
+    __slots__ = ()
+
+    @property
+    def binary(self):
+        """Whether the start of the file contains null bytes"""
+        return b'\x00' in self.header
+
+    @property
+    def compressed(self):
+        """Whether the file is compressed with gzip or bzip2"""
+        return self.header.startswith(COMPRESSION_MAGIC)
+
+
+# The identification caches are used by the DataLoader worker threads, so
+# are only accessed while holding _cache_lock.
+_sniff_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _file_key(path):
+    # The key used to cache identification results - this changes if the file
+    # is modified or replaced.
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_ino, stat.st_mtime, stat.st_size)
+
+
+def _cache_set(cache, key, value):
+    with _cache_lock:
+        cache[key] = value
+        while len(cache) > IDENTIFY_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def sniff_file(path):
+    """
+    Read the first bytes of a file, for use by identifier functions.
+
+    The result is cached per path, modification time and size, so that the
+    file is only read once no matter how many identifiers need to check the
+    magic bytes or header of the file.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file
+
+    Returns
+    -------
+    sniff : `FileSniff`
+        The extension and header of the file
+    """
+    key = _file_key(path)
+    with _cache_lock:
+        sniff = _sniff_cache.get(key)
+    if sniff is None:
+        with open(path, 'rb') as infile:
+            header = infile.read(SNIFF_SIZE)
+        sniff = FileSniff(key[0], _extension(path).lower(), header)
+        _cache_set(_sniff_cache, key, sniff)
+    return sniff
+
+
+def has_magic(path, magic):
+    """
+    Return whether a file starts with the specified magic bytes.
+
+    Parameters
+    ----------
+    path : str
+        The path to the file
+    magic : bytes or tuple of bytes
+        The magic bytes, or a tuple of allowed values
+    """
+    return sniff_file(path).header.startswith(magic)
+
+
 class LoadLog(object):
 
     """
@@ -150,17 +285,144 @@ class LoadLog(object):
             dold.update_components(mapping)
 
     def __gluestate__(self, context):
-        return dict(path=self.path,
-                    factory=context.do(self.factory),
-                    kwargs=[list(self.kwargs.items())])
+        result = dict(path=self.path,
+                      factory=context.do(self.factory),
+                      kwargs=[list(self.kwargs.items())])
+        # The shape and type of the components are saved so that reading the
+        # file can be deferred when restoring the session.
+        components = [_component_summary(c) for c in self.components]
+        if None not in components:
+            result['components'] = components
+        return result
 
     @classmethod
     def __setgluestate__(cls, rec, context):
         fac = context.object(rec['factory'])
         kwargs = dict(*rec['kwargs'])
+        if context.defer_loading and 'components' in rec:
+            return cls._deferred(rec['path'], fac, kwargs, rec['components'])
         d = load_data(rec['path'], factory=fac, **kwargs)
         return as_list(d)[0]._load_log
 
+    @classmethod
+    def _deferred(cls, path, factory, kwargs, components):
+        # Create a log whose components are placeholders that read the file
+        # the first time the values are needed.
+        log = cls(path, factory, kwargs)
+        deferred = DeferredLoad(log.path, factory, kwargs)
+        for index, summary in enumerate(components):
+            if 'shape' in summary:
+                array = DeferredArray(deferred, index, summary['shape'], summary['dtype'])
+                log.log(LazyComponent(array, units=summary['units']))
+            else:
+                log.components.append(None)
+        return log
+
+
+def _component_summary(component):
+    # Return the information needed to create a placeholder for a component,
+    # or None if this is not possible (e.g. for categorical components, for
+    # which the categories need to be known up front).
+    if component is None or isinstance(component, CoordinateComponent):
+        return {}
+    elif isinstance(component, LazyComponent):
+        dtype = component._dtype or component.array.dtype
+    elif type(component) is Component:
+        dtype = component._data.dtype
+    else:
+        return None
+    return dict(shape=list(component.shape), dtype=np.dtype(dtype).str,
+                units=component.units)
+
+
+_deferred_pool = None
+
+
+def _get_deferred_pool():
+    global _deferred_pool
+    if _deferred_pool is None:
+        _deferred_pool = ThreadPool(settings.DATA_LOADER_WORKERS)
+    return _deferred_pool
+
+
+class DeferredLoad(object):
+    """
+    A file whose loading has been deferred, e.g. when restoring a session.
+
+    The file is read on a background thread when :meth:`start` is called,
+    or the first time the values of one of its components are needed.
+    """
+
+    def __init__(self, path, factory, kwargs):
+        self.path = path
+        self.factory = factory
+        self.kwargs = kwargs
+        self._lock = threading.Lock()
+        self._result = None
+        self._components = None
+
+    @property
+    def loaded(self):
+        """
+        Whether the file has been read
+        """
+        return self._result is not None and self._result.ready()
+
+    def start(self):
+        """
+        Start reading the file in the background, if not already started.
+        """
+        with self._lock:
+            if self._result is None:
+                self._result = _get_deferred_pool().apply_async(
+                    _read_data, (self.path, self.factory), self.kwargs)
+
+    def component(self, index):
+        """
+        Return a component read from the file, using the same numbering as
+        :meth:`LoadLog.component`, waiting for the file to be read if needed.
+        """
+        if self._components is None:
+            self.start()
+            datasets = self._result.get()
+            self._components = [data.get_component(cid) for data in datasets
+                                for cid in data.primary_components]
+        return self._components[index]
+
+
+class DeferredArray(object):
+    """
+    An array-like placeholder for the values of a component of a file whose
+    loading has been deferred, for use with
+    :class:`~glue.core.component.LazyComponent`.
+    """
+
+    def __init__(self, deferred, index, shape, dtype):
+        self.deferred = deferred
+        self.index = index
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.chunks = self.shape
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __getitem__(self, key):
+        return self.deferred.component(self.index)[key]
+
+
+def start_deferred_loading(data):
+    """
+    Start reading the files for any components of a dataset whose loading was
+    deferred, on background threads.
+    """
+    for cid in data.components:
+        component = data.get_component(cid)
+        if (isinstance(component, LazyComponent) and
+                isinstance(component.array, DeferredArray)):
+            component.array.deferred.start()
+
 
 class FileWatcher(object):
 
@@ -216,9 +478,43 @@ def load_data(path, factory=None, **kwargs):
 
     :param path: Path to a file
     :param factory: factory function to use. Defaults to :func:`auto_data`
+    :param float32: Whether to convert double-precision floating-point
+                    components to single precision. Defaults to the
+                    ``FLOAT32_COMPONENTS`` setting.
+
+    If the ``DATA_CACHE`` setting is enabled, the parsed datasets are cached
+    on disk (see :mod:`glue.core.data_factories.disk_cache`), and read back
+    from the cache if the same file is loaded again.
 
     Extra keywords are passed through to factory functions
     """
+    factory = factory or auto_data
+    d = _log_data(path, factory, kwargs, _read_data(path, factory, **kwargs))
+
+    if len(d) == 1:
+        # unpack single-length lists for user convenience
+        return d[0]
+
+    return d
+
+
+def _read_data(path, factory, **kwargs):
+    # Run the factory and return a list of labelled Data objects. This only
+    # touches global caches (which are protected by locks) so can be run on
+    # a different thread from the main application.
+
+    from glue.core.data_factories.astropy_table import clear_identified_tables
+
+    try:
+        return _run_factory(path, factory, **kwargs)
+    finally:
+        # Tables parsed when identifying the file are only useful to the
+        # factory, so should not be kept alive once the data has been read.
+        clear_identified_tables()
+
+
+def _run_factory(path, factory, **kwargs):
+
     from glue.qglue import parse_data
 
     def as_data_objects(ds, lbl):
@@ -231,26 +527,47 @@ def load_data(path, factory=None, **kwargs):
             for item in parse_data(d, lbl):
                 yield item
 
-    factory = factory or auto_data
     lbl = data_label(path)
 
+    from glue.core.data_factories.disk_cache import get_data_cache
+
+    float32 = kwargs.pop('float32', None)
+    if float32 is None:
+        float32 = settings.FLOAT32_COMPONENTS
+
+    cache = get_data_cache()
+    if cache is not None:
+        cache_kwargs = dict(kwargs, float32=float32)
+        d = cache.get(path, factory, cache_kwargs)
+        if d is not None:
+            return d
+
     d = as_list(factory(path, **kwargs))
     d = list(as_data_objects(d, lbl))
-    log = LoadLog(path, factory, kwargs)
     for item in d:
         if not item.label:
             item.label = lbl
-        log.log(item)  # attaches log metadata to item
-        for cid in item.primary_components:
-            log.log(item.get_component(cid))
+        if float32:
+            for cid in item.components:
+                item.get_component(cid).to_float32()
 
-    if len(d) == 1:
-        # unpack single-length lists for user convenience
-        return d[0]
+    if cache is not None:
+        cache.set(path, factory, cache_kwargs, d)
 
     return d
 
 
+def _log_data(path, factory, kwargs, datasets):
+    # Attach the metadata needed to reload the data from the file (and to
+    # watch the file for changes) to datasets returned by _read_data.
+    log = LoadLog(path, factory, kwargs)
+    for item in datasets:
+        log.log(item)  # attaches log metadata to item
+        for cid in item.primary_components:
+            log.log(item.get_component(cid))
+    return datasets
+
+
 def data_label(path):
     """Convert a file path into a data label, by stripping out
     slashes, file extensions, etc."""
@@ -270,11 +587,32 @@ def get_default_factory(extension):  # pragma: no cover
     return None
 
 
+_factory_cache = OrderedDict()
+
+
 @contract(filename='string')
 def find_factory(filename, **kwargs):
 
     from glue.config import data_factory
 
+    # Identification is done in two stages: we first read the start of the
+    # file once, and the identifiers use this to check magic bytes and
+    # headers. Identifiers then only need to do expensive checks (e.g. open
+    # the file with astropy.io.fits) if these cheap checks pass. The overall
+    # result is cached so that identifying the same unmodified file again
+    # (e.g. in auto_data after the data wizard) is free.
+
+    try:
+        sniff_file(filename)
+        key = (_file_key(filename), repr(sorted(kwargs.items())),
+               len(data_factory.members))
+    except (IOError, OSError, TypeError):
+        key = None
+    else:
+        with _cache_lock:
+            if key in _factory_cache:
+                return _factory_cache[key]
+
     # We no longer try the 'default' factory first because we actually need to
     # try all identifiers and select the one to use based on the priority. This
     # allows us to define more specialized loaders take priority over more
@@ -314,12 +652,15 @@ def find_factory(filename, **kwargs):
     logger.info('Valid formats: {0}'.format(valid_formats))
 
     if len(valid_formats) == 0:
-        return None
-    elif len(valid_formats) > 1:
-        labels = ["'{0}'".format(x.label) for x in valid_formats]
-        warnings.warn("Multiple data factories matched the input: {0}. Choosing {1}.".format(', '.join(labels), labels[0]))
-
-    func = valid_formats[0].function
+        func = None
+    else:
+        if len(valid_formats) > 1:
+            labels = ["'{0}'".format(x.label) for x in valid_formats]
+            warnings.warn("Multiple data factories matched the input: {0}. Choosing {1}.".format(', '.join(labels), labels[0]))
+        func = valid_formats[0].function
+
+    if key is not None:
+        _cache_set(_factory_cache, key, func)
 
     return func
 
@@ -0,0 +1,279 @@
+"""
+A service to load files in the background using a pool of threads.
+
+Data factories are run on worker threads, while the resulting datasets are
+handed back to the thread that owns the loader (usually the thread running the
+user interface) when :meth:`DataLoader.process` is called, so that they can be
+added to a data collection safely.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import threading
+import traceback
+from multiprocessing.pool import ThreadPool
+
+from glue.external import six
+from glue.external.six.moves import queue
+from glue.config import settings
+from glue.core.data_factories.helpers import (auto_data, progress_callback,
+                                              _read_data, _log_data)
+
+__all__ = ['DataLoader', 'LoadTask']
+
+
+class LoadTask(object):
+    """
+    A file being loaded by a :class:`DataLoader`.
+
+    The ``state`` attribute is one of ``'pending'``, ``'running'``,
+    ``'done'``, ``'failed'`` or ``'cancelled'``. Tasks are only marked as done
+    or failed once they have been processed by the loader. Once the task is
+    done, ``result`` is the list of loaded datasets, and if it failed,
+    ``error`` and ``detail`` give the exception and the formatted traceback.
+    ``fraction`` gives how much of the file has been read, for factories
+    that report their progress.
+    """
+
+    def __init__(self, path, factory, kwargs):
+        self.path = path
+        self.factory = factory or auto_data
+        self.kwargs = kwargs
+        self.state = 'pending'
+        self.result = None
+        self.error = None
+        self.detail = None
+        self.fraction = 0.
+        self._outcome = None
+
+    @property
+    def finished(self):
+        return self.state in ('done', 'failed', 'cancelled')
+
+    def __repr__(self):
+        return "<LoadTask {0} ({1})>".format(self.path, self.state)
+
+
+class DataLoader(object):
+    """
+    Load files using data factories on a pool of worker threads.
+
+    Parameters
+    ----------
+    on_load : callable, optional
+        Called with each :class:`LoadTask` that completes successfully, in the
+        order in which the files finish loading.
+    on_error : callable, optional
+        Called with each :class:`LoadTask` that fails.
+    on_progress : callable, optional
+        Called with the number of finished tasks and the total number of
+        tasks every time a task finishes or new tasks are submitted.
+    n_workers : int, optional
+        The number of worker threads. Defaults to the ``DATA_LOADER_WORKERS``
+        setting.
+
+    Notes
+    -----
+    Callbacks are only ever called from :meth:`process`, :meth:`wait` and
+    :meth:`submit`, on the thread calling these methods, and never on the
+    worker threads.
+    """
+
+    def __init__(self, on_load=None, on_error=None, on_progress=None, n_workers=None):
+        self.on_load = on_load
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._n_workers = n_workers
+        self._pool = None
+        self._lock = threading.Lock()
+        self._finished = queue.Queue()
+        self._tasks = []
+
+    @property
+    def n_workers(self):
+        if self._n_workers is None:
+            return settings.DATA_LOADER_WORKERS
+        else:
+            return self._n_workers
+
+    @property
+    def tasks(self):
+        """
+        The tasks submitted since the loader was last idle
+        """
+        return list(self._tasks)
+
+    @property
+    def progress(self):
+        """
+        The number of finished (and processed) tasks and the total number of
+        tasks
+        """
+        return len([task for task in self._tasks if task.finished]), len(self._tasks)
+
+    @property
+    def fraction(self):
+        """
+        The overall fraction of the files read so far, between 0 and 1
+        """
+        if len(self._tasks) == 0:
+            return 1.
+        return sum(1. if task.finished else task.fraction
+                   for task in self._tasks) / len(self._tasks)
+
+    @property
+    def busy(self):
+        """
+        Whether any of the tasks have not finished or have not been processed
+        yet
+        """
+        return any(not task.finished for task in self._tasks)
+
+    def submit(self, paths, factory=None, **kwargs):
+        """
+        Start loading one or more files.
+
+        Parameters
+        ----------
+        paths : str or iterable of str
+            The files to load
+        factory : callable, optional
+            The data factory to use. Defaults to
+            :func:`~glue.core.data_factories.auto_data`.
+        kwargs
+            Passed to the data factory
+
+        Returns
+        -------
+        tasks : list of :class:`LoadTask`
+        """
+
+        if isinstance(paths, six.string_types):
+            paths = [paths]
+
+        # Once all previous tasks have finished and been processed, we start
+        # counting progress from scratch.
+        if not self.busy:
+            self._tasks = []
+
+        if self._pool is None:
+            self._pool = ThreadPool(self.n_workers)
+
+        tasks = [LoadTask(path, factory, kwargs.copy()) for path in paths]
+        self._tasks.extend(tasks)
+
+        for task in tasks:
+            self._pool.apply_async(self._run, (task,))
+
+        self._notify_progress()
+
+        return tasks
+
+    def _run(self, task):
+
+        # This is the only method that runs on worker threads. The final state
+        # of the task is only set once it is processed by _finish.
+
+        with self._lock:
+            if task.state == 'cancelled':
+                return
+            task.state = 'running'
+
+        def set_fraction(fraction):
+            task.fraction = fraction
+
+        try:
+            with progress_callback(set_fraction):
+                result = _read_data(task.path, task.factory, **task.kwargs)
+        except Exception as exc:
+            task.error = exc
+            task.detail = ''.join(traceback.format_exception(*sys.exc_info()))
+            task._outcome = 'failed'
+        else:
+            task.result = result
+            task._outcome = 'done'
+
+        with self._lock:
+            if task.state == 'cancelled':
+                task.result = None
+                return
+            self._finished.put(task)
+
+    def process(self):
+        """
+        Hand the datasets of tasks that finished since the last call to the
+        callbacks. This should be called regularly, e.g. from a timer, by the
+        thread that owns the loader.
+
+        Returns
+        -------
+        tasks : list of :class:`LoadTask`
+            The tasks that finished since the last call
+        """
+
+        finished = []
+
+        while True:
+            try:
+                task = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            self._finish(task)
+            finished.append(task)
+
+        if finished:
+            self._notify_progress()
+
+        return finished
+
+    def wait(self):
+        """
+        Process tasks until all of them have finished.
+        """
+        while self.busy:
+            self._finish(self._finished.get())
+            self._notify_progress()
+
+    def cancel(self):
+        """
+        Cancel all tasks that have not been processed yet. Files that are
+        already being read will still be read, but the resulting datasets are
+        discarded.
+        """
+        with self._lock:
+            for task in self._tasks:
+                if task.state in ('pending', 'running'):
+                    task.state = 'cancelled'
+                    task.result = None
+            while True:
+                try:
+                    self._finished.get_nowait()
+                except queue.Empty:
+                    break
+        self._notify_progress()
+
+    def shutdown(self):
+        """
+        Cancel all tasks and stop the worker threads.
+        """
+        self.cancel()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def _finish(self, task):
+        if task.state == 'cancelled':
+            return
+        task.state = task._outcome
+        if task.state == 'done':
+            task.result = _log_data(task.path, task.factory, task.kwargs, task.result)
+            if self.on_load is not None:
+                self.on_load(task)
+        elif task.state == 'failed':
+            if self.on_error is not None:
+                self.on_error(task)
+
+    def _notify_progress(self):
+        if self.on_progress is not None:
+            self.on_progress(*self.progress)
@@ -2,7 +2,7 @@ from __future__ import absolute_import, division, print_function
 
 from glue.core.data import Data, Component
 from glue.config import data_factory
-from glue.core.data_factories.helpers import has_extension
+from glue.core.data_factories.helpers import has_extension, sniff_file
 
 __all__ = ['is_npy_npz', 'npy_npz_reader']
 
@@ -15,8 +15,7 @@ def is_npy_npz(filename):
     from numpy.lib.format import MAGIC_PREFIX
     MAGIC_PREFIX_NPZ = b'PK\x03\x04'  # first 4 bytes for a zipfile
     tester = has_extension('npz .npz')
-    with open(filename, 'rb') as infile:
-        prefix = infile.read(6)
+    prefix = sniff_file(filename).header[:6]
     return prefix == MAGIC_PREFIX or (tester(filename) and prefix[:4] == MAGIC_PREFIX_NPZ)
 
 
@@ -1,18 +1,65 @@
 from __future__ import absolute_import, division, print_function
 
+import warnings
+from collections import deque
+from functools import partial
+from multiprocessing.pool import ThreadPool
+
 import numpy as np
 
 import pandas as pd
 
 from glue.external import six
-from glue.core.data_factories.helpers import has_extension
-from glue.core.component import Component, CategoricalComponent
+from glue.core.data_factories.helpers import has_extension, report_progress, sniff_file
+from glue.core.component import Component, CategoricalComponent, _append_values
 from glue.core.data import Data
 from glue.config import data_factory, qglue_parser
 
 
 __all__ = ['pandas_read_table']
 
+# The number of rows used to find the delimiter and the type of each column
+SAMPLE_ROWS = 1000
+
+# The number of rows parsed at a time when reading the whole table
+CHUNK_ROWS = 100000
+
+# The number of threads converting the columns of chunks that have been parsed
+CONVERT_THREADS = 2
+
+
+def _to_numeric(column):
+    try:
+        return pd.to_numeric(column, errors='coerce')
+    except AttributeError:  # pandas < 0.19
+        return column.convert_objects(convert_numeric=True)
+
+
+def _is_categorical(column):
+    # Whether a column should be read in as a categorical component. Text
+    # columns are read in as numerical columns if most values are numbers.
+    if (column.dtype == np.object_) | (column.dtype == np.bool_):
+        coerced = _to_numeric(column)
+        return not ((coerced.dtype != column.dtype) and coerced.isnull().mean() < 0.4)
+    else:
+        return str(column.dtype) == 'category'
+
+
+def _component_name(name):
+
+    # convert header to string - in some cases if the first row contains
+    # numbers, these are cast to numerical types, so we want to change that
+    # here.
+    if not isinstance(name, six.string_types):
+        name = str(name)
+
+    # strip off leading #
+    name = name.strip()
+    if name.startswith('#'):
+        name = name[1:].strip()
+
+    return name
+
 
 def panda_process(indf):
     """
@@ -22,35 +69,156 @@ def panda_process(indf):
     """
     result = Data()
     for name, column in indf.iteritems():
-        if (column.dtype == np.object) | (column.dtype == np.bool):
+        if str(column.dtype) == 'category':
+            c = CategoricalComponent.from_codes(column.cat.codes.values,
+                                                column.cat.categories.values)
+        elif _is_categorical(column):
+            # pandas has a 'special' nan implementation and this doesn't
+            # play well with np.unique
+            c = CategoricalComponent(column.fillna(''))
+        elif column.dtype in (np.object_, np.bool_):
+            # salvage numerical data
+            c = Component(_to_numeric(column).values)
+        else:
+            c = Component(column.values)
 
-            # try to salvage numerical data
-            try:
-                coerced = pd.to_numeric(column, errors='coerce')
-            except AttributeError:  # pandas < 0.19
-                coerced = column.convert_objects(convert_numeric=True)
+        result.add_component(c, _component_name(name))
 
-            if (coerced.dtype != column.dtype) and coerced.isnull().mean() < 0.4:
-                c = Component(coerced.values)
-            else:
-                # pandas has a 'special' nan implementation and this doesn't
-                # play well with np.unique
-                c = CategoricalComponent(column.fillna(''))
+    return result
+
+
+def _count_rows(path):
+    # Return an upper limit on the number of rows in a file, used to allocate
+    # the arrays for the columns and to report progress, or None if the file
+    # is compressed.
+    if sniff_file(path).compressed:
+        return None
+    n_rows = 1
+    with open(path, 'rb') as infile:
+        for block in iter(partial(infile.read, 2 ** 20), b''):
+            n_rows += block.count(b'\n')
+    return n_rows
+
+
+def _convert_chunk(categorical, chunk, n_skip=0):
+    # Convert the columns of a chunk of the table to numerical values or to
+    # categorical codes (with categories local to the chunk). Also return the
+    # number of values in each column that were not missing but could not be
+    # converted to numbers, and were therefore replaced by NaN, ignoring the
+    # first n_skip rows.
+    converted = []
+    coerced = []
+    for name in chunk.columns:
+        column = chunk[name]
+        if name in categorical:
+            codes, uniques = pd.factorize(column)
+            converted.append((codes, uniques))
+            coerced.append(0)
+        elif column.dtype in (np.object_, np.bool_):
+            values = _to_numeric(column)
+            converted.append(values.values)
+            lost = values.isnull().values & column.notnull().values
+            coerced.append(int(lost[n_skip:].sum()))
         else:
-            c = Component(column.values)
+            converted.append(column.values)
+            coerced.append(0)
+    return converted, coerced
 
-        # convert header to string - in some cases if the first row contains
-        # numbers, these are cast to numerical types, so we want to change that
-        # here.
-        if not isinstance(name, six.string_types):
-            name = str(name)
 
-        # strip off leading #
-        name = name.strip()
-        if name.startswith('#'):
-            name = name[1:].strip()
+def _read_table_chunked(path, delimiter, sample, chunksize=None, **kwargs):
+    """
+    Read a table with pandas one chunk at a time, using the types of the
+    columns found from a sample of the table.
+
+    The values are appended to arrays allocated for the number of lines in
+    the file, and the categories of categorical columns are found
+    incrementally.
+    """
+
+    names = list(sample.columns)
+    categorical = set(name for name in names if _is_categorical(sample[name]))
+
+    # Categorical columns are kept as text in all chunks, so that values that
+    # look like numbers are not converted in some chunks but not others.
+    if 'dtype' not in kwargs:
+        kwargs['dtype'] = dict((name, object) for name in categorical
+                               if str(sample[name].dtype) != 'category')
+
+    n_rows_max = _count_rows(path)
+    capacity = n_rows_max or chunksize or CHUNK_ROWS
 
-        result.add_component(c, name)
+    arrays = [None] * len(names)
+    labels = [{} for name in names]
+    n_rows = [0]
+    n_coerced = [0] * len(names)
+
+    def append(result):
+        converted, coerced = result
+        for index, values in enumerate(converted):
+            n_coerced[index] += coerced[index]
+            if names[index] in categorical:
+                # Convert the codes for the chunk to codes for the categories
+                # found so far
+                codes, uniques = values
+                lookup = labels[index]
+                mapping = [lookup.setdefault(u, len(lookup)) for u in uniques]
+                values = np.array(mapping + [-1], dtype=np.intp)[codes]
+            if arrays[index] is None:
+                buffer = np.empty(max(capacity, len(values)), dtype=values.dtype)
+                arrays[index] = buffer[:0], buffer
+            arrays[index] = _append_values(arrays[index][0], arrays[index][1], values)
+        n_rows[0] += len(converted[0]) if converted else 0
+        if n_rows_max:
+            report_progress(n_rows[0] / n_rows_max)
+
+    reader = pd.read_csv(path, delimiter=delimiter,
+                         chunksize=chunksize or CHUNK_ROWS, **kwargs)
+
+    # Chunks are converted on worker threads while the next chunks are
+    # parsed, keeping only a few parsed chunks in memory at any time.
+    pool = ThreadPool(CONVERT_THREADS)
+    pending = deque()
+
+    # Values in the sample that could not be converted to numbers were taken
+    # into account when finding the types of the columns, so we only warn
+    # about values in the rows after the sample.
+    start = 0
+
+    try:
+        for chunk in reader:
+            n_skip = max(len(sample) - start, 0)
+            start += len(chunk)
+            pending.append(pool.apply_async(_convert_chunk, (categorical, chunk, n_skip)))
+            if len(pending) > CONVERT_THREADS:
+                append(pending.popleft().get())
+        while pending:
+            append(pending.popleft().get())
+    finally:
+        pool.terminate()
+
+    for index, name in enumerate(names):
+        if n_coerced[index] > 0:
+            warnings.warn("{0} values in column '{1}' could not be converted "
+                          "to numbers and were replaced by NaN, since the "
+                          "column type was determined from the first {2} "
+                          "rows".format(n_coerced[index], _component_name(name),
+                                        len(sample)))
+
+    result = Data()
+
+    for index, name in enumerate(names):
+        values = arrays[index][0] if arrays[index] is not None else np.zeros(0)
+        if name in categorical:
+            categories = sorted(labels[index], key=labels[index].get)
+            categories = np.array(categories, dtype=object)
+            c = CategoricalComponent.from_codes(values, categories)
+        else:
+            # If the number of rows was not known in advance, make a compact
+            # copy rather than keep the spare capacity of the buffer.
+            if n_rows_max is None:
+                values = values.copy()
+            c = Component(values)
+        result.add_component(c, _component_name(name))
 
     return result
 
@@ -58,6 +226,10 @@ def panda_process(indf):
 @data_factory(label="Pandas Table", identifier=has_extension('csv csv txt tsv tbl dat'))
 def pandas_read_table(path, **kwargs):
     """ A factory for reading tabular data using pandas
+
+    The delimiter and the types of the columns are found from the first rows
+    of the file, and the file is then read in chunks.
+
     :param path: path/to/file
     :param kwargs: All kwargs are passed to pandas.read_csv
     :returns: :class:`glue.core.data.Data` object
@@ -76,27 +248,43 @@ def pandas_read_table(path, **kwargs):
 
     fallback = None
 
+    # If only some of the rows are requested, the table is read in a single
+    # call, and otherwise we only parse a sample of the file with each
+    # delimiter. The chunk size, if given, is used when reading the table.
+    whole = 'nrows' in kwargs
+    chunksize = kwargs.pop('chunksize', None)
+
+    def read(delimiter, sample):
+        if whole:
+            return panda_process(sample)
+        else:
+            return _read_table_chunked(path, delimiter, sample,
+                                       chunksize=chunksize, **kwargs)
+
     for d in delimiters:
         try:
-            indf = pd.read_csv(path, delimiter=d, **kwargs)
+            if whole:
+                sample = pd.read_csv(path, delimiter=d, **kwargs)
+            else:
+                sample = pd.read_csv(path, delimiter=d, nrows=SAMPLE_ROWS, **kwargs)
 
             # ignore files parsed to empty dataframes
-            if len(indf) == 0:
+            if len(sample) == 0:
                 continue
 
             # only use files parsed to single-column dataframes
             # if we don't find a better strategy
-            if len(indf.columns) < 2:
-                fallback = indf
+            if len(sample.columns) < 2:
+                fallback = d, sample
                 continue
 
-            return panda_process(indf)
+            return read(d, sample)
 
         except CParserError:
             continue
 
     if fallback is not None:
-        return panda_process(fallback)
+        return read(*fallback)
     raise IOError("Could not parse %s using pandas" % path)
 
 
@@ -0,0 +1,288 @@
+"""
+Data factories for columnar file formats supported by the optional pyarrow
+package: Parquet files, and Feather (Arrow IPC) files.
+
+Numerical columns in Parquet files are not read when the file is opened.
+Instead, they are wrapped in :class:`~glue.core.component.LazyComponent`
+objects, which only read the row groups needed for the values requested, so
+that only the columns actually used (e.g. by viewers) are ever read. The
+minimum and maximum values stored for each row group are also used to avoid
+reading row groups when computing masks for range selections. String columns
+are read when the file is opened, as dictionary-encoded columns that are
+converted directly to categorical components.
+
+Feather files are memory-mapped, so that uncompressed numerical columns are
+only read from disk when they are accessed.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import numpy as np
+
+from glue.core.data import Data
+from glue.core.component import LazyComponent
+from glue.core.cache import ArrayCache
+from glue.core.arrow import arrow_to_numpy, arrow_to_component, arrow_to_data
+from glue.config import data_factory
+from glue.core.data_factories.helpers import has_magic
+
+
+__all__ = ['is_parquet', 'is_feather', 'parquet_reader', 'feather_reader']
+
+
+def is_parquet(filename, **kwargs):
+    # All Parquet files begin (and end) with the same sequence
+    return has_magic(filename, b'PAR1')
+
+
+def is_feather(filename, **kwargs):
+    # Feather files are Arrow IPC files, which begin with the same sequence
+    return has_magic(filename, b'ARROW1')
+
+
+def _label_from_filename(filename):
+    label = os.path.basename(filename).rpartition('.')[0]
+    return label or os.path.basename(filename)
+
+
+class RowGroupCache(ArrayCache):
+    """
+    A least-recently-used cache for the columns of row groups read from
+    Parquet files.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached values, in bytes. If not
+        specified, the ``ROW_GROUP_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'ROW_GROUP_CACHE_SIZE'
+
+
+class ParquetColumn(object):
+    """
+    An array-like object for a numerical column in a Parquet file, which
+    reads row groups on demand.
+
+    Parameters
+    ----------
+    parquet_file : `pyarrow.parquet.ParquetFile`
+        The file to read the column from
+    name : str
+        The name of the column
+    index : int
+        The index of the column in the row group metadata
+    cache : `RowGroupCache`
+        The cache to use for the values read
+    """
+
+    ndim = 1
+
+    def __init__(self, parquet_file, name, index, cache):
+
+        self._file = parquet_file
+        self._name = name
+        self._index = index
+        self._cache = cache
+
+        metadata = parquet_file.metadata
+        sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        self._offsets = np.cumsum([0] + sizes)
+
+        self.shape = (int(self._offsets[-1]),)
+        self.chunks = (tuple(sizes),)
+
+        dtype = np.dtype(parquet_file.schema_arrow.field(name).type.to_pandas_dtype())
+
+        # Integer columns with missing values are converted to floating-point
+        # values with NaNs, as is done for other columns.
+        if dtype.kind in 'iu' and any(has_missing for _, _, _, _, has_missing
+                                      in self.chunk_statistics()):
+            dtype = np.dtype(float)
+
+        self.dtype = dtype
+
+    def __len__(self):
+        return self.shape[0]
+
+    def chunk_statistics(self):
+        """
+        Return a list of ``(start, stop, vmin, vmax, has_missing)`` tuples
+        giving the range of values in each row group.
+        """
+
+        metadata = self._file.metadata
+        floating = self._file.schema_arrow.field(self._name).type.to_pandas_dtype()
+        floating = np.dtype(floating).kind == 'f'
+
+        result = []
+
+        for i in range(metadata.num_row_groups):
+
+            start, stop = int(self._offsets[i]), int(self._offsets[i + 1])
+            statistics = metadata.row_group(i).column(self._index).statistics
+
+            if statistics is None or not statistics.has_min_max:
+                vmin = vmax = None
+            else:
+                vmin, vmax = statistics.min, statistics.max
+
+            # The statistics don't include NaN values for floating-point
+            # columns, so we have to assume these could be present.
+            has_missing = (floating or statistics is None or
+                           not statistics.has_null_count or
+                           statistics.null_count > 0)
+
+            result.append((start, stop, vmin, vmax, has_missing))
+
+        return result
+
+    def _read_row_group(self, index):
+        key = self._name, index
+        values = self._cache.get(key)
+        if values is None:
+            table = self._file.read_row_group(index, columns=[self._name])
+            values = arrow_to_numpy(table.column(0)).astype(self.dtype, copy=False)
+            values.setflags(write=False)
+            self._cache.set(key, values)
+        return values
+
+    def _read_rows(self, start, stop):
+        """
+        Read the values for rows ``start`` to ``stop``, reading only the row
+        groups that include these rows.
+        """
+
+        if stop <= start:
+            return np.zeros(0, dtype=self.dtype)
+
+        first = np.searchsorted(self._offsets, start, side='right') - 1
+        last = np.searchsorted(self._offsets, stop, side='left')
+
+        values = [self._read_row_group(index) for index in range(first, last)]
+        if len(values) == 1:
+            values = values[0]
+        else:
+            values = np.concatenate(values)
+
+        offset = self._offsets[first]
+        return values[start - offset:stop - offset]
+
+    def __getitem__(self, view):
+
+        if isinstance(view, tuple):
+            if len(view) == 0 or view == (Ellipsis,):
+                view = Ellipsis
+            elif len(view) == 1:
+                view = view[0]
+            else:
+                raise IndexError("too many indices for array")
+
+        if view is Ellipsis:
+            return self._read_rows(0, self.shape[0])
+        elif isinstance(view, slice):
+            start, stop, step = view.indices(self.shape[0])
+            if step > 0:
+                return self._read_rows(start, stop)[::step]
+            else:
+                return self._read_rows(0, self.shape[0])[view]
+        else:
+            index = int(view)
+            if index < 0:
+                index += self.shape[0]
+            if index < 0 or index >= self.shape[0]:
+                raise IndexError("index {0} is out of bounds".format(view))
+            return self._read_rows(index, index + 1)[0]
+
+
+def _is_lazy_column(arrow_type):
+    import pyarrow as pa
+    return pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type)
+
+
+@data_factory(label="Parquet file", identifier=is_parquet, priority=100)
+def parquet_reader(filename, columns=None, **kwargs):
+    """
+    Read a Parquet file.
+
+    Numerical columns are read lazily, one row group at a time, when their
+    values are needed, while other columns are read when the file is opened.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the Parquet file
+    columns : list of str, optional
+        The names of the columns to include. By default, all columns are
+        included.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(filename)
+    schema = parquet_file.schema_arrow
+
+    if columns is None:
+        columns = schema.names
+
+    # Find the index of each column in the row group metadata
+    parquet_schema = parquet_file.metadata.schema
+    indices = dict((parquet_schema.column(i).path, i)
+                   for i in range(len(parquet_schema)))
+
+    lazy = [name for name in columns
+            if name in indices and _is_lazy_column(schema.field(name).type)]
+    eager = [name for name in columns if name not in lazy]
+
+    if len(eager) > 0:
+        # String columns are read directly as dictionary-encoded columns
+        dictionary = [name for name in eager
+                      if pa.types.is_string(schema.field(name).type) or
+                      pa.types.is_large_string(schema.field(name).type)]
+        table = pq.read_table(filename, columns=eager, read_dictionary=dictionary)
+
+    cache = RowGroupCache()
+
+    result = Data(label=_label_from_filename(filename))
+
+    for name in columns:
+        if name in eager:
+            component = arrow_to_component(table.column(name))
+        else:
+            column = ParquetColumn(parquet_file, name, indices[name], cache)
+            component = LazyComponent(column)
+        result.add_component(component, str(name))
+
+    return result
+
+
+@data_factory(label="Feather file", identifier=is_feather, priority=100)
+def feather_reader(filename, columns=None, **kwargs):
+    """
+    Read a Feather (Arrow IPC) file.
+
+    The file is memory-mapped, so that the values in uncompressed numerical
+    columns are only read from disk when they are accessed.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the Feather file
+    columns : list of str, optional
+        The names of the columns to include. By default, all columns are
+        included.
+    """
+
+    import pyarrow as pa
+
+    reader = pa.ipc.open_file(pa.memory_map(filename, 'r'))
+    table = reader.read_all()
+
+    if columns is not None:
+        table = table.select(columns)
+
+    return arrow_to_data(table, label=_label_from_filename(filename))
@@ -1,7 +1,9 @@
 from __future__ import absolute_import, division, print_function
 
+import os
+
 from glue.core.data_factories.helpers import has_extension
-from glue.config import data_factory
+from glue.config import data_factory, settings
 
 
 __all__ = ['tabular_data']
@@ -15,7 +17,14 @@ __all__ = ['tabular_data']
 def tabular_data(path, **kwargs):
     from glue.core.data_factories.astropy_table import astropy_tabular_data
     from glue.core.data_factories.pandas import pandas_read_table
-    for fac in [astropy_tabular_data, pandas_read_table]:
+    factories = [astropy_tabular_data, pandas_read_table]
+    # The pandas reader reads large files in chunks, with much less overhead
+    try:
+        if os.path.getsize(path) >= settings.TABLE_STREAMING_MIN_SIZE:
+            factories = factories[::-1]
+    except (OSError, TypeError):
+        pass
+    for fac in factories:
         try:
             return fac(path, **kwargs)
         except:
@@ -5,6 +5,7 @@ import warnings
 import sys
 import pytest
 import numpy as np
+import pandas as pd
 from mock import MagicMock
 from numpy.testing import assert_allclose, assert_array_equal
 
@@ -25,6 +26,16 @@ def test_load_data_auto_assigns_label():
     assert d.label == 'test'
 
 
+def test_load_data_float32():
+    factory = MagicMock()
+    factory.return_value = Data(x=np.array([1., 2., 3.]),
+                                y=np.array([1, 2, 3], dtype=np.int16), label='')
+    d = df.load_data('test.fits', factory, float32=True)
+    factory.assert_called_once_with('test.fits')
+    assert d['x'].dtype == np.float32
+    assert d['y'].dtype == np.int16
+
+
 def test_extension():
     assert df._extension('test.fits') == 'fits'
     assert df._extension('test.fits.gz') == 'fits.gz'
@@ -146,6 +157,126 @@ def test_csv_pandas_factory():
     assert isinstance(d.get_component(cat_comp), CategoricalComponent)
 
 
+def test_pandas_read_chunks(tmpdir, monkeypatch):
+
+    # Tables should give the same result when read in several chunks, with
+    # the types of the columns found from the first rows.
+
+    from .. import pandas as pandas_factory
+    monkeypatch.setattr(pandas_factory, 'SAMPLE_ROWS', 3)
+    monkeypatch.setattr(pandas_factory, 'CHUNK_ROWS', 4)
+
+    filename = tmpdir.join('table.csv').strpath
+    with open(filename, 'w') as f:
+        f.write('#a,b,c\n')
+        for i in range(10):
+            f.write('{0},{1},{2}\n'.format(i, 'xyz'[i % 3] if i != 8 else '', 0.5 * i))
+
+    fractions = []
+
+    with df.progress_callback(fractions.append):
+        d = df.load_data(filename, factory=df.pandas_read_table)
+
+    assert_array_equal(d['a'], np.arange(10))
+    assert_allclose(d['c'], 0.5 * np.arange(10))
+
+    comp = d.get_component(d.id['b'])
+    assert isinstance(comp, CategoricalComponent)
+    np.testing.assert_equal(comp.categories, ['', 'x', 'y', 'z'])
+    np.testing.assert_equal(comp.labels, ['x', 'y', 'z', 'x', 'y', 'z',
+                                          'x', 'y', '', 'x'])
+
+    # The codes of the chunks should refer to the same categories
+    assert_array_equal(comp.codes, [1, 2, 3, 1, 2, 3, 1, 2, 0, 1])
+
+    assert len(fractions) == 3
+    assert fractions == sorted(fractions)
+
+
+def test_pandas_chunked_coerced(tmpdir, monkeypatch):
+
+    # Values that can't be converted to numbers in rows after the ones used
+    # to find the types of the columns are replaced by NaN, with a warning.
+
+    from .. import pandas as pandas_factory
+    monkeypatch.setattr(pandas_factory, 'SAMPLE_ROWS', 3)
+    monkeypatch.setattr(pandas_factory, 'CHUNK_ROWS', 4)
+
+    filename = tmpdir.join('table.csv').strpath
+    with open(filename, 'w') as f:
+        f.write('a,b\n')
+        for i in range(10):
+            f.write('{0},{1}\n'.format(i if i not in (5, 8) else 'x', i))
+
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        d = df.pandas_read_table(filename)
+
+    assert_array_equal(d['a'], [0, 1, 2, 3, 4, np.nan, 6, 7, np.nan, 9])
+    assert_array_equal(d['b'], np.arange(10))
+
+    messages = [str(x.message) for x in w if 'replaced by NaN' in str(x.message)]
+    assert messages == ["2 values in column 'a' could not be converted to "
+                        "numbers and were replaced by NaN, since the column "
+                        "type was determined from the first 3 rows"]
+
+
+def test_pandas_read_options(tmpdir):
+
+    filename = tmpdir.join('table.csv').strpath
+    with open(filename, 'w') as f:
+        f.write('a,b\n')
+        for i in range(10):
+            f.write('{0},{1}\n'.format(i, 'xyz'[i % 3]))
+
+    d = df.pandas_read_table(filename, nrows=4)
+    assert_array_equal(d['a'], np.arange(4))
+    np.testing.assert_equal(d.get_component(d.id['b']).labels, ['x', 'y', 'z', 'x'])
+
+    d = df.pandas_read_table(filename, chunksize=3)
+    assert_array_equal(d['a'], np.arange(10))
+
+
+def test_tabular_data_streaming_min_size(monkeypatch):
+
+    # Large tables should be read with pandas first
+
+    from glue.config import settings
+    from .. import pandas as pandas_factory
+    from .. import tables
+
+    # tabular_data imports the factories when it is called, so we patch the
+    # pandas module rather than the tables module.
+    assert not hasattr(tables, 'pandas_read_table')
+    pandas_read_table = MagicMock(wraps=pandas_factory.pandas_read_table)
+    monkeypatch.setattr(pandas_factory, 'pandas_read_table', pandas_read_table)
+
+    data = b'# a, b\nlabel1, 1 \n2, 2 \n3, 3\n4, 4\n5, 5\n6, 6'
+    with make_file(data, '.csv') as fname:
+        d = df.load_data(fname, factory=df.tabular_data)
+        assert pandas_read_table.call_count == 0
+        monkeypatch.setattr(settings, 'TABLE_STREAMING_MIN_SIZE', 0)
+        d = df.load_data(fname, factory=df.tabular_data)
+        assert pandas_read_table.call_count == 1
+    assert_array_equal(d['a'], [np.nan, 2, 3, 4, 5, 6])
+
+    # Tables that are not given as paths are read as before
+    d = df.tabular_data(data.decode('ascii'))
+    assert_array_equal(d['b'], [1, 2, 3, 4, 5, 6])
+
+
+def test_pandas_process_categorical():
+
+    from ..pandas import panda_process
+
+    indf = pd.DataFrame({'a': pd.Series(['y', 'x', None, 'y'], dtype='category')})
+    d = panda_process(indf)
+    comp = d.get_component(d.id['a'])
+    assert isinstance(comp, CategoricalComponent)
+    np.testing.assert_equal(comp.categories, ['', 'x', 'y'])
+    np.testing.assert_equal(comp.codes, [2, 1, 0, 2])
+
+
 def test_dtype_int():
     data = b'# a, b\n1, 1 \n2, 2 \n3, 3'
     with make_file(data, '.csv') as fname:
@@ -308,3 +439,92 @@ def test_ambiguous_format(tmpdir):
     assert str(w[0].message) == "Multiple data factories matched the input: 'a', 'b'. Choosing 'a'."
 
     assert factory is reader2
+
+
+def test_sniff_file(tmpdir):
+
+    filename = tmpdir.join('test.spam').strpath
+    with open(filename, 'wb') as f:
+        f.write(b'\x89HDF\r\n\x1a\n\x00')
+
+    sniff = df.sniff_file(filename)
+    assert sniff.extension == 'spam'
+    assert sniff.binary
+    assert not sniff.compressed
+    assert df.has_magic(filename, b'\x89HDF')
+    assert df.sniff_file(filename) is sniff
+
+    # The header is read again if the file changes
+    with open(filename, 'wb') as f:
+        f.write(b'eggs and spam')
+
+    assert df.sniff_file(filename).header == b'eggs and spam'
+    assert not df.sniff_file(filename).binary
+
+
+@requires_astropy
+def test_astropy_identified_tables(tmpdir, monkeypatch):
+
+    # Tables read when identifying files are reused by the factory, even if
+    # other files were identified in the meantime, but only once.
+
+    from .. import astropy_table
+
+    filenames = []
+    for i in range(2):
+        filename = tmpdir.join('table{0}.txt'.format(i)).strpath
+        with open(filename, 'w') as f:
+            f.write('a b\n{0} 2\n'.format(i))
+        assert astropy_table.is_readable_by_astropy(filename)
+        filenames.append(filename)
+
+    read = MagicMock(wraps=astropy_table.astropy_table_read)
+    monkeypatch.setattr(astropy_table, 'astropy_table_read', read)
+
+    for i, filename in enumerate(filenames):
+        d = astropy_table.astropy_tabular_data(filename)
+        assert_array_equal(d['a'], [i])
+    assert read.call_count == 0
+
+    astropy_table.astropy_tabular_data(filenames[0])
+    assert read.call_count == 1
+
+    # Tables that are not used by the factory are dropped once data has been
+    # read
+    for filename in filenames:
+        assert astropy_table.is_readable_by_astropy(filename)
+    read.reset_mock()
+
+    df.load_data(filenames[0], factory=astropy_table.astropy_tabular_data)
+    assert read.call_count == 0
+    assert len(astropy_table._identified_tables) == 0
+
+    df.load_data(filenames[1], factory=astropy_table.astropy_tabular_data)
+    assert read.call_count == 1
+
+
+def test_find_factory_cache(tmpdir):
+
+    identifier = MagicMock(side_effect=df.has_extension('cached'))
+
+    @data_factory('cached', identifier=identifier, priority=10000)
+    def reader(filename):
+        return Data()
+
+    filename = tmpdir.join('test.cached').strpath
+    with open(filename, 'w') as f:
+        f.write('Camelot!')
+
+    assert df.find_factory(filename) is reader
+    assert df.find_factory(filename) is reader
+    assert identifier.call_count == 1
+
+    # Results aren't shared between different keyword arguments
+    assert df.find_factory(filename, ignored=True) is reader
+    assert identifier.call_count == 2
+
+    with open(filename, 'w') as f:
+        f.write('It is only a model')
+
+    assert df.find_factory(filename) is reader
+    assert identifier.call_count == 3
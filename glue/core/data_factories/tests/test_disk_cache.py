@@ -0,0 +1,180 @@
+from __future__ import absolute_import, division, print_function
+
+import os
+import shutil
+
+import numpy as np
+from mock import MagicMock
+from numpy.testing import assert_array_equal
+
+from glue.core import Data
+from glue.core.component import CategoricalComponent
+from glue.core.coordinates import Coordinates
+from glue.core import data_factories as df
+from glue.core.data_factories.disk_cache import DataCache
+
+
+def make_table(tmpdir, name='table.csv', n_rows=5):
+    filename = tmpdir.join(name).strpath
+    with open(filename, 'w') as f:
+        f.write('a,b\n')
+        for i in range(n_rows):
+            f.write('{0},{1}\n'.format(i * 1.5, 'xyz'[i % 3]))
+    return filename
+
+
+def count_factory():
+
+    def factory(path, **kwargs):
+        factory.count += 1
+        return df.pandas_read_table(path, **kwargs)
+
+    factory.count = 0
+    return factory
+
+
+def test_roundtrip(tmpdir):
+
+    cache = DataCache(directory=tmpdir.join('cache').strpath)
+    filename = make_table(tmpdir)
+
+    data = df.load_data(filename, factory=df.pandas_read_table)
+    assert cache.set(filename, df.pandas_read_table, {}, [data])
+
+    assert cache.get(filename, df.pandas_read_table, {'delimiter': ','}) is None
+
+    cached, = cache.get(filename, df.pandas_read_table, {})
+    assert cached.label == 'table'
+    assert [cid.label for cid in cached.visible_components] == ['a', 'b']
+
+    # Numerical values should be memory-mapped
+    assert isinstance(cached.get_component('a')._data, np.memmap)
+    assert_array_equal(cached['a'], data['a'])
+
+    comp = cached.get_component('b')
+    assert isinstance(comp, CategoricalComponent)
+    assert_array_equal(comp.categories, ['x', 'y', 'z'])
+    assert_array_equal(comp.labels, data.get_component('b').labels)
+
+
+def test_modified_file(tmpdir):
+
+    cache = DataCache(directory=tmpdir.join('cache').strpath)
+    filename = make_table(tmpdir)
+
+    data = df.load_data(filename, factory=df.pandas_read_table)
+    cache.set(filename, df.pandas_read_table, {}, [data])
+
+    make_table(tmpdir, n_rows=7)
+    stat = os.stat(filename)
+    os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+
+    assert cache.get(filename, df.pandas_read_table, {}) is None
+
+
+def test_not_cached(tmpdir):
+
+    cache = DataCache(directory=tmpdir.join('cache').strpath)
+    filename = make_table(tmpdir)
+
+    class CustomCoordinates(Coordinates):
+        pass
+
+    # Datasets that cannot be rebuilt from the cache files are not cached
+    data = Data(x=[1, 2, 3], coords=CustomCoordinates())
+    assert not cache.set(filename, df.pandas_read_table, {}, [data])
+
+    data = Data(x=[1, 2, 3])
+    data.meta['header'] = object()
+    assert not cache.set(filename, df.pandas_read_table, {}, [data])
+
+    # Factories that cannot be identified are not cached
+    data = Data(x=[1, 2, 3])
+    assert not cache.set(filename, MagicMock(), {}, [data])
+    assert not cache.set(filename, lambda path: data, {}, [data])
+
+
+def test_evict(tmpdir):
+
+    cache = DataCache(directory=tmpdir.join('cache').strpath)
+    filenames = [make_table(tmpdir, name='table{0}.csv'.format(i)) for i in range(3)]
+
+    for filename in filenames:
+        data = df.load_data(filename, factory=df.pandas_read_table)
+        cache.set(filename, df.pandas_read_table, {}, [data])
+
+    # Access the first entry so that the second one is the least recently used
+    entries = sorted(os.listdir(cache.directory))
+    for entry in entries:
+        manifest = os.path.join(cache.directory, entry, 'manifest.json')
+        os.utime(manifest, (0, 100))
+    cache.get(filenames[0], df.pandas_read_table, {})
+
+    entry_size = sum(os.path.getsize(os.path.join(cache.directory, entries[0], name))
+                     for name in os.listdir(os.path.join(cache.directory, entries[0])))
+    cache._max_size = 2 * entry_size
+    cache.evict()
+
+    assert cache.get(filenames[0], df.pandas_read_table, {}) is not None
+    assert len(os.listdir(cache.directory)) == 2
+
+    cache.clear()
+    assert cache.get(filenames[0], df.pandas_read_table, {}) is None
+
+
+def test_evict_concurrent(tmpdir, monkeypatch):
+
+    # Entries removed by other processes while the cache is scanned are
+    # skipped rather than causing errors.
+
+    cache = DataCache(directory=tmpdir.join('cache').strpath)
+    for name in ('table1.csv', 'table2.csv'):
+        filename = make_table(tmpdir, name=name)
+        data = df.load_data(filename, factory=df.pandas_read_table)
+        assert cache.set(filename, df.pandas_read_table, {}, [data])
+
+    listdir = os.listdir
+
+    # Remove each entry just after it is listed
+    def listdir_removed(path):
+        names = listdir(path)
+        if isinstance(path, str) and path != cache.directory:
+            monkeypatch.undo()
+            shutil.rmtree(path)
+            monkeypatch.setattr(os, 'listdir', listdir_removed)
+        return names
+
+    cache._max_size = 0
+    monkeypatch.setattr(os, 'listdir', listdir_removed)
+    cache.evict()
+    monkeypatch.undo()
+    assert os.listdir(cache.directory) == []
+
+    cache.clear()
+    cache.evict()
+
+
+def test_load_data(tmpdir, monkeypatch):
+
+    from glue.config import settings
+    from glue.core.data_factories import disk_cache
+
+    monkeypatch.setattr(settings, 'DATA_CACHE', True)
+    monkeypatch.setattr(settings, 'DATA_CACHE_DIR', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(disk_cache, '_data_cache', None)
+    monkeypatch.setattr(disk_cache, '_factory_name', lambda factory: 'counted')
+
+    filename = make_table(tmpdir)
+    factory = count_factory()
+
+    data1 = df.load_data(filename, factory=factory)
+    data2 = df.load_data(filename, factory=factory)
+    assert factory.count == 1
+
+    assert_array_equal(data1['a'], data2['a'])
+    assert data2._load_log.path == os.path.abspath(filename)
+
+    # The float32 option changes the cached values
+    data3 = df.load_data(filename, factory=factory, float32=True)
+    assert factory.count == 2
+    assert data3['a'].dtype == np.float32
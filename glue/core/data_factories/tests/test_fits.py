@@ -198,3 +198,81 @@ def test_fits_vector():
             break
     else:
         raise ValueError("Missing warning about dropping column")
+
+
+@requires_astropy
+def test_fits_compressed_lazy(tmpdir):
+
+    # Tile-compressed images should only be decompressed when the values are
+    # accessed, and views spanning several rows of tiles should give the same
+    # result as decompressing the whole image.
+
+    from astropy.io import fits
+    from glue.config import settings
+    from glue.core.component import LazyComponent
+    from ..fits import FITSImageArray
+
+    filename = tmpdir.join('compressed.fits').strpath
+    values = np.arange(600, dtype=np.int32).reshape((30, 20))
+    hdu = fits.CompImageHDU(values, name='COMP')
+    fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(filename)
+
+    d = df.load_data(filename, factory=df.fits_reader)
+    component = d.get_component('COMP')
+    assert isinstance(component, LazyComponent)
+    assert isinstance(component.array, FITSImageArray)
+    assert component.array.shape == (30, 20)
+    assert component.array.dtype == np.int32
+
+    old_threads = settings.FITS_DECOMPRESS_THREADS
+    settings.FITS_DECOMPRESS_THREADS = 3
+    try:
+        assert_array_equal(d['COMP'], values)
+        assert_array_equal(d['COMP', 3:27:2], values[3:27:2])
+        assert_array_equal(d['COMP', 5, 2:4], values[5, 2:4])
+        assert_array_equal(d['COMP', ::-1], values[::-1])
+    finally:
+        settings.FITS_DECOMPRESS_THREADS = old_threads
+
+
+@requires_astropy
+def test_fits_scaled_lazy(tmpdir):
+
+    from astropy.io import fits
+    from glue.core.component import LazyComponent
+
+    filename = tmpdir.join('scaled.fits').strpath
+    hdu = fits.PrimaryHDU(np.arange(12, dtype=np.int16).reshape((3, 4)))
+    hdu.header['BSCALE'] = 2.
+    hdu.header['BZERO'] = 1.
+    hdu.writeto(filename)
+
+    with fits.open(filename) as hdulist:
+        expected = hdulist[0].data.copy()
+
+    d = df.load_data(filename, factory=df.fits_reader)
+    assert isinstance(d.get_component('PRIMARY'), LazyComponent)
+    assert_array_equal(d['PRIMARY'], expected)
+    assert_array_equal(d['PRIMARY', 1], expected[1])
+
+
+@requires_astropy
+def test_fits_excluded_not_read(tmpdir):
+
+    # The data of excluded HDUs should never be accessed
+
+    from astropy.io import fits
+
+    filename = tmpdir.join('mosaic.fits').strpath
+    hdus = [fits.PrimaryHDU()]
+    for i in range(5):
+        hdus.append(fits.ImageHDU(np.ones((3, 4)) * i, name='CHIP{0}'.format(i)))
+    fits.HDUList(hdus).writeto(filename)
+
+    hdulist = fits.open(filename)
+    d_set = fits_reader(hdulist, exclude_exts=['CHIP1', 3])
+    assert [d.label for d in d_set] == ['mosaic[CHIP0]', 'mosaic[CHIP3]', 'mosaic[CHIP4]']
+    assert 'data' not in hdulist[2].__dict__
+    assert 'data' not in hdulist[3].__dict__
+    assert_array_equal(d_set[1]['CHIP3'], 3)
+    hdulist.close()
@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
+import os
+
 import pytest
 import numpy as np
 from numpy.testing import assert_array_equal
@@ -38,3 +40,100 @@ def test_hdf5_loader(suffix):
         d = df.load_data(fname)
         assert df.find_factory(fname) is df.hdf5_reader
     assert_array_equal(d['/x'], [1, 2, 3])
+
+
+@requires_h5py
+def test_hdf5_lazy_chunks(tmpdir):
+
+    # Numerical datasets should be read lazily, only reading the chunks that
+    # intersect the requested views.
+
+    import h5py
+    from glue.core.component import LazyComponent
+    from ..hdf5 import HDF5Dataset
+
+    filename = tmpdir.join('cube.hdf5').strpath
+
+    values = np.arange(6 * 10 * 12).reshape((6, 10, 12)).astype(np.float32)
+
+    with h5py.File(filename, 'w') as f:
+        f.create_dataset('cube', data=values, chunks=(1, 5, 6))
+        f.create_dataset('flat', data=np.arange(5))
+
+    d = df.load_data(filename, factory=df.hdf5_reader)
+    if isinstance(d, list):
+        d = [x for x in d if x.shape == (6, 10, 12)][0]
+
+    component = d.get_component('/cube')
+    assert isinstance(component, LazyComponent)
+    assert isinstance(component.array, HDF5Dataset)
+    assert component.array.chunks == (1, 5, 6)
+
+    cache = component.array._cache
+    cache.clear()
+
+    assert_array_equal(d['/cube', 2], values[2])
+    assert len(cache) == 4
+
+    assert_array_equal(d['/cube', 2, 3:7, ::5], values[2, 3:7, ::5])
+    assert len(cache) == 4
+
+    assert_array_equal(d['/cube', -1, -1, 1:11:3], values[-1, -1, 1:11:3])
+    assert len(cache) == 6
+
+    assert_array_equal(d['/cube'], values)
+    assert len(cache) == 24
+
+    assert_array_equal(d['/cube', 1:1], values[1:1])
+
+
+@requires_h5py
+def test_hdf5_shared_chunk_cache(tmpdir):
+
+    # Chunks are cached for all files, but not re-used once a file has been
+    # modified.
+
+    import h5py
+
+    filename = tmpdir.join('cube.hdf5').strpath
+
+    values = np.arange(100).reshape((10, 10)).astype(np.float32)
+
+    with h5py.File(filename, 'w') as f:
+        f.create_dataset('image', data=values, chunks=(5, 5))
+
+    d1 = df.load_data(filename, factory=df.hdf5_reader)
+    d2 = df.load_data(filename, factory=df.hdf5_reader)
+    assert d1.get_component('/image').array._cache is d2.get_component('/image').array._cache
+    assert_array_equal(d1['/image'], values)
+
+    d1.get_component('/image').array._handle.close()
+    d2.get_component('/image').array._handle.close()
+
+    with h5py.File(filename, 'w') as f:
+        f.create_dataset('image', data=values + 1, chunks=(5, 5))
+    stat = os.stat(filename)
+    os.utime(filename, (stat.st_atime, stat.st_mtime + 10))
+
+    d3 = df.load_data(filename, factory=df.hdf5_reader)
+    assert_array_equal(d3['/image'], values + 1)
+
+
+@requires_h5py
+def test_hdf5_file_handle(tmpdir):
+
+    import h5py
+    from ..hdf5 import HDF5FileHandle
+
+    filename = tmpdir.join('test.hdf5').strpath
+
+    with h5py.File(filename, 'w') as f:
+        f.create_dataset('x', data=np.arange(5))
+
+    handle = HDF5FileHandle(filename)
+    assert_array_equal(handle.file['x'][...], np.arange(5))
+
+    # The file should be re-opened if it was closed
+    handle.close()
+    assert_array_equal(handle.file['x'][...], np.arange(5))
+    handle.close()
@@ -0,0 +1,149 @@
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+from mock import MagicMock
+
+from glue.core import Data
+from glue.core.data_factories import DataLoader, report_progress
+
+
+def make_factory(events=None):
+
+    def factory(path, **kwargs):
+        if events is not None:
+            events[path].wait()
+        if path == 'bad':
+            raise IOError("Could not read file")
+        return Data(x=[1, 2, 3], label=path)
+
+    return factory
+
+
+def test_load():
+
+    on_load = MagicMock()
+    on_progress = MagicMock()
+
+    loader = DataLoader(on_load=on_load, on_progress=on_progress, n_workers=2)
+    tasks = loader.submit(['a', 'b', 'c'], factory=make_factory())
+    loader.wait()
+
+    assert [task.state for task in tasks] == ['done'] * 3
+    assert sorted(task.result[0].label for task in tasks) == ['a', 'b', 'c']
+    assert on_load.call_count == 3
+    on_progress.assert_called_with(3, 3)
+    assert not loader.busy
+
+    # Datasets should be logged so that they can be reloaded
+    assert tasks[0].result[0]._load_log.path.endswith('a')
+
+    loader.shutdown()
+
+
+def test_error():
+
+    on_load = MagicMock()
+    on_error = MagicMock()
+
+    loader = DataLoader(on_load=on_load, on_error=on_error)
+    ok, bad = loader.submit(['ok', 'bad'], factory=make_factory())
+    loader.wait()
+
+    assert ok.state == 'done'
+    assert bad.state == 'failed'
+    assert isinstance(bad.error, IOError)
+    assert 'Could not read file' in bad.detail
+    on_load.assert_called_once_with(ok)
+    on_error.assert_called_once_with(bad)
+
+    loader.shutdown()
+
+
+def test_process_incremental():
+
+    # Datasets should be available as soon as each file has been read, and
+    # only be passed to the callbacks from process()
+
+    events = dict((path, threading.Event()) for path in 'ab')
+
+    on_load = MagicMock()
+    loader = DataLoader(on_load=on_load, n_workers=2)
+    a, b = loader.submit(['a', 'b'], factory=make_factory(events))
+
+    events['b'].set()
+    while b.state != 'done':
+        loader.process()
+
+    on_load.assert_called_once_with(b)
+    assert a.state == 'running'
+    assert loader.progress == (1, 2)
+    assert loader.busy
+
+    events['a'].set()
+    loader.wait()
+    assert on_load.call_count == 2
+    assert loader.progress == (2, 2)
+
+    loader.shutdown()
+
+
+def test_cancel():
+
+    events = dict((path, threading.Event()) for path in 'abc')
+
+    on_load = MagicMock()
+    loader = DataLoader(on_load=on_load, n_workers=1)
+    tasks = loader.submit(['a', 'b', 'c'], factory=make_factory(events))
+
+    loader.cancel()
+    for event in events.values():
+        event.set()
+    loader.wait()
+
+    assert [task.state for task in tasks] == ['cancelled'] * 3
+    assert on_load.call_count == 0
+    assert not loader.busy
+
+    # Progress is counted from scratch for new tasks
+    tasks = loader.submit('a', factory=make_factory())
+    assert loader.progress == (0, 1)
+    loader.wait()
+    assert tasks[0].state == 'done'
+
+    loader.shutdown()
+
+
+def test_kwargs():
+    factory = MagicMock(return_value=Data(x=[1, 2, 3]))
+    loader = DataLoader()
+    task, = loader.submit('a.fits', factory=factory, hdu=1)
+    loader.wait()
+    factory.assert_called_once_with('a.fits', hdu=1)
+    assert task.result[0].label == 'a'
+    loader.shutdown()
+
+
+def test_fraction():
+
+    # Factories can report how much of a file has been read
+
+    event = threading.Event()
+    reported = threading.Event()
+
+    def factory(path, **kwargs):
+        report_progress(0.5)
+        reported.set()
+        event.wait()
+        return Data(x=[1, 2, 3], label=path)
+
+    loader = DataLoader(n_workers=2)
+    loader.submit(['a', 'b'], factory=factory)
+    assert loader.fraction <= 0.5
+
+    reported.wait()
+    event.set()
+    loader.wait()
+    assert loader.fraction == 1
+
+    loader.shutdown()
@@ -0,0 +1,82 @@
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from glue.core import data_factories as df
+from glue.core.component import LazyComponent, CategoricalComponent
+from glue.tests.helpers import requires_pyarrow
+
+
+def make_table():
+    import pyarrow as pa
+    return pa.table({'a': pa.array(np.arange(100)),
+                     'b': pa.array(np.arange(100.) / 2),
+                     'c': pa.array(['x', 'y', 'z', 'y'] * 25)})
+
+
+@requires_pyarrow
+def test_parquet_reader(tmpdir):
+
+    import pyarrow.parquet as pq
+
+    filename = tmpdir.join('test.parquet').strpath
+    pq.write_table(make_table(), filename, row_group_size=10)
+
+    assert df.find_factory(filename) is df.parquet_reader
+
+    data = df.load_data(filename)
+
+    assert data.label == 'test'
+
+    comp = data.get_component(data.id['a'])
+    assert isinstance(comp, LazyComponent)
+    assert comp.array.chunks == ((10,) * 10,)
+    assert_array_equal(data['a'], np.arange(100))
+    assert_array_equal(data['b', 15:35], np.arange(15, 35) / 2)
+    assert data['b', 42] == 21
+
+    comp = data.get_component(data.id['c'])
+    assert isinstance(comp, CategoricalComponent)
+    assert_array_equal(comp.labels[:4], ['x', 'y', 'z', 'y'])
+
+
+@requires_pyarrow
+def test_parquet_row_group_pushdown(tmpdir):
+
+    import pyarrow.parquet as pq
+
+    filename = tmpdir.join('test.parquet').strpath
+    pq.write_table(make_table(), filename, row_group_size=10)
+
+    data = df.parquet_reader(filename, columns=['a'])
+    assert [cid.label for cid in data.visible_components] == ['a']
+
+    column = data.get_component(data.id['a']).array
+    read = []
+    original = column._read_row_group
+    column._read_row_group = lambda index: read.append(index) or original(index)
+
+    mask = (data.id['a'] >= 35).to_mask(data)
+    assert_array_equal(mask, np.arange(100) >= 35)
+
+    # Only the row group that straddles the threshold is read
+    assert read == [3]
+
+
+@requires_pyarrow
+def test_feather_reader(tmpdir):
+
+    import pyarrow.feather as feather
+
+    filename = tmpdir.join('test.feather').strpath
+    feather.write_feather(make_table(), filename, compression='uncompressed')
+
+    assert df.find_factory(filename) is df.feather_reader
+
+    data = df.load_data(filename)
+    assert_array_equal(data['a'], np.arange(100))
+    assert_array_equal(data.get_component(data.id['c']).labels[:4], ['x', 'y', 'z', 'y'])
+
+    data = df.feather_reader(filename, columns=['b'])
+    assert_array_equal(data['b'], np.arange(100.) / 2)
@@ -0,0 +1,248 @@
+"""
+This module provides a way to evaluate arithmetic and comparison expressions
+on components without allocating full-size temporary arrays.
+
+Arithmetic on :class:`~glue.core.component_id.ComponentID` objects builds
+trees of :class:`~glue.core.component_link.BinaryComponentLink` objects, and
+comparisons build :class:`~glue.core.subset.InequalitySubsetState` objects.
+Evaluating these node by node allocates a full-size array for each
+intermediate result. Instead, the trees are flattened here into a list of
+operations, which are then applied to one chunk of the data at a time, with
+the intermediate results written to buffers that are re-used for all chunks.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import numbers
+import operator
+
+import numpy as np
+
+from glue.config import settings
+from glue.external import six
+
+__all__ = ['CompiledExpression', 'NotCompilable', 'compile_expression']
+
+
+UFUNCS = {operator.add: np.add,
+          operator.sub: np.subtract,
+          operator.mul: np.multiply,
+          operator.truediv: np.true_divide,
+          operator.pow: np.power,
+          operator.gt: np.greater,
+          operator.ge: np.greater_equal,
+          operator.lt: np.less,
+          operator.le: np.less_equal,
+          operator.eq: np.equal,
+          operator.ne: np.not_equal}
+
+if six.PY2:
+    UFUNCS[operator.div] = np.divide
+
+
+class NotCompilable(Exception):
+    """
+    Raised when an expression cannot be compiled.
+    """
+
+
+class CompiledExpression(object):
+    """
+    A flattened expression that can be evaluated chunk by chunk.
+
+    Parameters
+    ----------
+    cids : list of `~glue.core.component_id.ComponentID`
+        The components used in the expression
+    operations : list of tuple
+        The operations, as ``(ufunc, left, right)`` tuples. The operands are
+        either scalars, or ``('cid', index)`` for the components in ``cids``,
+        or ``('result', index)`` for the results of previous operations. The
+        value of the expression is the result of the last operation.
+    """
+
+    def __init__(self, cids, operations):
+        self.cids = cids
+        self.operations = operations
+
+    def _leaves(self, data):
+        """
+        Return a function that gives the values of each component for a
+        given chunk of the data.
+        """
+
+        from glue.core.component import LazyComponent, CoordinateComponent
+
+        leaves = []
+
+        for cid in self.cids:
+
+            comp = data.get_component(cid)
+
+            if comp.categorical:
+                raise NotCompilable("Cannot compile expressions with "
+                                    "categorical components")
+
+            # Components that compute or read their values on the fly are
+            # accessed one chunk at a time, while for other components we
+            # can simply use views of the full array.
+            if isinstance(comp, (LazyComponent, CoordinateComponent)):
+                if not comp.numeric:
+                    raise NotCompilable("Component {0} is not numeric".format(cid))
+                leaves.append(comp.__getitem__)
+            else:
+                values = np.asarray(data[cid])
+                if values.dtype.kind not in 'biufc':
+                    raise NotCompilable("Component {0} is not numeric".format(cid))
+                leaves.append(values.__getitem__)
+
+        return leaves
+
+    def evaluate(self, data, chunk_size=None):
+        """
+        Evaluate the expression for a dataset.
+
+        Parameters
+        ----------
+        data : `~glue.core.data.Data`
+            The dataset to evaluate the expression for
+        chunk_size : int, optional
+            The approximate number of elements to process at a time. If not
+            specified, the ``EXPRESSION_CHUNK_SIZE`` setting is used.
+
+        Returns
+        -------
+        result : `~numpy.ndarray`
+            The value of the expression, with the same shape as the data
+        """
+
+        if data.ndim == 0:
+            raise NotCompilable("Cannot evaluate expressions on scalar data")
+
+        # There are no chunks to find the type of the result from
+        if data.size == 0:
+            raise NotCompilable("Cannot evaluate expressions on empty data")
+
+        if chunk_size is None:
+            chunk_size = settings.EXPRESSION_CHUNK_SIZE
+
+        leaves = self._leaves(data)
+
+        # We split the data into chunks along the first dimension
+        row_size = int(np.prod(data.shape[1:]))
+        step = max(1, chunk_size // max(row_size, 1))
+
+        result = None
+        buffers = [None] * len(self.operations)
+        last = len(self.operations) - 1
+
+        for start in range(0, data.shape[0], step):
+
+            chunk = (slice(start, start + step),)
+            n = min(step, data.shape[0] - start)
+
+            values = [leaf(chunk) for leaf in leaves]
+
+            for index, (ufunc, left, right) in enumerate(self.operations):
+
+                left = _operand(left, values, buffers, n)
+                right = _operand(right, values, buffers, n)
+
+                if index == last and result is not None:
+                    out = result[chunk]
+                elif buffers[index] is not None:
+                    out = buffers[index][:n]
+                else:
+                    out = None
+
+                if out is None:
+                    buffers[index] = ufunc(left, right)
+                else:
+                    ufunc(left, right, out=out)
+
+            if result is None:
+                final = buffers[last]
+                if n == data.shape[0]:  # the data fit in a single chunk
+                    return final
+                result = np.empty(data.shape, dtype=final.dtype)
+                result[chunk] = final
+                # The last operation writes directly to the result from now on
+                buffers[last] = None
+
+        return result
+
+
+def _operand(operand, values, buffers, n):
+    if isinstance(operand, tuple):
+        kind, index = operand
+        if kind == 'cid':
+            return values[index]
+        else:
+            return buffers[index][:n]
+    else:
+        return operand
+
+
+def _flatten(node, cids, operations):
+    """
+    Add the operations needed to compute ``node`` to ``operations``, and
+    return the operand that refers to the value of ``node``.
+    """
+
+    from glue.core.component_id import ComponentID
+    from glue.core.component_link import BinaryComponentLink
+    from glue.core.subset import InequalitySubsetState
+
+    if isinstance(node, ComponentID):
+        for index, cid in enumerate(cids):
+            if cid is node:
+                return ('cid', index)
+        cids.append(node)
+        return ('cid', len(cids) - 1)
+    elif isinstance(node, numbers.Number) and not isinstance(node, bool):
+        return node
+    elif isinstance(node, BinaryComponentLink):
+        left, right, op = node._left, node._right, node._op
+    elif isinstance(node, InequalitySubsetState):
+        left, right, op = node.left, node.right, node.operator
+    else:
+        raise NotCompilable("Cannot compile {0}".format(node))
+
+    if op not in UFUNCS:
+        raise NotCompilable("Cannot compile operator {0}".format(op))
+
+    left = _flatten(left, cids, operations)
+    right = _flatten(right, cids, operations)
+
+    if not isinstance(left, tuple) and not isinstance(right, tuple):
+        return op(left, right)
+
+    operations.append((UFUNCS[op], left, right))
+
+    return ('result', len(operations) - 1)
+
+
+def compile_expression(expression):
+    """
+    Flatten a tree of :class:`~glue.core.component_link.BinaryComponentLink`
+    and :class:`~glue.core.subset.InequalitySubsetState` objects.
+
+    Returns
+    -------
+    expression : :class:`CompiledExpression` or `None`
+        The compiled expression, or `None` if the expression uses operators,
+        links, or values that cannot be compiled.
+    """
+
+    cids = []
+    operations = []
+
+    try:
+        _flatten(expression, cids, operations)
+    except NotCompilable:
+        return None
+
+    if len(operations) == 0:
+        return None
+
+    return CompiledExpression(cids, operations)
@@ -1,11 +1,13 @@
 from __future__ import absolute_import, division, print_function
 
 import logging
+import weakref
 from contextlib import contextmanager
 from weakref import WeakKeyDictionary
 from inspect import getmro
 from collections import defaultdict
 
+from glue.external import six
 from glue.core.exceptions import InvalidSubscriber, InvalidMessage
 from glue.core.message import Message
 from glue.core.hub_callback_container import HubCallbackContainer
@@ -41,6 +43,12 @@ class Hub(object):
         # Dictionary of subscriptions
         self._subscriptions = WeakKeyDictionary()
 
+        # Dictionary mapping each message class to the (weak references to)
+        # subscribers that should receive it, along with the message class
+        # subscription to use. This is computed lazily and is reset whenever
+        # subscriptions change.
+        self._dispatch = {}
+
         self._paused = False
         self._queue = []
 
@@ -116,6 +124,7 @@ class Hub(object):
             self._subscriptions[subscriber] = HubCallbackContainer()
 
         self._subscriptions[subscriber][message_class] = handler, filter
+        self._dispatch.clear()
 
     def is_subscribed(self, subscriber, message):
         """
@@ -150,6 +159,7 @@ class Hub(object):
             return
         if message in self._subscriptions[subscriber]:
             self._subscriptions[subscriber].pop(message)
+            self._dispatch.clear()
 
     def unsubscribe_all(self, subscriber):
         """
@@ -157,19 +167,30 @@ class Hub(object):
         """
         if subscriber in self._subscriptions:
             self._subscriptions.pop(subscriber)
+            self._dispatch.clear()
 
-    def _find_handlers(self, message):
-        """Yields all (subscriber, handler) pairs that should receive a message
+    def _get_dispatch(self, message_class):
+        """
+        Return a list of (subscriber weakref, subscribed message class) pairs
+        for all subscribers that should receive messages of a given class.
         """
+
+        try:
+            return self._dispatch[message_class]
+        except KeyError:
+            pass
+
         # self._subscriptions:
         # subscriber => { message type => (filter, handler)}
 
+        dispatch = []
+
         # loop over subscribed objects
         for subscriber, subscriptions in list(self._subscriptions.items()):
 
             # subscriptions to message or its superclasses
             messages = [msg for msg in subscriptions.keys() if
-                        issubclass(type(message), msg)]
+                        issubclass(message_class, msg)]
 
             if len(messages) == 0:
                 continue
@@ -177,21 +198,49 @@ class Hub(object):
             # narrow to the most-specific message
             candidate = max(messages, key=_mro_count)
 
+            dispatch.append((weakref.ref(subscriber), candidate))
+
+        self._dispatch[message_class] = dispatch
+
+        return dispatch
+
+    def _find_handlers(self, message):
+        """Yields all (subscriber, handler) pairs that should receive a message
+        """
+
+        for subscriber, candidate in self._get_dispatch(type(message)):
+
+            # The subscriber may have been garbage collected or unsubscribed
+            # since the dispatch table was computed
+            subscriber = subscriber()
+            if subscriber is None:
+                continue
+            subscriptions = self._subscriptions.get(subscriber)
+            if subscriptions is None or candidate not in subscriptions:
+                continue
+
             handler, test = subscriptions[candidate]
             if test(message):
                 yield subscriber, handler
 
     @contextmanager
     def delay_callbacks(self):
+        """
+        Context manager to delay broadcasting messages until the end of the
+        context.
+
+        Equivalent messages (for example several
+        :class:`~glue.core.message.SubsetUpdateMessage` for the same subset and
+        attribute) are only broadcast once.
+        """
         self._paused = True
         try:
             yield
         finally:
             self._paused = False
-            # TODO: could de-duplicate messages here
-            for message in self._queue:
+            queue, self._queue = self._queue, []
+            for message in _coalesce(queue):
                 self.broadcast(message)
-            self._queue = []
 
     def broadcast(self, message):
         """Broadcasts a message to all subscribed objects.
@@ -215,6 +264,7 @@ class Hub(object):
         """
         result = self.__dict__.copy()
         result['_subscriptions'] = self._subscriptions.copy()
+        result['_dispatch'] = {}
         for s in self._subscriptions:
             try:
                 module = s.__module__
@@ -247,3 +297,31 @@ class HubListener(object):
 
 def _mro_count(obj):
     return len(getmro(obj))
+
+
+def _coalesce_key(message):
+    """
+    Return a key identifying equivalent messages, or `None` if the message
+    should never be merged with other messages.
+    """
+    if message._coalesce_attributes is None:
+        return None
+    key = [type(message)]
+    for name in message._coalesce_attributes:
+        value = getattr(message, name)
+        if value is None or isinstance(value, six.string_types):
+            key.append(value)
+        else:
+            key.append(id(value))
+    return tuple(key)
+
+
+def _coalesce(messages):
+    """
+    Remove equivalent messages from a list of messages, keeping only the last
+    occurrence of each.
+    """
+    keys = [_coalesce_key(message) for message in messages]
+    last = dict((key, index) for index, key in enumerate(keys) if key is not None)
+    return [message for index, (key, message) in enumerate(zip(keys, messages))
+            if key is None or last[key] == index]
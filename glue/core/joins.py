@@ -0,0 +1,171 @@
+"""
+This module provides the machinery used to propagate subsets between datasets
+that have been joined on the values of one or more components (see
+:meth:`~glue.core.data.Data.join_on_key`).
+
+Rather than comparing the key values directly each time a subset is
+propagated, the values of the keys in both datasets are converted once to
+integer codes, such that equal keys have equal codes. Propagating a subset
+then only requires looking up which codes are selected.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+__all__ = ['KeyJoin', 'get_key_join']
+
+
+# Joins are stored per dataset, and for each dataset are keyed by the other
+# dataset and the component IDs used for the join.
+_JOINS = WeakKeyDictionary()
+
+
+def _factorize(arrays):
+    """
+    Convert several arrays to integer codes such that equal values have equal
+    codes across all arrays. NaN values are given a code of -1.
+
+    Returns the list of code arrays (flattened) and the number of codes.
+    """
+
+    values = np.concatenate([np.asarray(array).ravel() for array in arrays])
+
+    if np.issubdtype(values.dtype, np.floating):
+        valid = ~np.isnan(values)
+    else:
+        valid = np.ones(values.shape, dtype=bool)
+
+    codes = np.zeros(values.shape, dtype=np.intp)
+    codes[~valid] = -1
+    unique, codes[valid] = np.unique(values[valid], return_inverse=True)
+
+    result = []
+    start = 0
+    for array in arrays:
+        result.append(codes[start:start + np.size(array)])
+        start += np.size(array)
+
+    return result, len(unique)
+
+
+def _factorize_composite(left, right):
+    """
+    Convert two lists of arrays to integer codes such that rows that have the
+    same values in all arrays have equal codes.
+    """
+
+    left_codes = np.zeros(np.size(left[0]), dtype=np.intp)
+    right_codes = np.zeros(np.size(right[0]), dtype=np.intp)
+
+    for left_i, right_i in zip(left, right):
+
+        (left_i, right_i), n_i = _factorize([left_i, right_i])
+
+        invalid_left = (left_codes < 0) | (left_i < 0)
+        invalid_right = (right_codes < 0) | (right_i < 0)
+
+        # We combine the codes so far with the codes for the current key, then
+        # re-factorize the result to keep the codes small.
+        (left_codes, right_codes), n = _factorize([left_codes * n_i + left_i,
+                                                   right_codes * n_i + right_i])
+
+        left_codes[invalid_left] = -1
+        right_codes[invalid_right] = -1
+
+    return [left_codes], [right_codes], n
+
+
+class KeyJoin(object):
+    """
+    Integer codes for the keys used to join two datasets.
+
+    Parameters
+    ----------
+    data1, data2 : `~glue.core.data.Data`
+        The datasets to join
+    cid1, cid2 : tuple of `~glue.core.component_id.ComponentID`
+        The components to use as keys in ``data1`` and ``data2`` respectively.
+        If both contain several components, items are joined when all keys
+        match. If one contains a single component, items are joined when that
+        key matches any of the keys in the other dataset.
+    """
+
+    def __init__(self, data1, cid1, data2, cid2):
+
+        self.version1 = data1.version
+        self.version2 = data2.version
+
+        values1 = [data1[cid] for cid in cid1]
+        values2 = [data2[cid] for cid in cid2]
+
+        if len(cid1) == len(cid2) and len(cid1) > 1:
+            codes1, codes2, n = _factorize_composite(values1, values2)
+        elif len(cid1) == 1 or len(cid2) == 1:
+            codes, n = _factorize(values1 + values2)
+            codes1, codes2 = codes[:len(cid1)], codes[len(cid1):]
+        else:
+            raise Exception("Either the number of components in the key join "
+                            "sets should match, or one of the component sets "
+                            "should contain a single component.")
+
+        # Items without a valid key are given a code that is never selected
+        self._codes1 = [self._prepare(c, n, data1.shape) for c in codes1]
+        self._codes2 = [self._prepare(c, n, data2.shape) for c in codes2]
+        self._n = n
+
+    @staticmethod
+    def _prepare(codes, n, shape):
+        codes = codes.copy()
+        codes[codes < 0] = n
+        return codes.reshape(shape)
+
+    def to_mask(self, mask2, view=None):
+        """
+        Given a mask of selected items in the second dataset, return the mask
+        of the joined items in the first dataset.
+
+        Parameters
+        ----------
+        mask2 : `~numpy.ndarray`
+            The boolean mask for the second dataset
+        view : optional
+            A view into the first dataset
+        """
+
+        selected = np.zeros(self._n + 1, dtype=bool)
+        for codes in self._codes2:
+            selected[codes[mask2]] = True
+        selected[self._n] = False
+
+        mask = None
+        for codes in self._codes1:
+            if view is not None:
+                codes = codes[view]
+            if mask is None:
+                mask = selected[codes]
+            else:
+                mask |= selected[codes]
+
+        return mask
+
+
+def get_key_join(data1, cid1, data2, cid2):
+    """
+    Return the :class:`KeyJoin` for two datasets.
+
+    The join is computed the first time it is requested, and is re-computed
+    if the values in either dataset have changed since.
+    """
+    if data1 not in _JOINS:
+        _JOINS[data1] = {}
+    joins = _JOINS[data1]
+    key = (data2, cid1, cid2)
+    join = joins.get(key)
+    if (join is None or
+            join.version1 != data1.version or
+            join.version2 != data2.version):
+        join = joins[key] = KeyJoin(data1, cid1, data2, cid2)
+    return join
@@ -17,9 +17,11 @@ by chaining x2y and y2z.
 
 from __future__ import absolute_import, division, print_function
 
+import heapq
 import logging
+import itertools
+from weakref import WeakKeyDictionary
 
-from glue.external import six
 from glue.core.hub import HubListener
 from glue.core.message import DataCollectionDeleteMessage
 from glue.core.contracts import contract
@@ -62,31 +64,86 @@ def discover_links(data, links):
     A dict of componentID -> componentLink
     The ComponentLink that data can use to generate the componentID.
     """
+    return _LinkPaths(data.primary_components, _index_links(links)).cid_links
 
-    # TODO: try to add shortest paths first -- should
-    # prevent lots of repeated checking
 
-    cids = set(data.primary_components)
-    cid_links = {}
-    depth = {}
-    for cid in cids:
-        depth[cid] = 0
+def _index_links(links):
+    """
+    Return a dict mapping each ComponentID to the set of links that use it
+    as an input.
+    """
+    index = {}
+    for link in links:
+        for cid in link.get_from_ids():
+            index.setdefault(cid, set()).add(link)
+    return index
 
-    while True:
-        for link in accessible_links(cids, links):
-            from_ = set(link.get_from_ids())
-            to_ = link.get_to_id()
-            cost = max([depth[f] for f in from_]) + 1
-            if to_ in cids and cost >= depth[to_]:
+
+class _LinkPaths(object):
+    """
+    The shortest chains of links that derive ComponentIDs from a set of
+    primary ComponentIDs.
+
+    The length of a chain is the number of links it contains, and a link with
+    several inputs is one step further than its furthest input. Paths are
+    found in order of increasing length, so that each link is only
+    considered once all of its inputs have been reached, and can be extended
+    incrementally when links are added to the graph.
+
+    Parameters
+    ----------
+    primary : iterable of `~glue.core.component_id.ComponentID`
+        The ComponentIDs that can be computed without any links
+    index : dict
+        The links, indexed by input ComponentID (see :func:`_index_links`)
+    """
+
+    def __init__(self, primary, index):
+        self.primary = frozenset(primary)
+        self.depth = dict((cid, 0) for cid in self.primary)
+        self.cid_links = {}
+        self._counter = itertools.count()
+        self._propagate(index, [(0, next(self._counter), cid)
+                                for cid in self.primary])
+
+    def _relax(self, link, heap):
+        """
+        Use ``link`` if it gives a shorter path to its target, and if so add
+        the target to the heap of ComponentIDs to propagate from.
+        """
+        try:
+            cost = max(self.depth[cid] for cid in link.get_from_ids()) + 1
+        except KeyError:  # not all inputs can be computed
+            return
+        to_ = link.get_to_id()
+        if cost < self.depth.get(to_, cost + 1):
+            self.depth[to_] = cost
+            self.cid_links[to_] = link
+            heapq.heappush(heap, (cost, next(self._counter), to_))
+
+    def _propagate(self, index, heap):
+        heapq.heapify(heap)
+        while heap:
+            cost, _, cid = heapq.heappop(heap)
+            if cost > self.depth[cid]:  # a shorter path was found since
                 continue
-            depth[to_] = cost
-            cids.add(to_)
-            cid_links[to_] = link
-            break
-        else:
-            # no more links to add
-            break
-    return cid_links
+            for link in index.get(cid, ()):
+                self._relax(link, heap)
+
+    def add_link(self, link, index):
+        """
+        Update the paths after ``link`` has been added to ``index``.
+        """
+        heap = []
+        self._relax(link, heap)
+        self._propagate(index, heap)
+
+    def uses(self, link):
+        """
+        Whether any of the paths go through ``link``.
+        """
+        to_ = link.get_to_id()
+        return to_ in self.cid_links and self.cid_links[to_] is link
 
 
 def find_dependents(data, link):
@@ -130,6 +187,12 @@ class LinkManager(HubListener):
 
     def __init__(self):
         self._links = set()
+        self._inverse_links = set()
+        # Links (including inverses) indexed by input ComponentID
+        self._index = {}
+        # The derivable components of each dataset, kept up to date as links
+        # are added and removed
+        self._paths = WeakKeyDictionary()
         self.hub = None
 
     def register_to_hub(self, hub):
@@ -147,6 +210,7 @@ class LinkManager(HubListener):
                     break
         for link in remove:
             self.remove_link(link)
+        self._paths.pop(msg.data, None)
 
     def add_link(self, link):
         """
@@ -161,8 +225,12 @@ class LinkManager(HubListener):
             for l in link:
                 self.add_link(l)
         else:
-            if link.inverse not in self._links:
+            if link.inverse not in self._links and link not in self._links:
                 self._links.add(link)
+                self._add_to_graph(link)
+                if link.inverse is not None:
+                    self._inverse_links.add(link.inverse)
+                    self._add_to_graph(link.inverse)
 
     @contract(link=ComponentLink)
     def remove_link(self, link):
@@ -172,6 +240,38 @@ class LinkManager(HubListener):
         else:
             logging.getLogger(__name__).debug('removing link %s', link)
             self._links.remove(link)
+            self._remove_from_graph(link)
+            if link.inverse is not None:
+                self._inverse_links.discard(link.inverse)
+                self._remove_from_graph(link.inverse)
+
+    def _add_to_graph(self, link):
+        for cid in link.get_from_ids():
+            self._index.setdefault(cid, set()).add(link)
+        for paths in self._paths.values():
+            paths.add_link(link, self._index)
+
+    def _remove_from_graph(self, link):
+        for cid in link.get_from_ids():
+            links = self._index.get(cid)
+            if links is not None:
+                links.discard(link)
+                if not links:
+                    del self._index[cid]
+        for data in list(self._paths.keys()):
+            if self._paths[data].uses(link):
+                del self._paths[data]
+
+    def _get_paths(self, data):
+        """
+        Return the derivable components for ``data``, re-using the cached
+        result unless the primary components of the data have changed.
+        """
+        primary = data.primary_components
+        paths = self._paths.get(data)
+        if paths is None or paths.primary != frozenset(primary):
+            paths = self._paths[data] = _LinkPaths(primary, self._index)
+        return paths
 
     @contract(data=Data)
     def update_data_components(self, data):
@@ -195,10 +295,6 @@ class LinkManager(HubListener):
         self._remove_underiveable_components(data)
         self._add_deriveable_components(data)
 
-    @property
-    def _inverse_links(self):
-        return set(link.inverse for link in self._links if link.inverse is not None)
-
     def _remove_underiveable_components(self, data):
         """ Find and remove any DerivedComponent in the data
         which requires a ComponentLink not tracked by this LinkManager
@@ -224,11 +320,13 @@ class LinkManager(HubListener):
         LinkManager
 
         """
-        links = discover_links(data, self._links | self._inverse_links)
-        for cid, link in six.iteritems(links):
-            d = DerivedComponent(data, link)
-            if cid not in data.components:
-                data.add_component(d, cid)
+        links = self._get_paths(data).cid_links
+        existing = set(data.components)
+        # Adding components can trigger further updates of the links for this
+        # data, so we iterate over a copy
+        for cid, link in list(links.items()):
+            if cid not in existing:
+                data.add_component(DerivedComponent(data, link), cid)
 
     @property
     def links(self):
@@ -236,6 +334,9 @@ class LinkManager(HubListener):
 
     def clear(self):
         self._links.clear()
+        self._inverse_links.clear()
+        self._index.clear()
+        self._paths.clear()
 
     def __contains__(self, item):
         return item in self._links
@@ -12,7 +12,8 @@ __all__ = ['Message', 'ErrorMessage', 'SubsetMessage', 'SubsetCreateMessage',
            'DataCollectionActiveDataChange', 'DataCollectionAddMessage',
            'DataCollectionDeleteMessage', 'ApplicationClosedMessage',
            'DataRemoveComponentMessage', 'LayerArtistEnabledMessage',
-           'LayerArtistDisabledMessage']
+           'LayerArtistDisabledMessage', 'NumericalDataChangedMessage',
+           'DataRowsAppendedMessage']
 
 
 class Message(object):
@@ -31,6 +32,11 @@ class Message(object):
     :attr tag: An optional string describing the message
     """
 
+    # Names of the attributes that identify equivalent messages. When
+    # messages are queued by Hub.delay_callbacks, only the last of several
+    # equivalent messages is broadcast. If None, messages are never merged.
+    _coalesce_attributes = None
+
     def __init__(self, sender, tag=None):
         """Create a new message
 
@@ -82,6 +88,8 @@ class SubsetUpdateMessage(SubsetMessage):
     A message that a subset issues when its state changes.
     """
 
+    _coalesce_attributes = ('sender', 'attribute', 'tag')
+
     def __init__(self, sender, attribute=None, tag=None):
         """
         :param attribute: An optional label of what attribute has changed
@@ -133,11 +141,14 @@ class DataRemoveComponentMessage(DataMessage):
 
 
 class ComponentsChangedMessage(DataMessage):
-    pass
+
+    _coalesce_attributes = ('sender', 'tag')
 
 
 class ComponentReplacedMessage(ComponentsChangedMessage):
 
+    _coalesce_attributes = None
+
     def __init__(self, sender, old_component, new_component, tag=None):
         super(ComponentReplacedMessage, self).__init__(sender, old_component)
         self.old = old_component
@@ -146,13 +157,47 @@ class ComponentReplacedMessage(ComponentsChangedMessage):
 
 class DataUpdateMessage(DataMessage):
 
+    _coalesce_attributes = ('sender', 'attribute', 'tag')
+
     def __init__(self, sender, attribute, tag=None):
         super(DataUpdateMessage, self).__init__(sender, tag=tag)
         self.attribute = attribute
 
 
 class NumericalDataChangedMessage(DataMessage):
-    pass
+    """
+    A message that a dataset issues when the values of its components change.
+
+    If only part of the dataset changed, ``region`` gives a view (e.g. a
+    slice or a tuple of slices and indices) that includes all the changed
+    elements, so that subscribers can refresh only that part. If ``region``
+    is `None`, any of the values may have changed.
+    """
+
+    # Messages for different regions should not be merged together
+    _coalesce_attributes = ('sender', 'region', 'tag')
+
+    def __init__(self, sender, region=None, tag=None):
+        super(NumericalDataChangedMessage, self).__init__(sender, tag=tag)
+        self.region = region
+
+
+class DataRowsAppendedMessage(NumericalDataChangedMessage):
+    """
+    A message that a one-dimensional dataset issues when rows are appended to
+    it. The values in the existing rows are unchanged, and the new rows are
+    given by the ``start`` and ``stop`` indices.
+
+    Subscribers to :class:`NumericalDataChangedMessage` also receive this
+    message, so they can simply refresh all the values.
+    """
+
+    _coalesce_attributes = None
+
+    def __init__(self, sender, start, stop, tag=None):
+        super(DataRowsAppendedMessage, self).__init__(sender, tag=tag)
+        self.start = start
+        self.stop = stop
 
 
 class DataCollectionMessage(Message):
@@ -1195,7 +1195,7 @@ class CategoricalROI(Roi):
 
         try:
             if indata.categorical:
-                return indata._categorical_data
+                return indata.labels
             else:
                 return indata[:]
         except AttributeError:
@@ -1218,6 +1218,9 @@ class CategoricalROI(Roi):
         """
         if self.categories is None or len(self.categories) == 0:
             return np.zeros(x.shape, dtype=bool)
+        elif getattr(x, 'categorical', False):
+            # For categorical components, we can check the codes directly
+            return x.isin(self.categories)
         else:
             check = self._categorical_helper(x)
             index = np.minimum(np.searchsorted(self.categories, check),
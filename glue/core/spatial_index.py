@@ -0,0 +1,192 @@
+"""
+This module provides sorted indices of component values, which are used to
+speed up selections with regions of interest on large datasets: instead of
+testing whether every point falls inside the region, only the points that
+fall inside the bounding box of the region need to be tested.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+from glue.core.roi import RectangularROI, CircularROI, PolygonalROI
+from glue.core.cache import ArrayCache
+from glue.config import settings
+
+__all__ = ['SortedIndex', 'SortedIndexCache', 'get_sorted_index',
+           'roi_bounds', 'roi_to_mask']
+
+
+class SortedIndexCache(ArrayCache):
+    """
+    A least-recently-used cache for the sorted indices of the components of
+    a dataset.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached indices, in bytes. If not
+        specified, the ``SPATIAL_INDEX_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'SPATIAL_INDEX_CACHE_SIZE'
+
+
+# Indices are cached per dataset and per component ID, along with the version
+# of the data for which they were computed.
+_INDICES = WeakKeyDictionary()
+
+
+class SortedIndex(object):
+    """
+    An index of the values of an array, which can be used to find the
+    elements with values in a given range without scanning the whole array.
+
+    Parameters
+    ----------
+    values : `~numpy.ndarray`
+        The values to index. Multi-dimensional arrays are indexed using
+        indices into the flattened array.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values).ravel()
+        self.order = np.argsort(values)
+        self.values = values[self.order]
+
+    @staticmethod
+    def estimate_nbytes(values):
+        """
+        Return the size in bytes of the index of an array, without computing
+        the index.
+        """
+        return values.size * (values.dtype.itemsize + np.dtype(np.intp).itemsize)
+
+    @property
+    def nbytes(self):
+        """
+        The size of the arrays used by the index, in bytes
+        """
+        return self.order.nbytes + self.values.nbytes
+
+    def _bounds(self, lo, hi):
+        return (np.searchsorted(self.values, lo, side='left'),
+                np.searchsorted(self.values, hi, side='right'))
+
+    def count(self, lo, hi):
+        """
+        Return the number of elements with values between ``lo`` and ``hi``
+        (inclusive).
+        """
+        i0, i1 = self._bounds(lo, hi)
+        return max(i1 - i0, 0)
+
+    def range(self, lo, hi):
+        """
+        Return the indices of the elements with values between ``lo`` and
+        ``hi`` (inclusive).
+        """
+        i0, i1 = self._bounds(lo, hi)
+        return self.order[i0:i1]
+
+
+def get_sorted_index(data, cid):
+    """
+    Return the sorted index for a component in a dataset.
+
+    The index is computed the first time it is requested, and is re-computed
+    if the values in the data have changed since. The indices of each dataset
+    are kept in a :class:`SortedIndexCache`, so that the memory used by the
+    indices is bounded.
+    """
+    version, indices = _INDICES.get(data, (None, None))
+    if indices is None or version != data.version:
+        indices = SortedIndexCache()
+        _INDICES[data] = data.version, indices
+    index = indices.get(cid)
+    if index is None:
+        index = SortedIndex(data[cid])
+        indices.set(cid, index)
+    return index
+
+
+def roi_bounds(roi):
+    """
+    Return the bounding box of an ROI as ``(xmin, xmax, ymin, ymax)``, or
+    `None` if the bounding box cannot be determined for this type of ROI.
+    """
+    if isinstance(roi, RectangularROI):
+        return roi.xmin, roi.xmax, roi.ymin, roi.ymax
+    elif isinstance(roi, CircularROI):
+        return (roi.xc - roi.radius, roi.xc + roi.radius,
+                roi.yc - roi.radius, roi.yc + roi.radius)
+    elif isinstance(roi, PolygonalROI):
+        return min(roi.vx), max(roi.vx), min(roi.vy), max(roi.vy)
+    else:
+        return None
+
+
+def roi_to_mask(data, xatt, yatt, roi, x=None, y=None):
+    """
+    Compute the mask of points inside an ROI using sorted indices.
+
+    Only the points inside the bounding box of the ROI are passed to the ROI
+    ``contains`` method. The bounding box is searched along whichever of the
+    two components has the fewest points within the bounds.
+
+    Parameters
+    ----------
+    data : `~glue.core.data.Data`
+        The dataset to compute the mask for
+    xatt, yatt : `~glue.core.component_id.ComponentID`
+        The components to use for the x and y coordinates
+    roi : `~glue.core.roi.Roi`
+        The region of interest
+    x, y : `~numpy.ndarray`, optional
+        The values of the x and y components, if already available
+
+    Returns
+    -------
+    mask : `~numpy.ndarray` or `None`
+        The boolean mask, or `None` if the bounding box of the ROI cannot be
+        determined (in which case the mask should be computed by other means).
+    """
+
+    bounds = roi_bounds(roi)
+
+    if bounds is None:
+        return None
+
+    xmin, xmax, ymin, ymax = bounds
+
+    if x is None:
+        x = data[xatt]
+    if y is None:
+        y = data[yatt]
+
+    # If the indices for both components can't be cached, they would be
+    # re-computed for each selection, which is slower than not using them.
+    nbytes = SortedIndex.estimate_nbytes(x) + SortedIndex.estimate_nbytes(y)
+    if nbytes > settings.SPATIAL_INDEX_CACHE_SIZE:
+        return None
+
+    xindex = get_sorted_index(data, xatt)
+    yindex = get_sorted_index(data, yatt)
+
+    if xindex.count(xmin, xmax) <= yindex.count(ymin, ymax):
+        candidates = xindex.range(xmin, xmax)
+    else:
+        candidates = yindex.range(ymin, ymax)
+
+    x = x.flat[candidates]
+    y = y.flat[candidates]
+
+    keep = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+    candidates, x, y = candidates[keep], x[keep], y[keep]
+
+    mask = np.zeros(data.shape, dtype=bool)
+    mask.flat[candidates[roi.contains(x, y)]] = True
+
+    return mask
@@ -11,10 +11,16 @@ s.dump(file) -> dump to a file object
 varname = s.id(x) -> string identifier that uniquely labels an object in
                      the Serialized state
 
+s.dump_bundle(path) -> dump to a session bundle, a zip file that contains
+                       the JSON description, with arrays stored
+                       separately as .npy files
+
 u = GlueUnSerializer.load(file)
 u = GlueUnSerializer.loads(str)
+u = GlueUnSerializer.load_bundle(path)
 u.object(varname) -> A reconstituted version of `x`
 u.object('__main__') -> The object passed to the GlueSerializer constructor
+u.close() -> close the session bundle, if any, once objects are restored
 
 Developer Notes:
 
@@ -57,7 +63,11 @@ import os
 import json
 import uuid
 import types
+import struct
+import hashlib
 import logging
+import zipfile
+import tempfile
 from io import BytesIO
 from itertools import count
 from collections import defaultdict
@@ -125,6 +135,144 @@ class GlueSerializeError(RuntimeError):
     pass
 
 
+# The name of the JSON description of the state in session bundles
+BUNDLE_STATE = 'session.json'
+
+# Arrays smaller than this (in bytes) are kept in the JSON description of
+# the state rather than being stored as separate files in session bundles
+BUNDLE_MIN_ARRAY_SIZE = 1024
+
+
+def is_bundle(path):
+    """
+    Whether a file is a session bundle rather than a plain JSON session file
+    """
+    return zipfile.is_zipfile(path)
+
+
+def _array_digest(array):
+    array = np.ascontiguousarray(array)
+    digest = hashlib.sha1(repr((array.dtype.str, array.shape)).encode('ascii'))
+    digest.update(array.reshape(-1).view(np.uint8))
+    return digest.hexdigest()
+
+
+def _text_array(array):
+    # Return an object array of strings as a fixed-width unicode array, which
+    # can be stored without pickling, or None if this is not possible.
+    if all(isinstance(x, six.text_type) for x in array.flat):
+        return array.astype(six.text_type)
+    return None
+
+
+class _BundleWriter(object):
+    """
+    Store arrays as uncompressed .npy files in a session bundle.
+
+    Identical arrays are only stored once. Arrays are written to the bundle
+    as they are serialized rather than being encoded in memory first.
+
+    Arrays are never pickled, so that opening a bundle can't run arbitrary
+    code. Object arrays of strings are stored as unicode arrays, and other
+    object arrays are not stored in the bundle.
+    """
+
+    def __init__(self, zf):
+        self._zf = zf
+        self._names = {}  # map id(array) -> (array, name)
+        self._written = set()
+
+    def add(self, array):
+        """
+        Store an array, and return the name of its file in the bundle, or
+        `None` if the array can't be stored without pickling.
+        """
+
+        # Arrays are serialized again every time the state is traversed, so
+        # we need to avoid checking the same arrays repeatedly.
+        if id(array) in self._names:
+            return self._names[id(array)][1]
+
+        stored = _text_array(array) if array.dtype.hasobject else array
+
+        if stored is None:
+            name = None
+        else:
+            name = 'arrays/%s.npy' % _array_digest(stored)
+            if name not in self._written:
+                self._write(name, stored)
+                self._written.add(name)
+
+        self._names[id(array)] = array, name
+
+        return name
+
+    def _write(self, name, array):
+        if six.PY2:  # ZipFile.open does not support writing
+            with tempfile.NamedTemporaryFile(suffix='.npy') as tmp:
+                np.lib.format.write_array(tmp, array, allow_pickle=False)
+                tmp.flush()
+                self._zf.write(tmp.name, name)
+        else:
+            with self._zf.open(name, 'w', force_zip64=True) as stream:
+                np.lib.format.write_array(stream, array, allow_pickle=False)
+
+
+class _BundleReader(object):
+    """
+    Read arrays from a session bundle.
+
+    Arrays are memory-mapped from the bundle if possible, and arrays that
+    were shared between several objects are only read once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zf = zipfile.ZipFile(path)
+        self._arrays = {}
+
+    def read_state(self):
+        return self._zf.read(BUNDLE_STATE).decode('utf-8')
+
+    def get(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = self._read(name)
+        return self._arrays[name]
+
+    def _read(self, name):
+
+        info = self._zf.getinfo(name)
+
+        if info.compress_type == zipfile.ZIP_STORED:
+
+            with open(self.path, 'rb') as f:
+
+                # Find the start of the file contents, after the local header
+                f.seek(info.header_offset)
+                header = f.read(30)
+                name_length, extra_length = struct.unpack('<HH', header[26:30])
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+                elif version == (2, 0):
+                    shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+                else:
+                    dtype = None
+
+                if dtype is not None and not dtype.hasobject and np.prod(shape) > 0:
+                    return np.memmap(self.path, dtype=dtype, mode='r',
+                                     offset=f.tell(), shape=shape,
+                                     order='F' if fortran else 'C')
+
+        return np.lib.format.read_array(BytesIO(self._zf.read(name)),
+                                        allow_pickle=False)
+
+    def close(self):
+        self._zf.close()
+
+
 class VersionedDict(object):
 
     """
@@ -234,6 +382,7 @@ class GlueSerializer(object):
         self._main = obj
         self.id(obj)
         self.include_data = include_data
+        self._bundle = None
 
     @classmethod
     def serializes(cls, obj, version=1):
@@ -379,6 +528,21 @@ class GlueSerializer(object):
         return json.dump(result, outfile, default=self.json_default,
                          indent=indent, sort_keys=True)
 
+    def dump_bundle(self, path, indent=None):
+        """
+        Dump to a session bundle, a zip file which contains the JSON
+        description of the state, and in which arrays are stored as separate
+        uncompressed .npy files, so that they can be memory-mapped when the
+        bundle is loaded.
+        """
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+            self._bundle = _BundleWriter(zf)
+            try:
+                state = self.dumps(indent=indent)
+            finally:
+                self._bundle = None
+            zf.writestr(BUNDLE_STATE, state)
+
 
 class GlueUnSerializer(object):
     dispatch = VersionedDict()
@@ -390,6 +554,9 @@ class GlueUnSerializer(object):
         self._objs = {}   # map name -> object
         self._working = set()
         self._rec = json.loads(string) if string else json.load(fobj)
+        self._bundle = None
+        # Whether data files should only be read once their values are needed
+        self.defer_loading = False
 
     @classmethod
     def loads(cls, string):
@@ -399,6 +566,29 @@ class GlueUnSerializer(object):
     def load(cls, fobj):
         return cls(fobj=fobj)
 
+    @classmethod
+    def load_bundle(cls, path):
+        """
+        Load a session bundle written by :meth:`GlueSerializer.dump_bundle`
+        """
+        bundle = _BundleReader(path)
+        try:
+            result = cls(string=bundle.read_state())
+        except Exception:
+            bundle.close()
+            raise
+        result._bundle = bundle
+        return result
+
+    def close(self):
+        """
+        Close the session bundle that objects are restored from, if any.
+        Memory-mapped arrays remain valid once the bundle is closed.
+        """
+        if self._bundle is not None:
+            self._bundle.close()
+            self._bundle = None
+
     @classmethod
     def unserializes(cls, obj, version=1):
         def decorator(func):
@@ -932,12 +1122,21 @@ def _save_session(session, context):
 
 @loader(np.ndarray)
 def _load_numpy(rec, context):
+    if 'file' in rec:
+        array = context._bundle.get(rec['file'])
+        if rec.get('object', False):
+            array = array.astype(object)
+        return array
     s = BytesIO(b64decode(rec['data']))
     return np.load(s)
 
 
 @saver(np.ndarray)
 def _save_numpy(obj, context):
+    if context._bundle is not None and obj.nbytes >= BUNDLE_MIN_ARRAY_SIZE:
+        name = context._bundle.add(obj)
+        if name is not None:
+            return dict(file=name, object=obj.dtype.hasobject)
     f = BytesIO()
     np.save(f, obj)
     data = b64encode(f.getvalue()).decode('ascii')
@@ -441,9 +441,12 @@ class StateAttributeHistogramHelper(StateAttributeCacheHelper):
                 else:
                     n_bin = self._common_n_bin
 
+                # We convert the limits to Python floats since the values
+                # may use a narrow type (e.g. 16-bit integers), which would
+                # overflow when computing bin widths.
                 values = self.data_values
-                lower = np.nanmin(values)
-                upper = np.nanmax(values)
+                lower = float(np.nanmin(values))
+                upper = float(np.nanmax(values))
 
             self.set(lower=lower, upper=upper, n_bin=n_bin)
 
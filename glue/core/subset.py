@@ -4,22 +4,26 @@ import numbers
 import operator
 
 import numpy as np
+import pandas as pd
 
 from glue.external import six
 from glue.external.six import PY3
 from glue.core.roi import CategoricalROI
+from glue.core.spatial_index import roi_to_mask
+from glue.core.joins import get_key_join
+from glue.core.cache import ArrayCache, view_key
+from glue.core.expression import compile_expression, NotCompilable
 from glue.core.contracts import contract
 from glue.core.util import split_component_view
 from glue.core.registry import Registry
 from glue.core.exceptions import IncompatibleAttribute
 from glue.core.message import SubsetDeleteMessage, SubsetUpdateMessage
-from glue.core.decorators import memoize
 from glue.core.visual import VisualAttributes
 from glue.config import settings
-from glue.utils import view_shape, broadcast_to
+from glue.utils import view_shape, broadcast_to, views_overlap, stack_view
 
 
-__all__ = ['Subset', 'SubsetState', 'RoiSubsetState', 'CategoricalROISubsetState',
+__all__ = ['Subset', 'MaskCache', 'SubsetState', 'RoiSubsetState', 'CategoricalROISubsetState',
            'RangeSubsetState', 'MultiRangeSubsetState', 'CompositeSubsetState',
            'OrState', 'AndState', 'XorState', 'InvertState', 'MaskSubsetState', 'CategorySubsetState',
            'ElementSubsetState', 'InequalitySubsetState', 'combine_multiple',
@@ -64,6 +68,7 @@ class Subset(object):
         self._broadcasting = False  # must be first def
         self.data = data
         self._subset_state = None
+        self._mask_cache = MaskCache()
         self._label = None
         self._style = None
         self._setup(color, alpha, label)
@@ -92,6 +97,7 @@ class Subset(object):
         if not isinstance(state, SubsetState):
             raise TypeError("State must be a SubsetState instance or array")
         self._subset_state = state
+        self._mask_cache.clear()
 
     @property
     def style(self):
@@ -173,6 +179,15 @@ class Subset(object):
         Convert the subset to a mask through an entity join to another
         dataset.
         """
+
+        # The mask also depends on the values in the joined datasets
+        key = _mask_cache_key(self.subset_state, self.data, view)
+        if key is not None:
+            key += tuple((other, other.version) for other in self.data._key_joins)
+            mask = self._mask_cache.get(key)
+            if mask is not None:
+                return mask
+
         for other, (cid1, cid2) in self.data._key_joins.items():
 
             if getattr(other, '_recursing', False):
@@ -188,81 +203,125 @@ class Subset(object):
             finally:
                 self.data._recursing = False
 
-            if len(cid1) == 1 and len(cid2) == 1:
+            join = get_key_join(self.data, cid1, other, cid2)
 
-                key_left = self.data[cid1[0], view]
-                key_right = other[cid2[0], mask_right]
-                mask = np.in1d(key_left.ravel(), key_right.ravel())
+            mask = join.to_mask(mask_right, view)
+            if key is not None:
+                mask = _read_only(mask)
+                self._mask_cache.set(key, mask)
 
-                return mask.reshape(key_left.shape)
+            return mask
 
-            elif len(cid1) == len(cid2):
+        raise IncompatibleAttribute
 
-                key_left_all = []
-                key_right_all = []
+    @contract(view='array_view', returns='array')
+    def to_mask(self, view=None):
+        """
+        Convert the current subset to a mask.
 
-                for cid1_i, cid2_i in zip(cid1, cid2):
-                    key_left_all.append(self.data[cid1_i, view].ravel())
-                    key_right_all.append(other[cid2_i, mask_right].ravel())
+        :param view: An optional view into the dataset (e.g. a slice)
+                     If present, the mask will pertain to the view and not the
+                     entire dataset.
 
-                # TODO: The following is slow because we are looping in Python.
-                #       This could be made significantly faster by switching to
-                #       C/Cython.
+           A boolean numpy array, the same shape as the data, that
+           defines whether each element belongs to the subset.
 
-                key_left_all = zip(*key_left_all)
-                key_right_all = set(zip(*key_right_all))
+        Masks are cached, and the cache is invalidated when the subset state
+        is changed or when the values in the data (or in datasets joined to
+        it) are modified. The returned array is therefore read-only.
+        """
 
-                result = [key in key_right_all for key in key_left_all]
-                result = np.array(result)
+        key = _mask_cache_key(self.subset_state, self.data, view)
 
-                return result.reshape(self.data[cid1_i, view].shape)
+        if key is not None:
+            mask = self._mask_cache.get(key)
+            if mask is not None:
+                return mask
 
-            elif len(cid1) == 1:
+        mask = None
 
-                key_left = self.data[cid1[0], view].ravel()
-                mask = np.zeros_like(key_left, dtype=bool)
-                for cid2_i in cid2:
-                    key_right = other[cid2_i, mask_right].ravel()
-                    mask |= np.in1d(key_left, key_right)
+        if key is not None and self.subset_state.elementwise:
+            if view is None:
+                mask = self._extend_cached_mask()
+            if mask is None:
+                mask = self._update_cached_mask(view)
 
-                return mask.reshape(self.data[cid1[0], view].shape)
+        if mask is None:
+            try:
+                mask = self.subset_state.to_mask(self.data, view)
+            except IncompatibleAttribute:
+                return self._to_mask_join(view)
 
-            elif len(cid2) == 1:
+        if key is not None:
+            mask = _read_only(mask)
+            self._mask_cache.set(key, mask)
 
-                key_right = other[cid2[0], mask_right].ravel()
-                mask = np.zeros_like(self.data[cid1[0], view].ravel(), dtype=bool)
-                for cid1_i in cid1:
-                    key_left = self.data[cid1_i, view].ravel()
-                    mask |= np.in1d(key_left, key_right)
+        return mask
 
-                return mask.reshape(self.data[cid1[0], view].shape)
+    def _extend_cached_mask(self):
+        """
+        If rows have been appended to the data since the mask was last
+        cached, compute the mask for the new rows only, and combine it with
+        the cached mask. Returns `None` if this is not possible.
+        """
 
-            else:
+        for version, nrows in self.data._append_versions():
 
-                raise Exception("Either the number of components in the key join sets "
-                                "should match, or one of the component sets should ",
-                                "contain a single component.")
+            key = _mask_cache_key(self.subset_state, self.data, None, version=version)
+            old_mask = self._mask_cache.get(key)
+            if old_mask is None:
+                continue
 
-        raise IncompatibleAttribute
+            try:
+                new_mask = self.subset_state.to_mask(self.data, slice(nrows, None))
+            except IncompatibleAttribute:
+                return None
 
-    @contract(view='array_view', returns='array')
-    def to_mask(self, view=None):
-        """
-        Convert the current subset to a mask.
+            if np.shape(new_mask) != (self.data.shape[0] - nrows,):
+                return None
 
-        :param view: An optional view into the dataset (e.g. a slice)
-                     If present, the mask will pertain to the view and not the
-                     entire dataset.
+            return np.concatenate([old_mask, new_mask])
 
-           A boolean numpy array, the same shape as the data, that
-           defines whether each element belongs to the subset.
+        return None
 
+    def _update_cached_mask(self, view):
         """
-        try:
-            mask = self.subset_state.to_mask(self.data, view)
+        If only some regions of the data have changed since the mask was last
+        cached, re-use the cached mask if the view does not overlap with the
+        changed regions, or otherwise re-compute the mask only for the changed
+        regions. Returns `None` if this is not possible.
+
+        This relies on the subset state being defined element by element (see
+        ``SubsetState.elementwise``), so that changing values in one region of
+        the data does not change the mask elsewhere.
+        """
+
+        for version, regions in self.data._region_versions():
+
+            key = _mask_cache_key(self.subset_state, self.data, view, version=version)
+            old_mask = self._mask_cache.get(key)
+            if old_mask is None:
+                continue
+
+            if view is not None:
+                try:
+                    overlap = any(views_overlap(self.data.shape, region, view)
+                                  for region in regions)
+                except (IndexError, TypeError, ValueError):
+                    return None
+                return None if overlap else old_mask
+
+            mask = old_mask.copy()
+
+            try:
+                for region in regions:
+                    mask[region] = self.subset_state.to_mask(self.data, region)
+            except (IncompatibleAttribute, ValueError):
+                return None
+
             return mask
-        except IncompatibleAttribute as exc:
-            return self._to_mask_join(view)
+
+        return None
 
     @contract(value=bool)
     def do_broadcast(self, value):
@@ -471,8 +530,119 @@ class Subset(object):
         return self.data.hub
 
 
+class MaskCache(ArrayCache):
+    """
+    A least-recently-used cache for subset masks.
+
+    Once the total size of the cached masks exceeds the memory budget, the
+    least recently used masks are discarded.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum total size of the cached masks, in bytes. If not specified,
+        the ``SUBSET_MASK_CACHE_SIZE`` setting is used.
+    """
+
+    size_setting = 'SUBSET_MASK_CACHE_SIZE'
+
+
+_REVERSED = {operator.gt: operator.lt, operator.ge: operator.le,
+             operator.lt: operator.gt, operator.le: operator.ge,
+             operator.eq: operator.eq, operator.ne: operator.ne}
+
+
+def _is_real(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _range_mask_from_statistics(data, att, lo, hi, view=None,
+                                include_lo=True, include_hi=True):
+    """
+    Compute the mask for a range of values of a component whose values are
+    read lazily from chunks with known minimum and maximum values (see
+    :meth:`~glue.core.component.LazyComponent.chunk_statistics`). Chunks that
+    are entirely outside the range are skipped, and chunks that are entirely
+    inside it are selected without reading them, so only the chunks that
+    straddle the range are read. Returns `None` if statistics are not
+    available.
+    """
+
+    if view is not None and view is not Ellipsis:
+        return None
+
+    try:
+        comp = data.get_component(att)
+    except IncompatibleAttribute:
+        return None
+
+    statistics = getattr(comp, 'chunk_statistics', None)
+    if statistics is None:
+        return None
+
+    statistics = statistics()
+    if statistics is None:
+        return None
+
+    above_lo = operator.ge if include_lo else operator.gt
+    below_hi = operator.le if include_hi else operator.lt
+
+    mask = np.zeros(comp.shape, dtype=bool)
+
+    for start, stop, vmin, vmax, has_missing in statistics:
+
+        if vmin is not None and vmax is not None:
+            if not above_lo(vmax, lo) or not below_hi(vmin, hi):
+                continue
+            if not has_missing and above_lo(vmin, lo) and below_hi(vmax, hi):
+                mask[start:stop] = True
+                continue
+
+        x = comp[start:stop]
+        mask[start:stop] = above_lo(x, lo) & below_hi(x, hi)
+
+    return mask
+
+
+def _read_only(mask):
+    """
+    Return a read-only view of a mask, so that cached masks can't be modified
+    by callers.
+    """
+    if isinstance(mask, np.ndarray):
+        mask = mask.view()
+        mask.setflags(write=False)
+    return mask
+
+
+def _mask_cache_key(subset_state, data, view, version=None):
+    """
+    Return the key used to cache masks for a given subset state, dataset and
+    view, or `None` if the mask should not be cached. By default, the key is
+    for the current version of the data.
+    """
+    if version is None:
+        version = data.version
+    try:
+        return subset_state, data, version, view_key(view)
+    except TypeError:
+        return None
+
+
 class SubsetState(object):
 
+    # Whether the state can compute its index list (see to_index_list)
+    # without first computing a full mask. Composite states made of such
+    # states combine the index lists directly rather than the masks.
+    _sparse = False
+
+    # Whether the state is defined element by element, i.e. whether the mask
+    # for each element only depends on the values for that element. If so,
+    # cached masks are updated incrementally when rows are appended to the
+    # data or when only part of the data changes, rather than re-computed.
+    # Subclasses need to opt in to this.
+    elementwise = False
+
     def __init__(self):
         pass
 
@@ -486,6 +656,10 @@ class SubsetState(object):
 
     @contract(data='isinstance(Data)')
     def to_index_list(self, data):
+        """
+        Return a sorted array of the indices of the elements in the (flattened)
+        data that belong to the subset.
+        """
         return np.where(self.to_mask(data).flat)[0]
 
     @contract(data='isinstance(Data)', view='array_view')
@@ -519,6 +693,8 @@ class SubsetState(object):
 
 class RoiSubsetState(SubsetState):
 
+    elementwise = True
+
     @contract(xatt='isinstance(ComponentID)', yatt='isinstance(ComponentID)')
     def __init__(self, xatt=None, yatt=None, roi=None):
         super(RoiSubsetState, self).__init__()
@@ -569,12 +745,21 @@ class RoiSubsetState(SubsetState):
 
             result = broadcast_to(result, x.shape)
 
+        elif not self.roi.defined():
+
+            result = np.zeros(x.shape, dtype=bool)
+
         else:
 
-            if self.roi.defined():
+            result = None
+
+            # For large datasets, we use sorted indices of the values so that
+            # only points inside the bounding box of the ROI need to be tested
+            if view is None and data.size >= settings.SPATIAL_INDEX_MIN_SIZE:
+                result = roi_to_mask(data, self.xatt, self.yatt, self.roi, x=x, y=y)
+
+            if result is None:
                 result = self.roi.contains(x, y)
-            else:
-                result = np.zeros(x.shape, dtype=bool)
 
         if result.shape != x.shape:
             raise ValueError("Unexpected error: boolean mask has incorrect dimensions")
@@ -591,6 +776,8 @@ class RoiSubsetState(SubsetState):
 
 class CategoricalROISubsetState(SubsetState):
 
+    elementwise = True
+
     def __init__(self, att=None, roi=None):
         super(CategoricalROISubsetState, self).__init__()
         self.att = att
@@ -600,13 +787,12 @@ class CategoricalROISubsetState(SubsetState):
     def attributes(self):
         return self.att,
 
-    @memoize
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
-        x = data.get_component(self.att)._categorical_data[view]
-        result = self.roi.contains(x, None)
-        assert x.shape == result.shape
-        return result.ravel()
+        comp = data.get_component(self.att)
+        if self.roi.categories is None:
+            return np.zeros(view_shape(comp.shape, view), dtype=bool)
+        return comp.isin(self.roi.categories, view=view)
 
     def copy(self):
         result = CategoricalROISubsetState()
@@ -633,6 +819,8 @@ class CategoricalROISubsetState(SubsetState):
 
 class RangeSubsetState(SubsetState):
 
+    elementwise = True
+
     def __init__(self, lo, hi, att=None):
         super(RangeSubsetState, self).__init__()
         self.lo = lo
@@ -645,6 +833,9 @@ class RangeSubsetState(SubsetState):
 
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
+        result = _range_mask_from_statistics(data, self.att, self.lo, self.hi, view)
+        if result is not None:
+            return result
         x = data[self.att, view]
         result = (x >= self.lo) & (x <= self.hi)
         return result
@@ -663,6 +854,8 @@ class MultiRangeSubsetState(SubsetState):
         A list of (lo, hi) tuples
     """
 
+    elementwise = True
+
     def __init__(self, pairs, att=None):
         super(MultiRangeSubsetState, self).__init__()
         self.pairs = pairs
@@ -699,6 +892,9 @@ class CategoricalROISubsetState2D(SubsetState):
     att2 : :class:`~glue.core.component_id.ComponentID`
         The component ID matching the values of the ``categories`` dictionary
     """
+
+    elementwise = True
+
     def __init__(self, categories, att1, att2):
         self.categories = categories
         self.att1 = att1
@@ -708,31 +904,25 @@ class CategoricalROISubsetState2D(SubsetState):
     def attributes(self):
         return (self.att1, self.att2)
 
-    @memoize
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
 
-        # Extract categories and numerical values
-        labels1 = data.get_component(self.att1).labels
-        labels2 = data.get_component(self.att2).labels
+        comp1 = data.get_component(self.att1)
+        comp2 = data.get_component(self.att2)
 
-        if view is not None:
-            labels1 = labels1[view]
-            labels2 = labels2[view]
+        # We build a lookup table giving for each pair of codes whether the
+        # values are selected, then evaluate the mask in code space. The last
+        # row and column are for values not in the categories, and are
+        # never selected.
+        categories1 = pd.Index(comp1.categories)
+        lookup = np.zeros((len(comp1.categories) + 1,
+                           len(comp2.categories) + 1), dtype=bool)
+        for label1, labels2 in self.categories.items():
+            code1 = categories1.get_indexer([label1])[0]
+            if code1 >= 0:
+                lookup[code1] = comp2._code_lookup(pd.Index(comp2.categories).isin(list(labels2)))
 
-        # Initialize empty mask
-        mask = np.zeros(labels1.shape, dtype=bool)
-
-        # A loop over all values here is actually reasonably efficient compared
-        # to alternatives. Any improved implementation, even vectorized, should
-        # ensure that it is more efficient for large numbers of categories and
-        # values.
-        for i in range(len(labels1)):
-            if labels1[i] in self.categories:
-                if labels2[i] in self.categories[labels1[i]]:
-                    mask[i] = True
-
-        return mask
+        return lookup[comp1._integer_codes(view), comp2._integer_codes(view)]
 
     def copy(self):
         result = CategoricalROISubsetState2D(self.categories,
@@ -768,6 +958,8 @@ class CategoricalMultiRangeSubsetState(SubsetState):
         The component ID for the numerical attribute
     """
 
+    elementwise = True
+
     def __init__(self, ranges, cat_att, num_att):
         self.ranges = ranges
         self.cat_att = cat_att
@@ -777,32 +969,29 @@ class CategoricalMultiRangeSubsetState(SubsetState):
     def attributes(self):
         return (self.cat_att, self._num_att)
 
-    @memoize
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
 
-        # Extract categories and numerical values
-        labels = data.get_component(self.cat_att).labels
-        values = data[self.num_att]
-
-        if view is not None:
-            labels = labels[view]
-            values = values[view]
+        comp = data.get_component(self.cat_att)
+        codes = comp._integer_codes(view)
+        values = data[self.num_att, view]
 
         # Initialize empty mask
         mask = np.zeros(values.shape, dtype=bool)
 
-        # A loop over all values here is actually reasonably efficient compared
-        # to alternatives. Any improved implementation, even vectorized, should
-        # ensure that it is more efficient for large numbers of categories and
-        # values. For example, using 10000 categories and 1000000 data points
-        # takes 1.2 seconds on a laptop.
-        for i in range(len(values)):
-            if labels[i] in self.ranges:
-                for lo, hi in self.ranges[labels[i]]:
-                    if values[i] >= lo and values[i] <= hi:
-                        mask[i] = True
-                        break
+        # We loop over the categories rather than the values, and only check
+        # the numerical values for the points in each category.
+        categories = pd.Index(comp.categories)
+        for label, ranges in self.ranges.items():
+            code = categories.get_indexer([label])[0]
+            if code < 0:
+                continue
+            in_category = np.nonzero(codes == code)
+            category_values = values[in_category]
+            in_ranges = np.zeros(category_values.shape, dtype=bool)
+            for lo, hi in ranges:
+                in_ranges |= (category_values >= lo) & (category_values <= hi)
+            mask[in_category] = in_ranges
 
         return mask
 
@@ -844,9 +1033,60 @@ class CompositeSubsetState(SubsetState):
             att += self.state2.attributes
         return tuple(sorted(set(att)))
 
-    @memoize
+    @property
+    def elementwise(self):
+        return self.state1.elementwise and (self.state2 is None or
+                                            self.state2.elementwise)
+
+    @property
+    def _sparse(self):
+        if self.op is operator.and_:
+            return self.state1._sparse or self.state2._sparse
+        elif self.op in (operator.or_, operator.xor):
+            return self.state1._sparse and self.state2._sparse
+        else:
+            return False
+
+    @contract(data='isinstance(Data)')
+    def to_index_list(self, data):
+
+        if not self._sparse:
+            return super(CompositeSubsetState, self).to_index_list(data)
+
+        if self.op is operator.and_:
+
+            if self.state1._sparse and self.state2._sparse:
+                return np.intersect1d(self.state1.to_index_list(data),
+                                      self.state2.to_index_list(data),
+                                      assume_unique=True)
+
+            # Only one of the states is sparse, so we evaluate the other state
+            # only for the elements selected by the sparse state.
+            if self.state1._sparse:
+                sparse, dense = self.state1, self.state2
+            else:
+                sparse, dense = self.state2, self.state1
+
+            indices = sparse.to_index_list(data)
+            if len(indices) == 0:
+                return indices
+
+            view = np.unravel_index(indices, data.shape)
+            return indices[dense.to_mask(data, view)]
+
+        elif self.op is operator.or_:
+            return np.union1d(self.state1.to_index_list(data),
+                              self.state2.to_index_list(data))
+
+        else:
+            return np.setxor1d(self.state1.to_index_list(data),
+                               self.state2.to_index_list(data),
+                               assume_unique=True)
+
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
+        if self._sparse:
+            return _indices_to_mask(self.to_index_list(data), data.shape, view)
         return self.op(self.state1.to_mask(data, view),
                        self.state2.to_mask(data, view))
 
@@ -868,7 +1108,8 @@ class XorState(CompositeSubsetState):
 
 class InvertState(CompositeSubsetState):
 
-    @memoize
+    _sparse = False
+
     @contract(data='isinstance(Data)', view='array_view')
     def to_mask(self, data, view=None):
         return ~self.state1.to_mask(data, view)
@@ -883,6 +1124,8 @@ class MaskSubsetState(SubsetState):
     A subset defined by boolean pixel mask
     """
 
+    elementwise = True
+
     def __init__(self, mask, cids):
         """
         :param cids: List of ComponentIDs, defining the pixel coordinate space of the mask
@@ -923,13 +1166,25 @@ class MaskSubsetState(SubsetState):
 
 class CategorySubsetState(SubsetState):
 
+    elementwise = True
+
     def __init__(self, attribute, values):
         super(CategorySubsetState, self).__init__()
         self._attribute = attribute
         self._values = np.asarray(values).ravel()
 
-    @memoize
     def to_mask(self, data, view=None):
+
+        # For categorical components, the values are the codes of the selected
+        # categories, so we can check the codes directly.
+        try:
+            comp = data.get_component(self._attribute)
+        except IncompatibleAttribute:
+            comp = None
+        if comp is not None and comp.categorical:
+            selected = np.in1d(np.arange(len(comp.categories)), self._values)
+            return comp._code_lookup(selected)[comp._integer_codes(view)]
+
         vals = data[self._attribute, view]
         result = np.in1d(vals.ravel(), self._values)
         return result.reshape(vals.shape)
@@ -949,6 +1204,9 @@ class CategorySubsetState(SubsetState):
 
 class ElementSubsetState(SubsetState):
 
+    _sparse = True
+    elementwise = True
+
     def __init__(self, indices=None, data=None):
         super(ElementSubsetState, self).__init__()
         self._indices = indices
@@ -957,25 +1215,31 @@ class ElementSubsetState(SubsetState):
         else:
             self._data_uuid = data.uuid
 
-    @memoize
-    def to_mask(self, data, view=None):
-        if data.uuid == self._data_uuid or self._data_uuid is None:
-            # XXX this is inefficient for views
-            result = np.zeros(data.shape, dtype=bool)
-            if self._indices is not None:
-                try:
-                    result.flat[self._indices] = True
-                except IndexError:
-                    if self._data_uuid is None:
-                        raise IncompatibleAttribute()
-                    else:
-                        raise
-            if view is not None:
-                result = result[view]
-            return result
-        else:
+    def to_index_list(self, data):
+
+        if data.uuid != self._data_uuid and self._data_uuid is not None:
             raise IncompatibleAttribute()
 
+        if self._indices is None:
+            return np.zeros(0, dtype=np.intp)
+
+        indices = np.array(self._indices, dtype=np.intp).ravel()
+        size = int(np.prod(data.shape))
+
+        if np.any((indices < -size) | (indices >= size)):
+            if self._data_uuid is None:
+                raise IncompatibleAttribute()
+            else:
+                raise IndexError("Indices out of bounds for data with "
+                                 "size {0}".format(size))
+
+        indices[indices < 0] += size
+
+        return np.unique(indices)
+
+    def to_mask(self, data, view=None):
+        return _indices_to_mask(self.to_index_list(data), data.shape, view)
+
     def copy(self):
         state = ElementSubsetState(indices=self._indices)
         state._data_uuid = self._data_uuid
@@ -997,6 +1261,8 @@ class ElementSubsetState(SubsetState):
 
 class InequalitySubsetState(SubsetState):
 
+    elementwise = True
+
     def __init__(self, left, right, op):
         from glue.core.component_link import ComponentLink
 
@@ -1032,7 +1298,64 @@ class InequalitySubsetState(SubsetState):
     def operator(self):
         return self._operator
 
-    @memoize
+    def _as_range(self):
+        """
+        If the state compares a component with a number, return the
+        ``(att, lo, hi, include_lo, include_hi)`` range of selected values,
+        otherwise return `None`.
+        """
+
+        from glue.core.component_id import ComponentID
+
+        if isinstance(self._left, ComponentID) and _is_real(self._right):
+            att, value, op = self._left, self._right, self._operator
+        elif isinstance(self._right, ComponentID) and _is_real(self._left):
+            att, value, op = self._right, self._left, _REVERSED.get(self._operator)
+        else:
+            return None
+
+        if op is operator.gt:
+            return att, value, np.inf, False, True
+        elif op is operator.ge:
+            return att, value, np.inf, True, True
+        elif op is operator.lt:
+            return att, -np.inf, value, True, False
+        elif op is operator.le:
+            return att, -np.inf, value, True, True
+        else:
+            return None
+
+    def _categorical_mask(self, data, view):
+        """
+        If the state compares a categorical component with a value, return the
+        mask computed from the codes, otherwise return `None`.
+        """
+
+        from glue.core.component_id import ComponentID
+
+        if (isinstance(self._left, ComponentID) and
+                isinstance(self._right, (numbers.Number, six.string_types))):
+            att, value, op = self._left, self._right, self._operator
+        elif (isinstance(self._right, ComponentID) and
+                isinstance(self._left, (numbers.Number, six.string_types))):
+            att, value, op = self._right, self._left, _REVERSED.get(self._operator)
+        else:
+            return None
+
+        try:
+            comp = data.get_component(att)
+        except IncompatibleAttribute:
+            return None
+
+        if not comp.categorical:
+            return None
+
+        # If the comparison can't be done element-wise (e.g. for strings
+        # compared with numbers), numpy returns a single value.
+        categories = np.asarray(comp.categories)
+        selected = np.broadcast_to(op(categories, value), categories.shape)
+        return comp._code_lookup(selected)[comp._integer_codes(view)]
+
     def to_mask(self, data, view=None):
 
         # FIXME: the default view in glue should be ... not None, because
@@ -1041,6 +1364,34 @@ class InequalitySubsetState(SubsetState):
         if view is None:
             view = Ellipsis
 
+        # Comparisons of categorical components with values are evaluated
+        # for each category rather than for each value
+        result = self._categorical_mask(data, view)
+        if result is not None:
+            return result
+
+        # Comparisons of components with values can be computed by skipping
+        # chunks of the data that are known to be outside the range
+        if view is Ellipsis:
+            bounds = self._as_range()
+            if bounds is not None:
+                att, lo, hi, include_lo, include_hi = bounds
+                result = _range_mask_from_statistics(data, att, lo, hi,
+                                                     include_lo=include_lo,
+                                                     include_hi=include_hi)
+                if result is not None:
+                    return result
+
+        # When computing the whole mask, we evaluate the comparison and any
+        # arithmetic on the components chunk by chunk.
+        if view is Ellipsis:
+            expression = compile_expression(self)
+            if expression is not None:
+                try:
+                    return expression.evaluate(data)
+                except NotCompilable:
+                    pass
+
         if isinstance(self._left, (numbers.Number, six.string_types)):
             left = self._left
         else:
@@ -1052,7 +1403,7 @@ class InequalitySubsetState(SubsetState):
                 if comp.categorical:
                     left = comp.labels[view]
                 else:
-                    left = comp.data[view]
+                    left = comp[view]
 
         if isinstance(self._right, (numbers.Number, six.string_types)):
             right = self._right
@@ -1065,7 +1416,7 @@ class InequalitySubsetState(SubsetState):
                 if comp.categorical:
                     right = comp.labels[view]
                 else:
-                    right = comp.data[view]
+                    right = comp[view]
 
 
         return self._operator(left, right)
@@ -1081,6 +1432,20 @@ class InequalitySubsetState(SubsetState):
         return '<%s: %s>' % (self.__class__.__name__, self)
 
 
+def _indices_to_mask(indices, shape, view=None):
+    """
+    Convert an array of indices into the flattened array to a boolean mask.
+    """
+    if view is None:
+        mask = np.zeros(shape, dtype=bool)
+        mask.flat[indices] = True
+        return mask
+    else:
+        # Only build the mask for the elements in the view
+        selected = np.ravel_multi_index(stack_view(shape, view), shape)
+        return np.in1d(selected, indices).reshape(np.shape(selected))
+
+
 @contract(subsets='list(isinstance(Subset))', returns=Subset)
 def _combine(subsets, operator):
     state = operator(*[s.subset_state for s in subsets])
@@ -62,6 +62,95 @@ def test_session(tmpdir):
     MockApplication.restore_session(session_file)
 
 
+def test_session_include_data(tmpdir):
+
+    import numpy as np
+    from ..state import is_bundle
+
+    session_file = tmpdir.join('test.glu').strpath
+    app = MockApplication()
+    app.data_collection.append(Data(x=np.arange(1000.), label='data'))
+    app.save_session(session_file, include_data=True)
+    assert is_bundle(session_file)
+
+    app2 = MockApplication.restore_session(session_file)
+    np.testing.assert_array_equal(app2.data_collection[0]['x'], np.arange(1000.))
+
+
+def test_session_lazy(tmpdir):
+
+    import numpy as np
+    from ..data_factories import DeferredArray, load_data, pandas_read_table
+
+    numerical = tmpdir.join('numerical.csv').strpath
+    with open(numerical, 'w') as f:
+        f.write('a,b\n1,2.5\n3,4.5\n')
+
+    categorical = tmpdir.join('categorical.csv').strpath
+    with open(categorical, 'w') as f:
+        f.write('a,b\nx,1\ny,2\n')
+
+    session_file = tmpdir.join('test.glu').strpath
+    app = MockApplication()
+    app.data_collection.append(load_data(numerical, factory=pandas_read_table))
+    app.data_collection.append(load_data(categorical, factory=pandas_read_table))
+    app.save_session(session_file)
+
+    app2 = MockApplication.restore_session(session_file, lazy=True)
+    d1, d2 = app2.data_collection
+
+    # The file is only read once the values are needed
+    comp = d1.get_component('b')
+    assert isinstance(comp.array, DeferredArray)
+    assert not comp.array.deferred.loaded
+    assert d1.shape == (2,)
+    assert comp.numeric
+    np.testing.assert_array_equal(d1['b'], [2.5, 4.5])
+    np.testing.assert_array_equal(d1['a', 1:], [3])
+    assert comp.array.deferred.loaded
+
+    # Files with categorical components are read straight away
+    assert not hasattr(d2.get_component('b'), 'array')
+    np.testing.assert_array_equal(d2['b'], [1, 2])
+
+
+def test_session_lazy_viewer_layers(tmpdir, monkeypatch):
+
+    # The files of datasets shown in viewers based on state classes should be
+    # read in the background as soon as the session is restored
+
+    import json
+    from ..data_collection import DataCollection
+    from ..state import GlueSerializer, GlueUnSerializer
+    from ..data_factories import DeferredLoad, load_data, pandas_read_table
+    from glue.viewers.scatter.state import ScatterLayerState
+
+    filename = tmpdir.join('table.csv').strpath
+    with open(filename, 'w') as f:
+        f.write('a,b\n1,2.5\n3,4.5\n')
+
+    data = load_data(filename, factory=pandas_read_table)
+    dc = DataCollection([data])
+    layer_state = ScatterLayerState(layer=data)
+
+    serializer = GlueSerializer(dc)
+    dc_id = serializer.id(dc)
+    state_id = serializer.id(layer_state)
+    rec = serializer.dumpo()
+    rec['viewer'] = {'layers': [{'state': state_id, '_type': 'ScatterLayerArtist'}]}
+
+    start = MagicMock()
+    monkeypatch.setattr(DeferredLoad, 'start', start)
+
+    context = GlueUnSerializer.loads(json.dumps(rec))
+    context.defer_loading = True
+    context.object(dc_id)
+    assert start.call_count == 0
+
+    Application._start_deferred_loading({'viewers': [['viewer']]}, context)
+    assert start.call_count > 0
+
+
 def test_set_data_color():
 
     x = Data(x=[1, 2, 3])
@@ -0,0 +1,65 @@
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+from numpy.testing import assert_equal
+
+from glue.tests.helpers import requires_pyarrow
+
+from ..component import Component, CategoricalComponent
+from ..arrow import is_arrow_array, arrow_to_component, arrow_to_data
+
+
+def test_is_arrow_array():
+    assert not is_arrow_array(np.array([1, 2, 3]))
+    assert not is_arrow_array([1, 2, 3])
+
+
+@requires_pyarrow
+class TestArrow(object):
+
+    def setup_method(self, method):
+        import pyarrow as pa
+        self.pa = pa
+        self.table = pa.table({'a': pa.array([1, 2, 3, 4], type=pa.int32()),
+                               'b': pa.array([1.5, None, 3.5, 4.5]),
+                               'c': pa.array(['x', 'y', 'x', None]),
+                               'd': pa.array(['p', 'q', 'q', 'p']).dictionary_encode()})
+
+    def test_numeric_zero_copy(self):
+        array = self.pa.array(np.arange(5.))
+        comp = arrow_to_component(array)
+        assert type(comp) is Component
+        assert_equal(comp.data, np.arange(5.))
+        assert not comp.data.flags.owndata
+
+    def test_missing_values(self):
+        comp = arrow_to_component(self.table.column('b'))
+        assert_equal(comp.data, [1.5, np.nan, 3.5, 4.5])
+
+    def test_strings(self):
+        comp = arrow_to_component(self.table.column('c'))
+        assert isinstance(comp, CategoricalComponent)
+        assert_equal(comp.categories, ['', 'x', 'y'])
+        assert_equal(comp.codes, [1, 2, 1, 0])
+        assert_equal(comp.labels, ['x', 'y', 'x', ''])
+
+    def test_dictionary_chunks(self):
+        pa = self.pa
+        # The chunks use different dictionaries, with an unused entry
+        chunk1 = pa.DictionaryArray.from_arrays(pa.array([0, 1]), pa.array(['z', 'a', 'q']))
+        chunk2 = pa.DictionaryArray.from_arrays(pa.array([1, 0]), pa.array(['b', 'a']))
+        comp = arrow_to_component(pa.chunked_array([chunk1, chunk2]))
+        assert_equal(comp.categories, ['a', 'b', 'z'])
+        assert_equal(comp.labels, ['z', 'a', 'a', 'b'])
+
+    def test_table(self):
+        data = arrow_to_data(self.table, label='catalog')
+        assert data.label == 'catalog'
+        assert [cid.label for cid in data.visible_components] == ['a', 'b', 'c', 'd']
+        assert_equal(data['a'], [1, 2, 3, 4])
+        assert_equal(data.get_component('d').labels, ['p', 'q', 'q', 'p'])
+
+    def test_qglue_parser(self):
+        from glue.qglue import parse_data
+        data = parse_data(self.table, 'catalog')[0]
+        assert_equal(data.get_component('c').labels, ['x', 'y', 'x', ''])
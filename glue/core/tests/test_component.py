@@ -7,15 +7,17 @@ import operator
 
 import pytest
 import numpy as np
+import pandas as pd
 from mock import MagicMock
 
 from glue.external import six
 from glue import core
-from glue.tests.helpers import requires_astropy
+from glue.tests.helpers import requires_astropy, requires_h5py, requires_pyarrow
 
 from ..coordinates import Coordinates
 from ..component import (Component, DerivedComponent, CoordinateComponent,
-                         CategoricalComponent)
+                         CategoricalComponent, LazyComponent, DerivedValueCache)
+from ..component_link import ComponentLink
 from ..component_id import ComponentID
 from ..data import Data
 
@@ -40,6 +42,23 @@ class TestComponent(object):
         assert self.component.ndim is len(self.data.shape)
 
 
+def test_native_dtype():
+    comp = Component(np.array([1, 2, 3], dtype=np.int16))
+    assert comp.data.dtype == np.int16
+    comp = Component(np.array([True, False]))
+    assert comp.data.dtype == np.int8
+
+
+def test_to_float32():
+    comp = Component(np.array([1., 2., 3.]))
+    comp.to_float32()
+    assert comp.data.dtype == np.float32
+    np.testing.assert_array_equal(comp.data, [1, 2, 3])
+    comp = Component(np.array([1, 2, 3]))
+    comp.to_float32()
+    assert comp.data.dtype.kind == 'i'
+
+
 class TestComponentID(object):
 
     def setup_method(self, method):
@@ -75,6 +94,64 @@ class TestDerivedComponent(object):
         assert self.cid.link == self.link
 
 
+class TestDerivedComponentCache(object):
+
+    def setup_method(self, method):
+        self.calls = 0
+
+        def double(x):
+            self.calls += 1
+            return x * 2
+
+        self.data = Data(x=[1., 2., 3.])
+        link = ComponentLink([self.data.id['x']], ComponentID('y'), double)
+        self.data.add_component_link(link)
+        self.comp = self.data.get_component(link.get_to_id())
+
+    def test_cached(self):
+        np.testing.assert_equal(self.comp.data, [2, 4, 6])
+        np.testing.assert_equal(self.comp.data, [2, 4, 6])
+        assert self.calls == 1
+
+    def test_cached_per_view(self):
+        np.testing.assert_equal(self.comp[1:], [4, 6])
+        np.testing.assert_equal(self.comp[1:], [4, 6])
+        np.testing.assert_equal(self.comp[:1], [2])
+        assert self.calls == 2
+
+    def test_not_cached_for_array_views(self):
+        self.comp[np.array([True, False, True])]
+        self.comp[np.array([True, False, True])]
+        assert self.calls == 2
+
+    def test_invalidated_on_update(self):
+        self.comp.data
+        self.data.update_components({self.data.get_component('x'): np.array([3., 4., 5.])})
+        np.testing.assert_equal(self.comp.data, [6, 8, 10])
+        assert self.calls == 2
+
+    def test_max_size(self):
+        self.comp._cache = DerivedValueCache(max_size=16)
+        self.comp.data
+        self.comp.data
+        assert self.calls == 2
+
+    def test_read_only(self):
+        with pytest.raises(ValueError):
+            self.comp.data[0] = 1
+        np.testing.assert_equal(self.comp.data, [2, 4, 6])
+        assert self.calls == 1
+
+    def test_shared_cache(self):
+        data = Data(x=[1., 2., 3.])
+        link = ComponentLink([data.id['x']], ComponentID('y'), lambda x: x * 3)
+        data.add_component_link(link)
+        comp = data.get_component(link.get_to_id())
+        assert comp._cache is self.comp._cache
+        np.testing.assert_equal(self.comp.data, [2, 4, 6])
+        np.testing.assert_equal(comp.data, [3, 6, 9])
+
+
 class TestCategoricalComponent(object):
 
     def setup_method(self, method):
@@ -194,12 +271,111 @@ class TestCategoricalComponent(object):
                                       np.array([1, 3, 'a', 'b'], dtype=object))
         np.testing.assert_array_equal(c.codes, [0, 1, 1, 0, 2, 3, 2])
 
+    def test_from_codes(self):
+        cat_comp = CategoricalComponent.from_codes([2, 0, 2, -1],
+                                                   np.array(['b', 'a', 'c'], dtype=object))
+        # Unused categories are dropped, and missing values are given an empty
+        # label
+        np.testing.assert_array_equal(cat_comp.categories, ['', 'b', 'c'])
+        np.testing.assert_array_equal(cat_comp.codes, [2, 1, 2, 0])
+        np.testing.assert_array_equal(cat_comp.labels, ['c', 'b', 'c', ''])
+
+    def test_from_codes_missing_categories(self):
+        cat_comp = CategoricalComponent.from_codes([0, 1, 2, 1], ['a', 'b', 'c'])
+        # Values that are no longer in the categories have empty labels
+        cat_comp._update_categories(np.array(['a', 'b'], dtype=object))
+        np.testing.assert_array_equal(cat_comp.labels, ['a', 'b', '', 'b'])
+        cat_comp = CategoricalComponent.from_codes([0, 1, 2], [1, 2, 3])
+        cat_comp._update_categories(np.array([2, 3]))
+        np.testing.assert_array_equal(cat_comp.labels, [np.nan, 2, 3])
+
+    def test_from_codes_equivalent(self):
+        labels = np.array(['a', 'b', 'c', 'b', 'a'], dtype=object)
+        codes = [0, 1, 2, 1, 0]
+        cat_comp = CategoricalComponent.from_codes(codes, ['a', 'b', 'c'],
+                                                   jitter='uniform')
+        second_comp = CategoricalComponent(labels, jitter='uniform')
+        np.testing.assert_array_equal(cat_comp.categories, second_comp.categories)
+        np.testing.assert_array_equal(cat_comp.codes, second_comp.codes)
+        np.testing.assert_array_equal(cat_comp.labels, second_comp.labels)
+
+    def test_autotyped_pandas_categorical(self):
+        series = pd.Series(['b', 'a', None, 'b'], dtype='category')
+        cat_comp = Component.autotyped(series)
+        assert isinstance(cat_comp, CategoricalComponent)
+        np.testing.assert_array_equal(cat_comp.categories, ['', 'a', 'b'])
+        np.testing.assert_array_equal(cat_comp.codes, [2, 1, 0, 2])
+
     def test_valueerror_on_bad_jitter(self):
 
         with pytest.raises(ValueError):
             cat_comp = CategoricalComponent(self.array_data)
             cat_comp.jitter(method='this will never be a jitter method')
 
+    @pytest.mark.parametrize(('n_categories', 'dtype'),
+                             [(2, np.int8), (127, np.int8),
+                              (128, np.int16), (40000, np.int32)])
+    def test_code_dtype(self, n_categories, dtype):
+        cat_comp = CategoricalComponent(['{0:05d}'.format(i) for i in range(n_categories)])
+        assert cat_comp._data.dtype == dtype
+        np.testing.assert_equal(cat_comp.codes[[0, -1]], [0, n_categories - 1])
+
+    def test_release_labels(self):
+        cat_comp = CategoricalComponent(self.array_data)
+        cat_comp.release_labels()
+        assert cat_comp._categorical_data is None
+        np.testing.assert_array_equal(cat_comp.labels, self.array_data)
+        np.testing.assert_array_equal(cat_comp.to_series(), self.array_data)
+
+        cat_comp = CategoricalComponent(self.array_data, keep_labels=False)
+        assert cat_comp._categorical_data is None
+
+    def test_release_labels_missing(self):
+        cat_comp = CategoricalComponent(list('abc'), categories=['a', 'b'])
+        with pytest.raises(ValueError) as exc:
+            cat_comp.release_labels()
+        assert exc.value.args[0] == ("Cannot release labels for components with "
+                                     "values that are not in the categories")
+
+    def test_jitter_view(self):
+        cat_comp = CategoricalComponent(list('abcabca'), jitter='uniform')
+        codes = cat_comp.codes
+        assert np.all(np.abs(codes - [0, 1, 2, 0, 1, 2, 0]) <= 0.5)
+        np.testing.assert_equal(cat_comp[2:5], codes[2:5])
+        np.testing.assert_equal(cat_comp[::-2], codes[::-2])
+        np.testing.assert_equal(cat_comp[[4, 1]], codes[[4, 1]])
+        assert cat_comp[3] == codes[3]
+
+    def test_append_released_labels(self):
+        cat_comp = CategoricalComponent(self.array_data, keep_labels=False)
+        assert cat_comp._append(['b', 'a'])
+        assert not cat_comp._append(['c'])
+        assert cat_comp._categorical_data is None
+        np.testing.assert_array_equal(cat_comp.labels, list('aabbbac'))
+        np.testing.assert_array_equal(cat_comp.codes, [0, 0, 1, 1, 1, 0, 2])
+
+    def test_codes_cached(self):
+        cat_comp = CategoricalComponent(self.array_data)
+        codes = cat_comp.codes
+        assert cat_comp.codes is codes
+        assert not codes.flags.writeable
+        assert cat_comp[1:3] is cat_comp[1:3]
+        cat_comp.jitter(method='uniform')
+        assert cat_comp.codes is not codes
+        assert np.any(cat_comp.codes != codes)
+        cat_comp.jitter(method=None)
+        assert cat_comp._append(['b'])
+        np.testing.assert_array_equal(cat_comp.codes, [0, 0, 1, 1, 1])
+        cat_comp._data = np.array([1, 1, 0, 0, 0], dtype=np.int8)
+        np.testing.assert_array_equal(cat_comp.codes, [1, 1, 0, 0, 0])
+
+    def test_isin(self):
+        cat_comp = CategoricalComponent(list('abcab'))
+        np.testing.assert_array_equal(cat_comp.isin(['a', 'c', 'x']),
+                                      [1, 0, 1, 1, 0])
+        np.testing.assert_array_equal(cat_comp.isin(['b'], view=slice(1, 4)),
+                                      [1, 0, 0])
+
 
 class TestCoordinateComponent(object):
 
@@ -244,6 +420,17 @@ class TestCoordinateComponent(object):
         np.testing.assert_array_equal(self.wy[view], y[view] * 2)
         np.testing.assert_array_equal(self.wz[view], z[view] * 3)
 
+    def test_world_cached(self):
+        self.data.coords.pixel2world = MagicMock(wraps=self.data.coords.pixel2world)
+        self.wx.data
+        self.wx[1]
+        self.wy[:, 1]
+        assert self.data.coords.pixel2world.call_count == 2
+
+    def test_world_not_full_size(self):
+        # Only the dependent dimension should use memory
+        assert self.wx.data.strides[:2] == (0, 0)
+
 
 def check_binary(result, left, right, op):
     assert isinstance(result, core.subset.InequalitySubsetState)
@@ -325,6 +512,83 @@ def test_view_derived(view):
     np.testing.assert_array_equal(dc[view], comp.data[view] * 3)
 
 
+class ChunkedArray(object):
+    """
+    An array-like object that keeps track of the views used to read from it
+    """
+
+    def __init__(self, array):
+        self._array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.chunks = array.shape
+        self.views = []
+
+    def __getitem__(self, view):
+        self.views.append(view)
+        return self._array[view]
+
+
+class TestLazyComponent(object):
+
+    def setup_method(self, method):
+        self.array = ChunkedArray(np.arange(24).reshape((2, 3, 4)))
+        self.data = Data()
+        self.cid = self.data.add_component(self.array, 'x')
+
+    def test_autotyped(self):
+        assert isinstance(self.data.get_component(self.cid), LazyComponent)
+        assert self.data.shape == (2, 3, 4)
+        assert self.array.views == []
+
+    def test_view(self):
+        np.testing.assert_array_equal(self.data[self.cid, 1], self.array._array[1])
+        assert self.array.views == [1]
+
+    def test_fancy_view(self):
+        np.testing.assert_array_equal(self.data[self.cid, ::-1], self.array._array[::-1])
+        assert self.array.views == [Ellipsis]
+
+    def test_index_array_view(self):
+        # Only the block containing the indexed elements is read
+        view = (slice(None), np.array([2, 1, 2]), -1)
+        np.testing.assert_array_equal(self.data[self.cid, view], self.array._array[view])
+        assert self.array.views == [(slice(None), slice(1, 3), slice(3, 4))]
+
+    def test_mask_view(self):
+        mask = np.zeros(self.array.shape, dtype=bool)
+        mask[1, 1:, 2] = True
+        np.testing.assert_array_equal(self.data[self.cid, mask], self.array._array[mask])
+        assert self.array.views == [(slice(1, 2), slice(1, 3), slice(2, 3))]
+
+    def test_data(self):
+        np.testing.assert_array_equal(self.data[self.cid], self.array._array)
+        assert self.array.views == [Ellipsis]
+
+    def test_numeric(self):
+        assert self.data.get_component(self.cid).numeric
+        assert self.array.views == []
+
+    def test_subset(self):
+        subset = self.data.new_subset()
+        subset.subset_state = self.data.id['x'] > 20
+        np.testing.assert_array_equal(subset.to_mask(view=(1, 2)), [False, True, True, True])
+        assert self.array.views == [(1, 2)]
+
+
+@requires_h5py
+def test_lazy_component_h5py(tmpdir):
+
+    import h5py
+
+    with h5py.File(tmpdir.join('test.hdf5').strpath, 'w') as f:
+        f.create_dataset('x', data=np.arange(100).reshape((10, 10)), chunks=(5, 5))
+        comp = Component.autotyped(f['x'])
+        assert isinstance(comp, LazyComponent)
+        np.testing.assert_array_equal(comp[2:4, 5], [25, 35])
+        np.testing.assert_array_equal(comp.data, np.arange(100).reshape((10, 10)))
+
+
 @requires_astropy
 def test_units():
 
@@ -342,3 +606,18 @@ def test_units():
     comp = Component([1, 2, 3], units=u.m)
     assert comp.units == 'm'
     assert isinstance(comp.units, six.string_types)
+
+
+@requires_pyarrow
+def test_autotyped_arrow():
+
+    import pyarrow as pa
+
+    comp = Component.autotyped(pa.array([1.5, 2.5, None]))
+    assert type(comp) is Component
+    np.testing.assert_array_equal(comp.data, [1.5, 2.5, np.nan])
+
+    comp = Component.autotyped(pa.chunked_array([['b', 'a'], ['a', None]]))
+    assert isinstance(comp, CategoricalComponent)
+    np.testing.assert_array_equal(comp.categories, ['', 'a', 'b'])
+    np.testing.assert_array_equal(comp.codes, [2, 1, 1, 0])
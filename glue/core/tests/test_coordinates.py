@@ -322,3 +322,32 @@ def test_world_axis_unit():
     assert coord.world_axis_unit(0) == 'm / s'
     assert coord.world_axis_unit(1) == 'deg'
     assert coord.world_axis_unit(2) == 'deg'
+
+
+@requires_astropy
+def test_world_grid_3d():
+
+    coord = coordinates_from_header(header_from_string(HDR_3D_VALID_WCS))
+    shape = (248, 82, 82)
+
+    # Spectral axis is a 1D lookup table, celestial axes a 2D table
+    spectral = coord.world_grid(shape, 0)
+    assert spectral.shape == (248, 1, 1)
+    ra = coord.world_grid(shape, 2)
+    assert ra.shape == (1, 82, 82)
+
+    z, y, x = [np.array([5]), np.array([10]), np.array([20])]
+    assert_allclose(spectral[5, 0, 0], coord.pixel2world(x, y, z)[2])
+    assert_allclose(ra[0, 10, 20], coord.pixel2world(x, y, z)[0])
+
+    # Repeated calls return the cached table
+    assert coord.world_grid(shape, 2) is ra
+    assert not ra.flags.writeable
+
+
+def test_world_grid_not_pickled():
+    import pickle
+    coord = Coordinates()
+    coord.world_grid((3, 4), 1)
+    coord2 = pickle.loads(pickle.dumps(coord))
+    assert '_world_grids' not in coord2.__dict__
@@ -16,6 +16,7 @@ from ..coordinates import Coordinates
 from ..data import Data, pixel_label
 from ..exceptions import IncompatibleAttribute
 from ..hub import Hub
+from ..message import DataRowsAppendedMessage, NumericalDataChangedMessage
 from ..registry import Registry
 from ..subset import (Subset, CategoricalROISubsetState, SubsetState,
                       RoiSubsetState, RangeSubsetState,
@@ -632,6 +633,108 @@ def test_update_values_from_data_order():
     assert [cid.label for cid in d2.visible_components] == ['j', 'a', 'c', 'b', 'f']
 
 
+def test_version():
+
+    d1 = Data(a=[1, 2, 3], b=[4, 5, 6], label='banana')
+    assert d1.version == 0
+
+    d1.update_components({d1.id['a']: [3, 2, 1]})
+    assert d1.version == 1
+
+    version = d1.version
+    d2 = Data(a=[1, 2, 3, 4], label='apple')
+    d1.update_values_from_data(d2)
+    assert d1.version > version
+
+
+def test_update_components_region():
+
+    hub = MagicMock(spec_set=Hub)
+    data = Data(x=np.zeros((3, 4)))
+    data.register_to_hub(hub)
+
+    data.update_components({data.id['x']: np.ones((3, 4))}, region=(1, slice(2, 4)))
+
+    msg = hub.broadcast.call_args[0][0]
+    assert isinstance(msg, NumericalDataChangedMessage)
+    assert msg.region == (1, slice(2, 4))
+
+    data.update_components({data.id['x']: np.ones((3, 4))}, region=2)
+    assert data._region_versions() == [(1, [2]), (0, [(1, slice(2, 4)), 2])]
+
+    data.update_components({data.id['x']: np.ones((3, 4))})
+    assert hub.broadcast.call_args[0][0].region is None
+    assert data._region_versions() == []
+
+    with pytest.raises(ValueError) as exc:
+        data.update_components({data.id['x']: np.ones((3, 4))}, region=(5, 0))
+    assert exc.value.args[0] == ("Region (5, 0) is not a valid view of data "
+                                 "with shape (3, 4)")
+
+
+class TestAppendRows(object):
+
+    def setup_method(self, method):
+        self.hub = MagicMock(spec_set=Hub)
+        self.data = Data(x=[1, 2, 3], c=['a', 'b', 'a'])
+        self.data.register_to_hub(self.hub)
+
+    def test_append(self):
+        version = self.data.version
+        for i in range(20):
+            self.data.append_rows({self.data.id['x']: [4, 5],
+                                   self.data.id['c']: ['b', 'b']})
+        assert self.data.shape == (43,)
+        assert self.data.version == version + 20
+        np.testing.assert_equal(self.data['x'][:5], [1, 2, 3, 4, 5])
+        np.testing.assert_equal(self.data['x'][-2:], [4, 5])
+        np.testing.assert_equal(self.data.get_component('c').labels[:4], ['a', 'b', 'a', 'b'])
+        np.testing.assert_equal(self.data['c'][:4], [0, 1, 0, 1])
+        np.testing.assert_equal(self.data[self.data.pixel_component_ids[0]][-2:], [41, 42])
+
+    def test_message(self):
+        self.data.append_rows({self.data.id['x']: [4, 5],
+                               self.data.id['c']: ['b', 'a']})
+        msg = self.hub.broadcast.call_args[0][0]
+        assert isinstance(msg, DataRowsAppendedMessage)
+        assert msg.start == 3
+        assert msg.stop == 5
+
+    def test_new_category(self):
+        # New categories change the codes of existing rows, so a full update
+        # is needed
+        self.data.append_rows({self.data.id['x']: [4],
+                               self.data.id['c']: ['0']})
+        np.testing.assert_equal(self.data['c'], [1, 2, 1, 0])
+        msg = self.hub.broadcast.call_args[0][0]
+        assert type(msg) is NumericalDataChangedMessage
+        assert self.data._append_versions() == []
+
+    def test_upcast(self):
+        self.data.append_rows({self.data.id['x']: [4.5],
+                               self.data.id['c']: ['a']})
+        np.testing.assert_equal(self.data['x'], [1, 2, 3, 4.5])
+
+    def test_read_only(self):
+        self.data.append_rows({self.data.id['x']: [4],
+                               self.data.id['c']: ['a']})
+        assert not self.data['x'].flags.writeable
+
+    def test_invalid(self):
+        with pytest.raises(ValueError) as exc:
+            self.data.append_rows({self.data.id['x']: [4]})
+        assert exc.value.args[0] == ("Values should be given for all the "
+                                     "non-coordinate components in the data")
+        with pytest.raises(ValueError) as exc:
+            self.data.append_rows({self.data.id['x']: [4],
+                                   self.data.id['c']: ['a', 'b']})
+        assert exc.value.args[0] == "Values should have the same length for all components"
+        data = Data(x=[[1, 2], [3, 4]])
+        with pytest.raises(ValueError) as exc:
+            data.append_rows({data.id['x']: [[5, 6]]})
+        assert exc.value.args[0] == "Rows can only be appended to one-dimensional data"
+
+
 def test_find_component_id_with_cid():
 
     # Regression test for a bug that caused Data.find_component_id to return
@@ -708,3 +811,51 @@ def test_parent_preserved_session():
 
     assert dc2[1].id['w'].parent.label == 'test2'
     assert dc2[1].id['v'].parent.label == 'test2'
+
+
+def test_compute_histogram():
+
+    values = np.array([[-1, 0.5, 1.5, 2], [3, 1.2, np.nan, 0.2]])
+    data = Data(x=values)
+    subset = data.new_subset()
+    subset.subset_state = data.id['x'] > 1
+
+    data._histogram_cache.clear()
+
+    counts, edges = data.compute_histogram(data.id['x'], range=(0, 2), bins=4)
+    np.testing.assert_equal(counts, [1, 1, 1, 2])
+    np.testing.assert_allclose(edges, [0, 0.5, 1, 1.5, 2])
+
+    # The bin indices are shared between the data and subsets
+    assert len(data._histogram_cache) == 1
+
+    counts, edges = data.compute_histogram(data.id['x'], range=(0, 2), bins=4,
+                                           subset_state=subset.subset_state)
+    np.testing.assert_equal(counts, [0, 0, 1, 2])
+    assert len(data._histogram_cache) == 1
+
+    counts, edges = data.compute_histogram(data.id['x'], range=(0.1, 10), bins=2, log=True)
+    np.testing.assert_equal(counts, [2, 4])
+    np.testing.assert_allclose(edges, [0.1, 1, 10])
+
+    # The bins are computed again when the values change
+    data.update_components({data.get_component('x'): values + 1})
+    counts, edges = data.compute_histogram(data.id['x'], range=(0, 2), bins=4)
+    np.testing.assert_equal(counts, [1, 0, 1, 1])
+
+
+def test_compute_histogram_shared_cache():
+
+    # The bin indices of all datasets are kept in the same cache, but are not
+    # mixed up even for datasets with identical component IDs and versions.
+
+    data1 = Data(x=[0.2, 0.7, 1.2])
+    data2 = Data()
+    data2.add_component([1.2, 1.7, 1.8], data1.id['x'])
+    assert data1._histogram_cache is data2._histogram_cache
+
+    cid = data1.id['x']
+    counts1, _ = data1.compute_histogram(cid, range=(0, 2), bins=2)
+    counts2, _ = data2.compute_histogram(cid, range=(0, 2), bins=2)
+    np.testing.assert_equal(counts1, [2, 1])
+    np.testing.assert_equal(counts2, [0, 3])
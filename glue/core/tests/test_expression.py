@@ -0,0 +1,113 @@
+from __future__ import absolute_import, division, print_function
+
+import operator
+
+import pytest
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
+
+from ..data import Data
+from ..component_link import ComponentLink
+from ..expression import compile_expression, NotCompilable
+
+
+class TestCompileExpression(object):
+
+    def setup_method(self, method):
+        self.data = Data(a=np.arange(20.), b=np.arange(20) % 7)
+
+    def test_flatten(self):
+        a, b = self.data.id['a'], self.data.id['b']
+        expression = compile_expression((a * 2 + b) > 5)
+        assert expression.cids == [a, b]
+        assert len(expression.operations) == 3
+
+    def test_repeated_cid(self):
+        a = self.data.id['a']
+        expression = compile_expression(a * a + a)
+        assert expression.cids == [a]
+
+    def test_constant_folding(self):
+        a = self.data.id['a']
+        expression = compile_expression(a > 2 * 3)
+        assert len(expression.operations) == 1
+
+    def test_not_compilable(self):
+        a = self.data.id['a']
+        assert compile_expression(a > 'x') is None
+        assert compile_expression(ComponentLink([a], a, lambda x: x) + 1) is None
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 7, 20, 100])
+    def test_evaluate(self, chunk_size):
+        a, b = self.data.id['a'], self.data.id['b']
+        expected = (self.data['a'] * 2 + self.data['b']) > 5
+        result = compile_expression((a * 2 + b) > 5).evaluate(self.data, chunk_size=chunk_size)
+        assert_equal(result, expected)
+
+    @pytest.mark.parametrize('chunk_size', [1, 4, 12, 100])
+    def test_evaluate_2d(self, chunk_size):
+        data = Data(x=np.arange(24.).reshape((6, 4)))
+        x = data.id['x']
+        expected = data['x'] / 3 - data['x'] ** 2
+        result = compile_expression(x / 3 - x ** 2).evaluate(data, chunk_size=chunk_size)
+        assert_allclose(result, expected)
+
+    @pytest.mark.parametrize('op', [operator.add, operator.sub,
+                                    operator.mul, operator.truediv,
+                                    operator.gt, operator.le, operator.ne])
+    def test_dtype(self, op):
+        b = self.data.id['b']
+        expected = op(self.data['b'], 2)
+        result = compile_expression(op(b, 2)).evaluate(self.data, chunk_size=3)
+        assert result.dtype == expected.dtype
+        assert_equal(result, expected)
+
+
+def test_link_and_subset_state():
+
+    data = Data(a=np.arange(10.), b=np.arange(10.) * 3)
+    a, b = data.id['a'], data.id['b']
+
+    assert_equal(data[a * 2 + b], np.arange(10.) * 5)
+    assert_equal(((a * 2 + b) > 20).to_mask(data), np.arange(10.) * 5 > 20)
+
+    # Views are evaluated without compiling
+    assert_equal(data[a * 2 + b, 2:4], [10, 15])
+    assert_equal(((a * 2 + b) > 20).to_mask(data, view=slice(3, 6)),
+                 [False, False, True])
+
+
+def test_categorical_fallback():
+
+    data = Data(a=np.arange(3.), c=['x', 'y', 'x'])
+    assert_equal((data.id['c'] == 'x').to_mask(data), [True, False, True])
+    with pytest.raises(NotCompilable):
+        compile_expression(data.id['c'] > 1).evaluate(data)
+    assert_equal((data.id['a'] > 1).to_mask(data), [False, False, True])
+
+
+def test_coordinate_components():
+
+    data = Data(x=np.zeros((4, 3)))
+    pix = data.pixel_component_ids[0]
+    expected = data[pix] * 2 > 3
+    result = compile_expression(pix * 2 > 3).evaluate(data, chunk_size=3)
+    assert_equal(result, expected)
+
+
+def test_empty_data():
+
+    # Empty data fall back to evaluating the expression without compiling
+    data = Data(a=np.zeros(0), b=np.zeros(0))
+    a, b = data.id['a'], data.id['b']
+
+    with pytest.raises(NotCompilable):
+        compile_expression(a * 2 + b).evaluate(data)
+
+    mask = (a > 1).to_mask(data)
+    assert mask.dtype == bool
+    assert mask.shape == (0,)
+
+    values = data[a * 2 + b]
+    assert isinstance(values, np.ndarray)
+    assert values.shape == (0,)
@@ -9,7 +9,8 @@ from ..data import Data
 from ..data_collection import DataCollection
 from ..exceptions import InvalidSubscriber, InvalidMessage
 from ..hub import Hub, HubListener
-from ..message import SubsetMessage, Message
+from ..message import (SubsetMessage, Message, SubsetUpdateMessage,
+                       NumericalDataChangedMessage)
 from ..subset import Subset
 
 
@@ -167,6 +168,71 @@ class TestHub(object):
         assert exc.value.args[0] == ("Inputs must be HubListener, data, "
                                      "subset, or data collection objects")
 
+    def test_subscribe_after_broadcast(self):
+
+        # Make sure that the dispatch table is updated when subscribing
+
+        msg, handler, subscriber = self.get_subscription()
+        msg, handler2, subscriber2 = self.get_subscription()
+
+        self.hub.subscribe(subscriber, msg, handler)
+        self.hub.broadcast(msg("Test"))
+
+        self.hub.subscribe(subscriber2, msg, handler2)
+        self.hub.broadcast(msg("Test"))
+
+        assert handler.call_count == 2
+        assert handler2.call_count == 1
+
+        self.hub.subscribe(subscriber, SubsetMessage, handler2)
+        self.hub.broadcast(SubsetMessage(Subset(None)))
+
+        assert handler.call_count == 2
+        assert handler2.call_count == 3
+
+    def test_dead_subscriber(self):
+
+        class Listener(HubListener):
+            def notify(self, message):
+                pass
+
+        msg, handler, subscriber = self.get_subscription()
+        listener = Listener()
+        self.hub.subscribe(listener, msg, handler)
+        self.hub.subscribe(subscriber, msg, handler)
+        self.hub.broadcast(msg("Test"))
+        assert handler.call_count == 2
+
+        del listener
+        self.hub.broadcast(msg("Test"))
+        assert handler.call_count == 3
+
+    def test_delay_callbacks_coalesce(self):
+
+        msg, handler, subscriber = self.get_subscription()
+        self.hub.subscribe(subscriber, msg, handler)
+
+        subset1 = Subset(None)
+        subset2 = Subset(None)
+        data = Data()
+
+        messages = [SubsetUpdateMessage(subset1, attribute='subset_state'),
+                    SubsetUpdateMessage(subset2, attribute='subset_state'),
+                    SubsetUpdateMessage(subset1, attribute='style'),
+                    NumericalDataChangedMessage(data),
+                    msg("Test"),
+                    SubsetUpdateMessage(subset1, attribute='subset_state'),
+                    NumericalDataChangedMessage(data),
+                    msg("Test")]
+
+        with self.hub.delay_callbacks():
+            for message in messages:
+                self.hub.broadcast(message)
+            assert handler.call_count == 0
+
+        received = [call[0][0] for call in handler.call_args_list]
+        assert received == [messages[index] for index in (1, 2, 4, 5, 6, 7)]
+
 
 class TestHubListener(object):
     """This is a dumb test, I know. Fixated on code coverage"""
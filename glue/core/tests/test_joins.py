@@ -1,10 +1,12 @@
 from __future__ import absolute_import, division, print_function
 
 import pytest
+import numpy as np
 from numpy.testing import assert_array_equal
 
 from .. import Data, DataCollection
 from ..exceptions import IncompatibleAttribute
+from ..joins import get_key_join
 from .test_state import clone
 
 
@@ -195,3 +197,69 @@ def test_mismatch():
                                  "join sets should match, or one of the "
                                  "component sets should contain a single "
                                  "component.")
+
+
+def test_many_to_many_random():
+
+    # Compare the vectorized join to a simple implementation using sets
+
+    np.random.seed(12345)
+
+    d1 = Data(x=np.random.randint(0, 5, 1000),
+              y=np.random.randint(0, 5, 1000), label='d1')
+    d2 = Data(a=np.random.randint(0, 5, 100),
+              b=np.random.randint(0, 5, 100),
+              c=np.random.random(100), label='d2')
+    d1.join_on_key(d2, ('x', 'y'), ('a', 'b'))
+
+    s = d1.new_subset()
+    s.subset_state = d2.id['c'] > 0.5
+
+    selected = d2.id['c'] > 0.5
+    selected = selected.to_mask(d2)
+    keys = set(zip(d2['a'][selected], d2['b'][selected]))
+    expected = [key in keys for key in zip(d1['x'], d1['y'])]
+
+    assert_array_equal(s.to_mask(), expected)
+
+
+def test_nan_keys():
+
+    # NaN values should never be joined
+
+    d1 = Data(x=[1, np.nan, 3], label='d1')
+    d2 = Data(a=[np.nan, 1, 3], b=[1, 2, 3], label='d2')
+    d1.join_on_key(d2, 'x', 'a')
+
+    s = d1.new_subset()
+    s.subset_state = d2.id['b'] < 3
+    assert_array_equal(s.to_mask(), [1, 0, 0])
+
+    d1 = Data(x=[1, np.nan, 3], y=[1, 2, 3], label='d1')
+    d2 = Data(a=[1, np.nan, 3], b=[1, 2, 3], label='d2')
+    d1.join_on_key(d2, ('x', 'y'), ('a', 'b'))
+
+    s = d1.new_subset()
+    s.subset_state = d2.id['b'] > 0
+    assert_array_equal(s.to_mask(), [1, 0, 1])
+
+
+def test_join_cached():
+
+    d1 = Data(x=[1, 2, 3], label='d1')
+    d2 = Data(a=[1, 2, 3], label='d2')
+    d1.join_on_key(d2, 'x', 'a')
+
+    join = get_key_join(d1, (d1.id['x'],), d2, (d2.id['a'],))
+    assert get_key_join(d1, (d1.id['x'],), d2, (d2.id['a'],)) is join
+
+    s = d1.new_subset()
+    s.subset_state = d2.id['a'] > 1
+    assert_array_equal(s.to_mask(), [0, 1, 1])
+
+    d2.update_components({d2.id['a']: [1, 3, 4]})
+    assert get_key_join(d1, (d1.id['x'],), d2, (d2.id['a'],)) is not join
+
+    s = d1.new_subset()
+    s.subset_state = d2.id['a'] > 1
+    assert_array_equal(s.to_mask(), [0, 0, 1])
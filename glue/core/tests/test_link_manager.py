@@ -258,3 +258,51 @@ class TestLinkManager(object):
         # Removing dataset should remove related links
         dc.remove(d1)
         assert len(dc.links) == 2
+
+
+class TestLinkManagerIncremental(object):
+
+    def setup_method(self, method):
+        example_components(self, add_derived=False)
+        self.lm = LinkManager()
+
+    def derivable(self):
+        return dict((cid, link) for cid, link in
+                    self.lm._get_paths(self.data).cid_links.items())
+
+    def test_paths_cached(self):
+        self.lm.add_link(self.links)
+        paths = self.lm._get_paths(self.data)
+        self.lm.update_data_components(self.data)
+        assert self.lm._get_paths(self.data) is paths
+
+    def test_add_link_incremental(self):
+        # Compute the paths first, then add links one by one
+        self.lm.update_data_components(self.data)
+        for link in self.links:
+            self.lm.add_link(link)
+            assert self.derivable() == discover_links(self.data, self.lm.links)
+
+    def test_add_shortcut_incremental(self):
+        self.lm.add_link(self.links)
+        self.lm.update_data_components(self.data)
+        shortcut = ComponentLink([self.cs[0]], self.cs[4])
+        self.lm.add_link(shortcut)
+        assert self.derivable()[self.cs[4]] is shortcut
+
+    def test_remove_link_incremental(self):
+        self.lm.add_link(self.links)
+        self.lm.update_data_components(self.data)
+        self.lm.remove_link(self.links[0])
+        derivable = self.derivable()
+        assert self.cs[2] not in derivable
+        assert self.cs[4] not in derivable
+        assert derivable == discover_links(self.data, self.lm.links)
+
+    def test_primary_components_changed(self):
+        self.lm.add_link(self.links)
+        self.lm.update_data_components(self.data)
+        assert self.cs[7] not in self.derivable()
+        self.lm.add_link(ComponentLink([self.cs[6]], self.cs[7]))
+        self.data.add_component(comp, self.cs[6])
+        assert self.cs[7] in self.derivable()
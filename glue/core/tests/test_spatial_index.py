@@ -0,0 +1,99 @@
+from __future__ import absolute_import, division, print_function
+
+import pytest
+import numpy as np
+from numpy.testing import assert_equal
+
+from glue.config import settings
+
+from ..data import Data
+from ..roi import RectangularROI, CircularROI, PolygonalROI, XRangeROI
+from ..subset import RoiSubsetState
+from .. import spatial_index
+from ..spatial_index import SortedIndex, get_sorted_index, roi_bounds, roi_to_mask
+
+
+ROIS = [RectangularROI(xmin=0.2, xmax=0.5, ymin=0.1, ymax=0.3),
+        CircularROI(xc=0.5, yc=0.4, radius=0.2),
+        PolygonalROI(vx=[0.1, 0.6, 0.3], vy=[0.1, 0.2, 0.8])]
+
+
+class TestSortedIndex(object):
+
+    def setup_method(self, method):
+        self.index = SortedIndex(np.array([[3, 1, 4], [1, 5, np.nan]]))
+
+    def test_range(self):
+        assert_equal(np.sort(self.index.range(1, 3)), [0, 1, 3])
+        assert_equal(self.index.range(6, 7), [])
+
+    def test_count(self):
+        assert self.index.count(1, 4) == 4
+        assert self.index.count(4, 1) == 0
+
+
+def test_roi_bounds():
+    assert roi_bounds(ROIS[0]) == (0.2, 0.5, 0.1, 0.3)
+    np.testing.assert_allclose(roi_bounds(ROIS[1]), (0.3, 0.7, 0.2, 0.6))
+    assert roi_bounds(ROIS[2]) == (0.1, 0.6, 0.1, 0.8)
+    assert roi_bounds(XRangeROI(1, 2)) is None
+
+
+@pytest.mark.parametrize('roi', ROIS)
+def test_roi_to_mask(roi):
+    np.random.seed(12345)
+    x = np.random.random((40, 50))
+    y = np.random.random((40, 50))
+    x[0, 3] = np.nan
+    data = Data(x=x, y=y)
+    mask = roi_to_mask(data, data.id['x'], data.id['y'], roi)
+    assert_equal(mask, roi.contains(x, y))
+
+
+def test_index_invalidated():
+
+    data = Data(x=[1, 2, 3], y=[4, 5, 6])
+
+    index = get_sorted_index(data, data.id['x'])
+    assert get_sorted_index(data, data.id['x']) is index
+
+    data.update_components({data.id['x']: [3, 2, 1]})
+    assert get_sorted_index(data, data.id['x']) is not index
+    assert_equal(get_sorted_index(data, data.id['x']).range(3, 3), [0])
+
+
+def test_index_cache_size():
+
+    data = Data(x=np.arange(100.), y=np.arange(100.))
+
+    index = get_sorted_index(data, data.id['x'])
+    assert index.nbytes == SortedIndex.estimate_nbytes(data['x'])
+    assert index.nbytes == 100 * (8 + np.dtype(np.intp).itemsize)
+
+    settings.SPATIAL_INDEX_CACHE_SIZE = index.nbytes
+    try:
+        # Only the most recently used index is kept
+        get_sorted_index(data, data.id['y'])
+        assert get_sorted_index(data, data.id['x']) is not index
+        # Indices that can't both be cached are not used
+        roi = RectangularROI(xmin=1, xmax=5, ymin=1, ymax=5)
+        assert roi_to_mask(data, data.id['x'], data.id['y'], roi) is None
+    finally:
+        settings.reset_defaults()
+
+
+@pytest.mark.parametrize('roi', ROIS)
+def test_roi_subset_state(roi):
+
+    np.random.seed(12345)
+    data = Data(x=np.random.random(1000), y=np.random.random(1000))
+    state = RoiSubsetState(xatt=data.id['x'], yatt=data.id['y'], roi=roi)
+
+    expected = state.to_mask(data)
+
+    settings.SPATIAL_INDEX_MIN_SIZE = 100
+    try:
+        assert_equal(state.to_mask(data), expected)
+        assert data in spatial_index._INDICES
+    finally:
+        settings.reset_defaults()
@@ -122,6 +122,75 @@ def test_data_factory_include_data():
     np.testing.assert_array_equal(d['PRIMARY'], d2['PRIMARY'])
 
 
+def test_bundle(tmpdir):
+
+    import zipfile
+
+    from ..state import is_bundle
+
+    values = np.random.random(1000)
+    d = core.Data(x=values, y=values, z=values.copy(), small=np.arange(1000) < 3,
+                  label='test')
+    d.add_component(CategoricalComponent(np.array(['a', 'b'] * 500)), 'c')
+
+    filename = tmpdir.join('session.glu').strpath
+    GlueSerializer(d, include_data=True).dump_bundle(filename)
+    assert is_bundle(filename)
+
+    # Identical arrays are stored only once, and small arrays are kept in the
+    # JSON state
+    with zipfile.ZipFile(filename) as zf:
+        arrays = [name for name in zf.namelist() if name.endswith('.npy')]
+    assert len(arrays) == 2
+
+    state = GlueUnSerializer.load_bundle(filename)
+    d2 = state.object('__main__')
+    bundle = state._bundle
+    state.close()
+    assert bundle._zf.fp is None
+
+    for cid in 'xyz':
+        np.testing.assert_array_equal(d2[cid], values)
+        assert isinstance(d2.get_component(cid)._data, np.memmap)
+    assert d2.get_component('x')._data is d2.get_component('z')._data
+
+    np.testing.assert_array_equal(d2['small'], d['small'])
+    np.testing.assert_array_equal(d2.get_component('c').labels,
+                                  d.get_component('c').labels)
+    assert d2.get_component('c').labels.dtype == d.get_component('c').labels.dtype
+
+
+def test_bundle_not_pickled(tmpdir):
+
+    # Arrays are stored in bundles without pickling, and object arrays that
+    # are not strings are kept in the JSON description.
+
+    import zipfile
+
+    labels = np.array(['a', 'b'] * 500, dtype=object)
+    mixed = np.array([1, 'b'] * 500, dtype=object)
+
+    filename = tmpdir.join('session.glu').strpath
+    GlueSerializer(dict(labels=labels, mixed=mixed), include_data=True).dump_bundle(filename)
+
+    with zipfile.ZipFile(filename) as zf:
+        arrays = [name for name in zf.namelist() if name.endswith('.npy')]
+        assert len(arrays) == 1
+        stored = np.lib.format.read_array(BytesIO(zf.read(arrays[0])),
+                                          allow_pickle=False)
+        assert stored.dtype.kind == 'U'
+
+    filename = tmpdir.join('labels.glu').strpath
+    GlueSerializer(labels, include_data=True).dump_bundle(filename)
+
+    state = GlueUnSerializer.load_bundle(filename)
+    labels2 = state.object('__main__')
+    state.close()
+
+    assert labels2.dtype == object
+    np.testing.assert_array_equal(labels2, labels)
+
+
 def test_save_numpy_scalar():
     assert clone(np.float32(5)) == 5
 
@@ -15,10 +15,11 @@ from glue.tests.helpers import requires_astropy
 
 from .. import DataCollection, ComponentLink
 from ..data import Data, Component
+from ..component import LazyComponent
 from ..roi import CategoricalROI, RectangularROI
 from ..message import SubsetDeleteMessage
 from ..registry import Registry
-from ..subset import (Subset, SubsetState,
+from ..subset import (Subset, SubsetState, MaskCache,
                       ElementSubsetState, RoiSubsetState, RangeSubsetState,
                       CategoricalROISubsetState, InequalitySubsetState, CategorySubsetState, MaskSubsetState, CategoricalROISubsetState2D, CategoricalMultiRangeSubsetState)
 from ..subset import AndState
@@ -304,6 +305,73 @@ class TestElementSubsetState(object):
         state = ElementSubsetState(indices=ind)
         np.testing.assert_array_equal(ind, state._indices)
 
+    def test_index_list_sorted_unique(self):
+        self.state._indices = [1, -2, 1]
+        ilist = self.state.to_index_list(self.data)
+        np.testing.assert_array_equal(ilist, np.array([0, 1]))
+
+
+class RecordingSubsetState(SubsetState):
+    """
+    Wraps a subset state and records the views with which it is evaluated
+    """
+
+    def __init__(self, state):
+        super(RecordingSubsetState, self).__init__()
+        self.state = state
+        self.views = []
+
+    def to_mask(self, data, view=None):
+        self.views.append(view)
+        return self.state.to_mask(data, view)
+
+    def copy(self):
+        return self
+
+
+class TestSparseSubsetStates(object):
+
+    def setup_method(self, method):
+        self.data = Data(x=np.arange(12).reshape((3, 4)))
+        self.e1 = ElementSubsetState(indices=[1, 5, 7, 11])
+        self.e2 = ElementSubsetState(indices=[0, 1, 7])
+        self.dense = RecordingSubsetState(self.data.id['x'] > 6)
+
+    def check(self, state, expected):
+        np.testing.assert_array_equal(state.to_index_list(self.data), expected)
+        mask = np.zeros(self.data.shape, dtype=bool)
+        mask.flat[expected] = True
+        np.testing.assert_array_equal(state.to_mask(self.data), mask)
+
+    def test_or(self):
+        self.check(self.e1 | self.e2, [0, 1, 5, 7, 11])
+
+    def test_and(self):
+        self.check(self.e1 & self.e2, [1, 7])
+
+    def test_xor(self):
+        self.check(self.e1 ^ self.e2, [0, 5, 11])
+
+    def test_and_dense(self):
+        state = self.dense & self.e1
+        np.testing.assert_array_equal(state.to_index_list(self.data), [7, 11])
+        # The dense state should only have been evaluated at the selected
+        # elements rather than for the whole dataset.
+        assert len(self.dense.views) == 1
+        view = self.dense.views[0]
+        np.testing.assert_array_equal(view[0], [0, 1, 1, 2])
+        np.testing.assert_array_equal(view[1], [1, 1, 3, 3])
+        self.check(state, [7, 11])
+
+    def test_and_dense_empty(self):
+        state = ElementSubsetState(indices=[]) & self.dense
+        self.check(state, [])
+        assert len(self.dense.views) == 0
+
+    def test_dense_fallback(self):
+        self.check(self.e1 | self.dense, [1, 5, 7, 8, 9, 10, 11])
+        self.check(~self.e1, [0, 2, 3, 4, 6, 8, 9, 10])
+
 
 class TestSubsetIo(object):
 
@@ -809,3 +877,303 @@ class TestCloneSubsetStates():
         data_clone = clone(self.data)
 
         assert_equal(data_clone.subsets[0].to_mask(), [0, 1, 0, 0])
+
+
+class TestMaskCache(object):
+
+    def test_lru_eviction(self):
+
+        cache = MaskCache(max_size=20)
+
+        cache.set('a', np.zeros(10, dtype=bool))
+        cache.set('b', np.zeros(10, dtype=bool))
+        assert cache.size == 20
+
+        # Access 'a' so that 'b' becomes the least recently used mask
+        assert cache.get('a') is not None
+
+        cache.set('c', np.zeros(10, dtype=bool))
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.size == 20
+
+    def test_too_large(self):
+        cache = MaskCache(max_size=5)
+        cache.set('a', np.zeros(10, dtype=bool))
+        assert len(cache) == 0
+        assert cache.get('a') is None
+
+    def test_clear(self):
+        cache = MaskCache(max_size=20)
+        cache.set('a', np.zeros(10, dtype=bool))
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size == 0
+
+
+class TestSubsetMaskCache(object):
+
+    def setup_method(self, method):
+        self.data = Data(x=[1, 2, 3, 4], y=[2, 3, 4, 5])
+        self.subset = self.data.new_subset()
+        self.state = self.data.id['x'] > 2
+        self.state.to_mask = MagicMock(wraps=self.state.to_mask)
+        self.subset.subset_state = self.state
+
+    def test_cached(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        assert self.state.to_mask.call_count == 1
+
+    def test_cached_views(self):
+        assert_equal(self.subset.to_mask(slice(0, 2)), [0, 0])
+        assert_equal(self.subset.to_mask((slice(1, 3),)), [0, 1])
+        assert_equal(self.subset.to_mask(slice(0, 2)), [0, 0])
+        assert self.state.to_mask.call_count == 2
+
+    def test_read_only(self):
+        mask = self.subset.to_mask()
+        with pytest.raises(ValueError):
+            mask[0] = True
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+
+    def test_cached_join(self):
+        other = Data(x=[1, 2, 3, 4], z=[1, 2, 1, 2])
+        self.data.join_on_key(other, 'x', 'x')
+        state = other.id['z'] > 1
+        state.to_mask = MagicMock(wraps=state.to_mask)
+        self.subset.subset_state = state
+        assert_equal(self.subset.to_mask(), [0, 1, 0, 1])
+        # The mask is not computed again for the joined data
+        state.to_mask.reset_mock()
+        assert_equal(self.subset.to_mask(), [0, 1, 0, 1])
+        assert [c[0][0] for c in state.to_mask.call_args_list] == [self.data]
+        # The cached mask is not used once the joined data has changed
+        other.update_components({other.id['z']: [2, 2, 1, 1]})
+        assert_equal(self.subset.to_mask(), [1, 1, 0, 0])
+
+    def test_not_cached_for_index_arrays(self):
+        self.subset.to_mask(np.array([1, 2]))
+        self.subset.to_mask(np.array([1, 2]))
+        assert self.state.to_mask.call_count == 2
+
+    def test_getitem(self):
+        assert_equal(self.subset[self.data.id['x']], [3, 4])
+        assert_equal(self.subset[self.data.id['y']], [4, 5])
+        assert self.state.to_mask.call_count == 1
+
+    def test_invalidate_on_update(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.data.update_components({self.data.id['x']: [3, 3, 1, 1]})
+        assert_equal(self.subset.to_mask(), [1, 1, 0, 0])
+        assert self.state.to_mask.call_count == 2
+
+    def test_invalidate_on_new_state(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.subset.subset_state = self.data.id['y'] > 4
+        assert_equal(self.subset.to_mask(), [0, 0, 0, 1])
+
+    def test_extend_on_append(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.data.append_rows({self.data.id['x']: [5, 0], self.data.id['y']: [1, 1]})
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1, 1, 0])
+        assert self.state.to_mask.call_count == 2
+        assert self.state.to_mask.call_args[0][1] == slice(4, None)
+
+    def test_extend_after_several_appends(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.data.append_rows({self.data.id['x']: [5], self.data.id['y']: [1]})
+        self.data.append_rows({self.data.id['x']: [1], self.data.id['y']: [1]})
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1, 1, 0])
+        assert self.state.to_mask.call_args[0][1] == slice(4, None)
+
+    def test_no_extend_after_update(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.data.append_rows({self.data.id['x']: [5], self.data.id['y']: [1]})
+        self.data.update_components({self.data.id['x']: [3, 3, 1, 1, 1]})
+        assert_equal(self.subset.to_mask(), [1, 1, 0, 0, 0])
+        assert self.state.to_mask.call_args[0][1] is None
+
+    def test_update_region(self):
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+        self.data.update_components({self.data.id['x']: [1, 5, 3, 4]}, region=slice(1, 2))
+        assert_equal(self.subset.to_mask(), [0, 1, 1, 1])
+        assert self.state.to_mask.call_count == 2
+        assert self.state.to_mask.call_args[0][1] == slice(1, 2)
+
+    def test_update_region_view(self):
+        assert_equal(self.subset.to_mask(view=slice(2, 4)), [1, 1])
+        self.data.update_components({self.data.id['x']: [1, 5, 3, 4]}, region=[1])
+        self.data.update_components({self.data.id['x']: [0, 5, 3, 4]}, region=[0])
+        # The view does not overlap with the changed regions
+        assert_equal(self.subset.to_mask(view=slice(2, 4)), [1, 1])
+        assert self.state.to_mask.call_count == 1
+        assert_equal(self.subset.to_mask(view=slice(1, 3)), [1, 1])
+        assert self.state.to_mask.call_count == 2
+
+    def test_elementwise(self):
+        assert self.state.elementwise
+        assert (self.state & (self.data.id['y'] > 2)).elementwise
+        assert not SubsetState().elementwise
+        assert not (self.state | RecordingSubsetState(self.state)).elementwise
+
+    def test_not_elementwise(self):
+
+        # States that are not defined element by element are computed again
+        # for the whole dataset when the data changes
+
+        class AboveMeanSubsetState(SubsetState):
+
+            def to_mask(self, data, view=None):
+                values = data['x']
+                mask = values > values.mean()
+                return mask if view is None else mask[view]
+
+        state = AboveMeanSubsetState()
+        state.to_mask = MagicMock(wraps=state.to_mask)
+        self.subset.subset_state = state
+        assert_equal(self.subset.to_mask(), [0, 0, 1, 1])
+
+        self.data.append_rows({self.data.id['x']: [12], self.data.id['y']: [1]})
+        assert_equal(self.subset.to_mask(), [0, 0, 0, 0, 1])
+        assert state.to_mask.call_args[0][1] is None
+
+        self.data.update_components({self.data.id['x']: [1, -20, 3, 4, 12]}, region=slice(1, 2))
+        assert_equal(self.subset.to_mask(), [1, 0, 1, 1, 1])
+        assert state.to_mask.call_args[0][1] is None
+
+
+class ChunkedArrayWithStatistics(object):
+    """
+    An array-like object that provides the range of values in each chunk,
+    and keeps track of the views used to read from it.
+    """
+
+    def __init__(self, array, chunk_size, has_missing=False):
+        self._array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.chunks = (chunk_size,)
+        self.has_missing = has_missing
+        self.views = []
+
+    def chunk_statistics(self):
+        result = []
+        for start in range(0, self.shape[0], self.chunks[0]):
+            stop = min(start + self.chunks[0], self.shape[0])
+            values = self._array[start:stop]
+            result.append((start, stop, np.nanmin(values), np.nanmax(values), self.has_missing))
+        return result
+
+    def __getitem__(self, view):
+        self.views.append(view)
+        return self._array[view]
+
+
+class TestRangeStatistics(object):
+
+    def setup_method(self, method):
+        self.array = ChunkedArrayWithStatistics(np.arange(100.), 10)
+        self.data = Data(x=LazyComponent(self.array), label='data')
+
+    def test_range(self):
+        mask = RangeSubsetState(15, 40, self.data.id['x']).to_mask(self.data)
+        assert_equal(mask, (self.array._array >= 15) & (self.array._array <= 40))
+        # Only the chunks that straddle the range are read
+        assert self.array.views == [slice(10, 20), slice(40, 50)]
+
+    @pytest.mark.parametrize(('operator', 'value'),
+                             [(op.gt, 45), (op.ge, 45), (op.lt, 45), (op.le, 45),
+                              (op.gt, 49), (op.ge, 50), (op.lt, 50), (op.le, 49)])
+    def test_inequality(self, operator, value):
+        mask = operator(self.data.id['x'], value).to_mask(self.data)
+        assert_equal(mask, operator(self.array._array, value))
+        assert len(self.array.views) <= 1
+        # The comparison can also be reversed
+        self.array.views = []
+        mask = operator(value, self.data.id['x']).to_mask(self.data)
+        assert_equal(mask, operator(value, self.array._array))
+        assert len(self.array.views) <= 1
+
+    def test_missing(self):
+        # If chunks may contain missing values, chunks have to be read even if
+        # they are inside the range.
+        self.array.has_missing = True
+        self.array._array[25] = np.nan
+        mask = RangeSubsetState(15, 40, self.data.id['x']).to_mask(self.data)
+        assert_equal(mask, (self.array._array >= 15) & (self.array._array <= 40))
+        assert self.array.views == [slice(10, 20), slice(20, 30), slice(30, 40), slice(40, 50)]
+
+    def test_view(self):
+        mask = RangeSubsetState(15, 40, self.data.id['x']).to_mask(self.data, view=slice(0, 20))
+        assert_equal(mask, (self.array._array[:20] >= 15))
+
+
+class TestCategoricalCodes(object):
+
+    # Categorical subset states are evaluated using the codes, so they should
+    # not depend on the labels being stored or on the jitter
+
+    def setup_method(self, method):
+        self.data = Data(b=['a', 'b', 'a', 'c', 'b'],
+                         c=[1.2, 1.3, 1.5, 1.9, 1.1],
+                         d=['x', 'y', 'z', 'y', 'x'])
+        for label in 'bd':
+            comp = self.data.get_component(label)
+            comp.release_labels()
+            comp.jitter(method='uniform')
+
+    @pytest.mark.parametrize('view', [None, slice(1, 4), [4, 0]])
+    def test_categorical_roi(self, view):
+        state = CategoricalROISubsetState(att=self.data.id['b'],
+                                          roi=CategoricalROI(['b', 'c']))
+        expected = np.array([0, 1, 0, 1, 1], dtype=bool)
+        assert_equal(state.to_mask(self.data, view=view),
+                     expected if view is None else expected[view])
+
+    def test_categorical_roi_undefined(self):
+        state = CategoricalROISubsetState(att=self.data.id['b'], roi=CategoricalROI())
+        assert_equal(state.to_mask(self.data), [0, 0, 0, 0, 0])
+
+    def test_categorical_roi_2d(self):
+        selection = {'a': set(['x', 'z']), 'b': ['y'], 'q': ['x']}
+        state = CategoricalROISubsetState2D(selection, self.data.id['b'], self.data.id['d'])
+        assert_equal(state.to_mask(self.data), [1, 1, 1, 0, 0])
+        assert_equal(state.to_mask(self.data, view=slice(2, 5)), [1, 0, 0])
+
+    def test_multi_range(self):
+        ranges = {'a': [(1.4, 1.6)], 'b': [(1.0, 1.15), (1.25, 1.35)], 'q': [(0, 2)]}
+        state = CategoricalMultiRangeSubsetState(ranges, self.data.id['b'], self.data.id['c'])
+        assert_equal(state.to_mask(self.data), [0, 1, 1, 0, 1])
+        assert_equal(state.to_mask(self.data, view=slice(0, 2)), [0, 1])
+
+    def test_category(self):
+        state = CategorySubsetState(self.data.id['d'], [0, 2])
+        assert_equal(state.to_mask(self.data), [1, 0, 1, 0, 1])
+
+    @pytest.mark.parametrize(('operator', 'expected'),
+                             [(op.eq, [1, 0, 1, 0, 0]), (op.ne, [0, 1, 0, 1, 1]),
+                              (op.gt, [0, 1, 0, 1, 1]), (op.le, [1, 0, 1, 0, 0])])
+    def test_inequality(self, operator, expected):
+        state = operator(self.data.id['b'], 'a')
+        assert_equal(state.to_mask(self.data), expected)
+        state = InequalitySubsetState('a', self.data.id['b'], operator)
+        assert_equal(state.to_mask(self.data), operator('a', self.data.get_component('b').labels))
+
+
+@pytest.mark.parametrize('view', [None, (slice(1, 3), slice(None, None, 2)), (2, slice(1, 4)),
+                                  (1, 3), ([0, 2], [1, 4]), np.arange(20).reshape(4, 5) % 3 == 0])
+def test_indices_to_mask(view):
+
+    from ..subset import _indices_to_mask
+
+    indices = np.array([1, 6, 8, 13, 19])
+    expected = np.zeros((4, 5), dtype=bool)
+    expected.flat[indices] = True
+    if view is not None:
+        expected = expected[view]
+
+    mask = _indices_to_mask(indices, (4, 5), view)
+    assert mask.shape == expected.shape
+    assert_equal(mask, expected)
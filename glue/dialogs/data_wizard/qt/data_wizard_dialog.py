@@ -94,14 +94,15 @@ class GlueDataDialog(object):
         factory = self.factory()
         return path, factory
 
-    def load_data(self):
-        """Highest level method to interactively load a data set.
+    def choose_files(self):
+        """Show dialog to get file paths and a data factory, checking that the
+        user didn't select a session file.
 
-        :rtype: A list of constructed data objects
+        :rtype: tuple of (list-of-strings, func)
+                giving the paths and data factory.
+                returns ([], None) if user cancels dialog
         """
-        from glue.core.data_factories import data_label, load_data
         paths, fac = self._get_paths_and_factory()
-        result = []
 
         # Check that the user didn't select a .glu file by mistake
         for path in paths:
@@ -113,7 +114,18 @@ class GlueDataDialog(object):
                                            "this using 'Open Session' under the "
                                            "'File' menu instead")
                 mb.exec_()
-                return []
+                return [], None
+
+        return paths, fac
+
+    def load_data(self):
+        """Highest level method to interactively load a data set.
+
+        :rtype: A list of constructed data objects
+        """
+        from glue.core.data_factories import data_label, load_data
+        paths, fac = self.choose_files()
+        result = []
 
         with set_cursor_cm(Qt.WaitCursor):
             for path in paths:
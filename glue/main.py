@@ -180,9 +180,10 @@ def start_glue(gluefile=None, config=None, datafiles=None, maximized=True):
     timer.timeout.connect(splash.close)
     timer.start()
 
+    # Data files are loaded in the background so that the application can
+    # be used before all the files have been read.
     if datafiles:
-        datasets = load_data_files(datafiles)
-        ga.add_datasets(data_collection, datasets)
+        ga.load_data_async(datafiles)
 
     return ga.start(maximized=maximized)
 
@@ -6,11 +6,14 @@ astrodendro must be installed in order to use this loader
 
 from __future__ import absolute_import, division, print_function
 
+import re
+
 import numpy as np
 from astrodendro import Dendrogram
 
 from glue.core.data_factories.hdf5 import is_hdf5
 from glue.core.data_factories.fits import is_fits
+from glue.core.data_factories.helpers import sniff_file
 from glue.core.data import Data
 from glue.config import data_factory
 
@@ -18,18 +21,37 @@ from glue.config import data_factory
 __all__ = ['load_dendro', 'is_dendro']
 
 
+NAXIS_CARD = re.compile(br'NAXIS   =\s*(\d+)')
+
+
+def _has_empty_primary_hdu(file):
+    # Dendrogram FITS files have an empty primary HDU, which we can check
+    # from the first header block without opening the file with Astropy.
+    sniff = sniff_file(file)
+    if sniff.compressed:
+        return True
+    cards = [sniff.header[i:i + 80] for i in range(0, len(sniff.header), 80)]
+    for card in cards:
+        match = NAXIS_CARD.match(card)
+        if match is not None:
+            return int(match.group(1)) == 0
+    return True
+
+
 def is_dendro(file, **kwargs):
 
     if is_hdf5(file):
 
         import h5py
 
-        f = h5py.File(file, 'r')
-
-        return 'data' in f and 'index_map' in f and 'newick' in f
+        with h5py.File(file, 'r') as f:
+            return 'data' in f and 'index_map' in f and 'newick' in f
 
     elif is_fits(file):
 
+        if not _has_empty_primary_hdu(file):
+            return False
+
         from astropy.io import fits
 
         hdulist = fits.open(file, ignore_missing_end=True)
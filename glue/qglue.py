@@ -76,6 +76,17 @@ def _parse_data_list(data, label):
     return [Data(**{label: data, 'label': label})]
 
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pass
+else:
+    @qglue_parser((pa.Table, pa.RecordBatch))
+    def _parse_data_arrow(data, label):
+        from glue.core.arrow import arrow_to_data
+        return [arrow_to_data(data, label=label)]
+
+
 @qglue_parser(six.string_types)
 def _parse_data_path(path, label):
     from glue.core.data_factories import load_data, as_list
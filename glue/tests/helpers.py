@@ -53,6 +53,8 @@ PLOTLY_INSTALLED, requires_plotly = make_skipper('plotly')
 
 H5PY_INSTALLED, requires_h5py = make_skipper('h5py')
 
+PYARROW_INSTALLED, requires_pyarrow = make_skipper('pyarrow')
+
 PYQT4_INSTALLED, requires_pyqt4 = make_skipper('PyQt4')
 PYQT5_INSTALLED, requires_pyqt5 = make_skipper('PyQt5')
 PYSIDE_INSTALLED, requires_pyside = make_skipper('PySide')
@@ -9,7 +9,12 @@ from glue.external.six import string_types
 
 
 __all__ = ['unique', 'shape_to_string', 'view_shape', 'stack_view',
-           'coerce_numeric', 'check_sorted', 'broadcast_to', 'unbroadcast']
+           'coerce_numeric', 'check_sorted', 'broadcast_to', 'unbroadcast',
+           'views_overlap', 'bin_indices']
+
+# The number of values processed at a time by bin_indices, to limit the size
+# of temporary arrays
+BIN_CHUNK_SIZE = 2 ** 20
 
 
 def unbroadcast(array):
@@ -82,6 +87,95 @@ def view_shape(shape, view):
     return xy[0][view].shape
 
 
+def _axis_masks(shape, view):
+    """
+    Return, for each dimension of an array, a boolean array indicating which
+    indices along that dimension are included in a view. For views that use
+    several index arrays, this gives a superset of the selected elements.
+    """
+
+    if view is None:
+        view = ()
+    elif not isinstance(view, tuple):
+        view = (view,)
+
+    # Find how many dimensions each item in the view consumes
+    ndims = []
+    for item in view:
+        if item is Ellipsis:
+            ndims.append(None)
+        elif item is None:  # new axis
+            ndims.append(0)
+        else:
+            item = np.asarray(item) if not isinstance(item, slice) else item
+            if isinstance(item, np.ndarray) and item.dtype == bool:
+                ndims.append(max(item.ndim, 1))
+            else:
+                ndims.append(1)
+
+    if ndims.count(None) > 1:
+        raise IndexError("an index can only have a single ellipsis")
+
+    n_ellipsis = len(shape) - sum(n for n in ndims if n is not None)
+
+    masks = []
+    axis = 0
+
+    for item, ndim in zip(view, ndims):
+
+        if ndim is None:
+            for _ in range(n_ellipsis):
+                masks.append(np.ones(shape[axis], dtype=bool))
+                axis += 1
+            continue
+        elif ndim == 0:
+            continue
+
+        if isinstance(item, slice):
+            mask = np.zeros(shape[axis], dtype=bool)
+            mask[item] = True
+            masks.append(mask)
+        else:
+            item = np.asarray(item)
+            if item.dtype == bool and item.ndim > 0:
+                indices = np.nonzero(item)
+            else:
+                indices = (item.ravel(),)
+            for i, index in enumerate(indices):
+                mask = np.zeros(shape[axis + i], dtype=bool)
+                mask[index] = True
+                masks.append(mask)
+
+        axis += ndim
+
+    while axis < len(shape):
+        masks.append(np.ones(shape[axis], dtype=bool))
+        axis += 1
+
+    return masks
+
+
+def views_overlap(shape, view1, view2):
+    """
+    Return whether two views of an array may select some of the same elements.
+
+    This is determined separately for each dimension, so the result may be
+    `True` for some views that do not actually overlap (e.g. views that use
+    index arrays along several dimensions), but is only `False` if the views
+    are disjoint.
+
+    Parameters
+    ----------
+    shape : tuple
+        The shape of the array
+    view1, view2
+        Valid indices into a Numpy array, or `None` to select the whole array
+    """
+    masks1 = _axis_masks(shape, view1)
+    masks2 = _axis_masks(shape, view2)
+    return all(np.any(mask1 & mask2) for mask1, mask2 in zip(masks1, masks2))
+
+
 def stack_view(shape, *views):
     shp = tuple(slice(0, s, 1) for s in shape)
     result = np.broadcast_arrays(*np.ogrid[shp])
@@ -100,7 +194,8 @@ def coerce_numeric(arr):
     Coerce an array into a numeric array, replacing non-numeric elements with
     nans.
 
-    If the array is already a numeric type, it is returned unchanged
+    If the array is already a numeric type, it is returned unchanged, and
+    boolean arrays are converted to 8-bit integers.
 
     Parameters
     ----------
@@ -111,8 +206,10 @@ def coerce_numeric(arr):
     if np.issubdtype(arr.dtype, np.number):
         return arr
 
+    # booleans are converted to the smallest integer type rather than to
+    # 64-bit integers, since they otherwise take up eight times more memory
     if np.issubdtype(arr.dtype, np.bool_):
-        return arr.astype(np.int)
+        return arr.astype(np.int8)
 
     # a string dtype, or anything else
     try:
@@ -171,3 +268,66 @@ def broadcast_to(array, shape):
     except AttributeError:
         array = np.asarray(array)
         return np.broadcast_arrays(array, np.ones(shape, array.dtype))[0]
+
+
+def bin_indices(values, edges):
+    """
+    Find the bin that each value falls in.
+
+    The bins follow the same conventions as :func:`numpy.histogram`, i.e. the
+    last bin includes its upper edge. Values outside the bins or NaN are given
+    the index ``len(edges) - 1``, one past the last bin, so that the counts
+    in each bin can be found with ``np.bincount(indices)[:-1]``.
+
+    For uniformly spaced bins, the indices are computed directly rather than
+    by searching the edges.
+
+    Parameters
+    ----------
+    values : `numpy.ndarray`
+        The values to bin. Multi-dimensional arrays are flattened.
+    edges : `numpy.ndarray`
+        The edges of the bins, in increasing order
+
+    Returns
+    -------
+    indices : `numpy.ndarray`
+        The smallest unsigned integer array that can hold the indices
+    """
+
+    values = np.asarray(values).ravel()
+    edges = np.asarray(edges, dtype=float)
+
+    n_bins = len(edges) - 1
+    lo, hi = edges[0], edges[-1]
+
+    widths = np.diff(edges)
+    uniform = hi > lo and np.allclose(widths, widths[0])
+
+    indices = np.empty(values.size, dtype=np.min_scalar_type(n_bins))
+
+    for start in range(0, values.size, BIN_CHUNK_SIZE):
+
+        x = values[start:start + BIN_CHUNK_SIZE]
+
+        with np.errstate(invalid='ignore'):
+
+            valid = (x >= lo) & (x <= hi)
+
+            if uniform:
+                index = np.zeros(len(x), dtype=np.intp)
+                index[valid] = (x[valid] - lo) * (n_bins / (hi - lo))
+                np.minimum(index, n_bins - 1, out=index)
+                # Correct for rounding errors next to the edges, as done by
+                # numpy.histogram
+                index[x < edges[index]] -= 1
+                index[(x >= edges[index + 1]) & (index < n_bins - 1)] += 1
+            else:
+                index = np.searchsorted(edges, x, side='right') - 1
+                index[x == hi] = n_bins - 1
+
+        index[~valid] = n_bins
+
+        indices[start:start + BIN_CHUNK_SIZE] = index
+
+    return indices
@@ -6,7 +6,8 @@ import numpy as np
 from glue.external.six import string_types, PY2  # noqa
 
 from ..array import (view_shape, coerce_numeric, stack_view, unique, broadcast_to,
-                     shape_to_string, check_sorted, pretty_number, unbroadcast)
+                     shape_to_string, check_sorted, pretty_number, unbroadcast,
+                     views_overlap, bin_indices)
 
 
 @pytest.mark.parametrize(('before', 'ref_after', 'ref_indices'),
@@ -48,6 +49,10 @@ def test_coerce_numeric():
 
     x = np.array([0, 1, 1, 0], dtype=bool)
     np.testing.assert_array_equal(coerce_numeric(x), np.array([0, 1, 1, 0], dtype=np.int))
+    assert coerce_numeric(x).dtype == np.int8
+
+    x = np.array([1, 2, 3], dtype=np.int16)
+    assert coerce_numeric(x) is x
 
 
 @pytest.mark.parametrize(('shape', 'views'),
@@ -114,3 +119,45 @@ def test_unbroadcast():
     z = unbroadcast(y)
     assert z.shape == (1, 1, 3)
     np.testing.assert_allclose(z[0, 0], x)
+
+
+@pytest.mark.parametrize(('view1', 'view2', 'overlap'),
+                         [(None, 3, True),
+                          (3, 2, False),
+                          (3, slice(2, 5), True),
+                          ((slice(None), 1), (slice(None), 2), False),
+                          ((Ellipsis, 1), (slice(None), slice(None), slice(0, 3)), True),
+                          ((0, slice(None), [1, 4]), (slice(1, None), 0, 2), False),
+                          ((0, slice(None), [1, 4]), (slice(0, 1), 0, 4), True),
+                          (np.arange(120).reshape((4, 5, 6)) > 100, 0, False),
+                          (np.arange(120).reshape((4, 5, 6)) > 100, 3, True),
+                          ((np.array([False, True, False, False]), 2), (Ellipsis, 2, 0), True),
+                          ((np.array([False, True, False, False]), 2), (slice(0, 1), 2), False)])
+def test_views_overlap(view1, view2, overlap):
+    shape = (4, 5, 6)
+    assert views_overlap(shape, view1, view2) is overlap
+    assert views_overlap(shape, view2, view1) is overlap
+    if not overlap:
+        # Make sure the result is correct
+        array = np.zeros(shape, dtype=int)
+        array[view1] += 1
+        array[view2] += 1
+        assert array.max() == 1
+
+
+@pytest.mark.parametrize('edges', [np.linspace(-1, 3, 11),
+                                   np.linspace(0.1, 0.7, 7),
+                                   np.logspace(-1, 1, 6)])
+def test_bin_indices(edges, monkeypatch):
+
+    from .. import array
+    monkeypatch.setattr(array, 'BIN_CHUNK_SIZE', 7)
+
+    values = np.hstack([np.random.uniform(-2, 4, 50), edges, np.nan, -np.inf, np.inf])
+    indices = bin_indices(values.reshape((-1, 2)) if values.size % 2 == 0 else values, edges)
+
+    assert indices.dtype == np.uint8
+    assert indices.max() <= len(edges) - 1
+
+    expected = np.histogram(values[np.isfinite(values)], bins=edges)[0]
+    np.testing.assert_equal(np.bincount(indices, minlength=len(edges))[:-1], expected)
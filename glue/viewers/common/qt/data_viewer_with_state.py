@@ -144,6 +144,24 @@ class DataViewerWithState(DataViewer):
                 layer_artist.update()
             self.redraw()
 
+    def _update_values(self, message):
+        for layer_artist in self._layer_artist_container:
+            if layer_artist.layer.data is message.data:
+                if message.region is not None and hasattr(layer_artist, 'update_region'):
+                    layer_artist.update_region(message.region)
+                else:
+                    layer_artist.update()
+        self.redraw()
+
+    def _append_rows(self, message):
+        for layer_artist in self._layer_artist_container:
+            if layer_artist.layer.data is message.data:
+                if hasattr(layer_artist, 'update_appended_rows'):
+                    layer_artist.update_appended_rows(message.start, message.stop)
+                else:
+                    layer_artist.update()
+        self.redraw()
+
     def _remove_subset(self, message):
         self.remove_subset(message.subset)
 
@@ -156,6 +174,9 @@ class DataViewerWithState(DataViewer):
     def _has_data_or_subset(self, x):
         return x.sender in self._layer_artist_container.layers
 
+    def _has_data_layers(self, x):
+        return any(layer.data is x.data for layer in self._layer_artist_container.layers)
+
     def _remove_data(self, message):
         self.remove_data(message.data)
 
@@ -180,8 +201,12 @@ class DataViewerWithState(DataViewer):
                       filter=self._has_data_or_subset)
 
         hub.subscribe(self, msg.NumericalDataChangedMessage,
-                      handler=self._update_subset,
-                      filter=self._has_data_or_subset)
+                      handler=self._update_values,
+                      filter=self._has_data_layers)
+
+        hub.subscribe(self, msg.DataRowsAppendedMessage,
+                      handler=self._append_rows,
+                      filter=self._has_data_layers)
 
         hub.subscribe(self, msg.DataCollectionDeleteMessage,
                       handler=self._remove_data)
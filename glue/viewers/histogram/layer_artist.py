@@ -1,6 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
 import numpy as np
+from matplotlib.patches import Polygon
 
 from glue.utils import defer_draw
 
@@ -9,6 +10,14 @@ from glue.viewers.matplotlib.layer_artist import MatplotlibLayerArtist
 from glue.core.exceptions import IncompatibleAttribute
 
 
+def _step_vertices(edges, heights, bottom):
+    # Return the vertices of the outline of the histogram bars, so that all
+    # bars can be drawn as a single polygon.
+    x = np.repeat(edges, 2)
+    y = np.hstack([bottom, np.repeat(np.maximum(heights, bottom), 2), bottom])
+    return np.column_stack([x, y])
+
+
 class HistogramLayerArtist(MatplotlibLayerArtist):
 
     _layer_state_cls = HistogramLayerState
@@ -44,8 +53,23 @@ class HistogramLayerArtist(MatplotlibLayerArtist):
 
         self.remove()
 
+        # The bins of the values are cached by the data, and shared between
+        # the layers for the data and for its subsets.
+        xmin, xmax = sorted([self._viewer_state.hist_x_min, self._viewer_state.hist_x_max])
+        if self._viewer_state.x_log:
+            # For backward-compatibility, hist_n_bin gives the number of bin
+            # edges for logarithmic bins.
+            bins = self._viewer_state.hist_n_bin - 1
+        else:
+            bins = self._viewer_state.hist_n_bin
+
+        subset_state = getattr(self.layer, 'subset_state', None)
+
         try:
-            x = self.layer[self._viewer_state.x_att]
+            counts, edges = self.layer.data.compute_histogram(self._viewer_state.x_att,
+                                                              range=(xmin, xmax), bins=bins,
+                                                              log=self._viewer_state.x_log,
+                                                              subset_state=subset_state)
         except AttributeError:
             return
         except (IncompatibleAttribute, IndexError):
@@ -54,22 +78,41 @@ class HistogramLayerArtist(MatplotlibLayerArtist):
         else:
             self._enabled = True
 
+        if counts.sum() == 0:
+            self.redraw()
+            return
+
+        self.mpl_hist_unscaled = counts
+        self.mpl_bins = edges
+
+        # All the bars are drawn as a single polygon
+        artist = Polygon(_step_vertices(edges, counts, 0), closed=True)
+        self.axes.add_patch(artist)
+        self.mpl_artists = [artist]
+
+    @defer_draw
+    def update_appended_rows(self, start, stop):
+
+        # If the histogram hasn't been computed yet, we compute it from scratch
+        if not self.enabled or getattr(self, 'mpl_bins', np.array([])).size == 0:
+            self.update()
+            return
+
+        try:
+            x, = self._get_appended_values([self._viewer_state.x_att], start, stop)
+        except IncompatibleAttribute:
+            self.update()
+            return
+
         x = x[~np.isnan(x) & (x >= self._viewer_state.hist_x_min) & (x <= self._viewer_state.hist_x_max)]
 
         if len(x) == 0:
-            self.redraw()
             return
 
-        # For histogram
-        xmin, xmax = sorted([self._viewer_state.hist_x_min, self._viewer_state.hist_x_max])
-        if self._viewer_state.x_log:
-            range = None
-            bins = np.logspace(np.log10(xmin), np.log10(xmax), self._viewer_state.hist_n_bin)
-        else:
-            range = [xmin, xmax]
-            bins = self._viewer_state.hist_n_bin
+        # We only need to add the counts for the new rows
+        self.mpl_hist_unscaled = self.mpl_hist_unscaled + np.histogram(x, bins=self.mpl_bins)[0]
 
-        self.mpl_hist_unscaled, self.mpl_bins, self.mpl_artists = self.axes.hist(x, range=range, bins=bins)
+        self._scale_histogram()
 
     @defer_draw
     def _scale_histogram(self):
@@ -89,10 +132,8 @@ class HistogramLayerArtist(MatplotlibLayerArtist):
 
         bottom = 0 if not self._viewer_state.y_log else 1e-100
 
-        for mpl_artist, y in zip(self.mpl_artists, self.mpl_hist):
-            mpl_artist.set_height(y)
-            x, y = mpl_artist.get_xy()
-            mpl_artist.set_xy((x, bottom))
+        for mpl_artist in self.mpl_artists:
+            mpl_artist.set_xy(_step_vertices(self.mpl_bins, self.mpl_hist, bottom))
 
         # We have to do the following to make sure that we reset the y_max as
         # needed. We can't simply reset based on the maximum for this layer
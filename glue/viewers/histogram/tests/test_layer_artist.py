@@ -2,6 +2,8 @@ from collections import Counter
 
 import sys
 
+import numpy as np
+
 from glue.core import Data, DataCollection
 from ..layer_artist import HistogramLayerArtist
 from ..state import HistogramViewerState
@@ -97,3 +99,73 @@ class TestHistogramLayerArtist(object):
         self.subset.style.color = '#00ff00'
         assert self.call_counter['_calculate_histogram'] == 5
         assert self.call_counter['_scale_histogram'] == 8
+
+
+
+def test_update_appended_rows():
+
+    data = Data(x=[1, 2, 3], y=[2, 3, 4])
+    dc = DataCollection([data])
+
+    viewer_state = HistogramViewerState()
+    viewer_state.data_collection = dc
+
+    artist = HistogramLayerArtist(plt.subplot(1, 1, 1), viewer_state, layer=data)
+    viewer_state.layers.append(artist.state)
+
+    assert viewer_state.x_att is data.id['x']
+    assert viewer_state.hist_x_min == 1
+    assert viewer_state.hist_x_max == 3
+
+    # Values outside the histogram limits are ignored
+    data.append_rows({data.id['x']: [1.5, 2.5, 0.5, 20],
+                      data.id['y']: [1, 1, 1, 1]})
+
+    counter = CallCounter()
+    sys.setprofile(counter)
+    try:
+        artist.update_appended_rows(3, 7)
+    finally:
+        sys.setprofile(None)
+
+    assert counter['_calculate_histogram'] == 0
+
+    expected = np.histogram(data['x'], bins=artist.mpl_bins)[0]
+    assert np.all(artist.mpl_hist_unscaled == expected)
+
+
+def test_single_artist():
+
+    # Each layer should be drawn as a single artist, and the bins should be
+    # shared between the data and subsets.
+
+    data = Data(x=[1, 2, 3, 4, 2.5], y=[2, 3, 4, 5, 6])
+    dc = DataCollection([data])
+    subset = data.new_subset()
+    subset.subset_state = data.id['x'] > 2
+
+    viewer_state = HistogramViewerState()
+    viewer_state.data_collection = dc
+
+    axes = plt.subplot(1, 1, 1)
+
+    artist1 = HistogramLayerArtist(axes, viewer_state, layer=data)
+    viewer_state.layers.append(artist1.state)
+
+    artist2 = HistogramLayerArtist(axes, viewer_state, layer=subset)
+    viewer_state.layers.append(artist2.state)
+
+    viewer_state.hist_x_min = 1
+    viewer_state.hist_x_max = 4
+    viewer_state.hist_n_bin = 3
+
+    assert len(artist1.mpl_artists) == 1
+    assert len(artist2.mpl_artists) == 1
+
+    np.testing.assert_equal(artist1.mpl_hist_unscaled, [1, 2, 2])
+    np.testing.assert_equal(artist2.mpl_hist_unscaled, [0, 1, 2])
+
+    data._histogram_cache.clear()
+    artist1._update_histogram(force=True)
+    artist2._update_histogram(force=True)
+    assert len(data._histogram_cache) == 1
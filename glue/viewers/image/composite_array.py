@@ -105,7 +105,13 @@ class CompositeArray(object):
             else:
                 scalar = False
 
-            data = STRETCHES[layer['stretch']]()(contrast_bias(interval(array)))
+            # We scale the values in-place in a single array, using single
+            # precision unless the values need double precision, to avoid
+            # creating double-precision copies of narrow types of arrays.
+            data = np.empty(array.shape, dtype=np.result_type(array.dtype, np.float32))
+            interval(array, out=data)
+            contrast_bias(data, out=data)
+            STRETCHES[layer['stretch']]()(data, out=data)
 
             if isinstance(layer['color'], Colormap):
 
@@ -10,7 +10,7 @@ from glue.utils import defer_draw
 from glue.viewers.image.state import ImageLayerState, ImageSubsetLayerState
 from glue.viewers.matplotlib.layer_artist import MatplotlibLayerArtist
 from glue.core.exceptions import IncompatibleAttribute
-from glue.utils import color2rgb
+from glue.utils import color2rgb, views_overlap
 from glue.core.link_manager import is_equivalent_cid
 from glue.core import Data, HubListener
 from glue.core.message import ComponentsChangedMessage
@@ -54,6 +54,22 @@ class BaseImageLayerArtist(MatplotlibLayerArtist, HubListener):
     def _update_image(self, force=False, **kwargs):
         raise NotImplementedError()
 
+    def _region_visible(self, region):
+        """
+        Return whether a region of the data overlaps with the slice shown in
+        the viewer.
+        """
+        if (self._viewer_state.reference_data is None or
+                self._viewer_state.x_att is None or
+                self._viewer_state.y_att is None or
+                self.layer.ndim != self._viewer_state.reference_data.ndim):
+            return True
+        slices = self._viewer_state.numpy_slice_aggregation_transpose[0]
+        try:
+            return views_overlap(self.layer.shape, region, tuple(slices))
+        except (IndexError, TypeError, ValueError):
+            return True
+
     @defer_draw
     def _update_compatibility(self, *args, **kwargs):
         """
@@ -239,6 +255,14 @@ class ImageLayerArtist(BaseImageLayerArtist):
                                                      'visible', 'stretch')):
             self._update_visual_attributes()
 
+    @defer_draw
+    def update_region(self, region):
+        # Only the slice shown needs to be re-computed, and only if it
+        # includes some of the changed values
+        if self.enabled and not self._region_visible(region):
+            return
+        self._update_image_data()
+
     @defer_draw
     def update(self):
 
@@ -370,6 +394,13 @@ class ImageSubsetLayerArtist(BaseImageLayerArtist):
         if force or any(prop in changed for prop in ('zorder', 'visible', 'alpha')):
             self._update_visual_attributes()
 
+    @defer_draw
+    def update_region(self, region):
+        if self.enabled and not self._region_visible(region):
+            return
+        self.image_artist.invalidate_cache()
+        self.redraw()
+
     @defer_draw
     def update(self):
 
@@ -1,6 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
 from glue.external.echo import keep_in_sync
+from glue.core.subset import Subset
 from glue.core.layer_artist import LayerArtistBase
 from glue.viewers.matplotlib.state import DeferredDrawCallbackProperty
 
@@ -58,6 +59,34 @@ class MatplotlibLayerArtist(LayerArtistBase):
     def get_layer_color(self):
         return self.state.color
 
+    def update_appended_rows(self, start, stop):
+        """
+        Update the layer after rows have been appended to the data, where
+        ``start`` and ``stop`` give the range of the new rows. By default,
+        the whole layer is updated.
+        """
+        self.update()
+
+    def update_region(self, region):
+        """
+        Update the layer after the values in the data have changed, where
+        ``region`` is a view that includes all the changed values. By
+        default, the whole layer is updated.
+        """
+        self.update()
+
+    def _get_appended_values(self, cids, start, stop):
+        """
+        Return the values of several components for the rows between
+        ``start`` and ``stop``, keeping only rows that are in the layer.
+        """
+        view = slice(start, stop)
+        values = [self.layer.data[cid, view] for cid in cids]
+        if isinstance(self.layer, Subset):
+            mask = self.layer.to_mask()[view]
+            values = [value[mask] for value in values]
+        return values
+
     def redraw(self):
         self.axes.figure.canvas.draw()
 
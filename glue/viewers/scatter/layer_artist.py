@@ -4,9 +4,10 @@ import numpy as np
 
 from matplotlib.colors import Normalize
 
-from glue.utils import defer_draw, broadcast_to
+from glue.utils import defer_draw, broadcast_to, stack_view
 from glue.viewers.scatter.state import ScatterLayerState
 from glue.viewers.matplotlib.layer_artist import MatplotlibLayerArtist
+from glue.core import Data
 from glue.core.exceptions import IncompatibleAttribute
 
 CMAP_PROPERTIES = set(['cmap_mode', 'cmap_att', 'cmap_vmin', 'cmap_vmax', 'cmap'])
@@ -198,10 +199,7 @@ class ScatterLayerArtist(MatplotlibLayerArtist):
                         s = self.state.size * self.state.size_scaling
                         s = broadcast_to(s, self.scatter_artist.get_sizes().shape)
                     else:
-                        s = self.layer[self.state.size_att].ravel()
-                        s = ((s - self.state.size_vmin) /
-                             (self.state.size_vmax - self.state.size_vmin)) * 30
-                        s *= self.state.size_scaling
+                        s = self._scale_sizes(self.layer[self.state.size_att].ravel())
 
                     # Note, we need to square here because for scatter, s is actually
                     # proportional to the marker area, not radius.
@@ -256,6 +254,135 @@ class ScatterLayerArtist(MatplotlibLayerArtist):
 
         self.redraw()
 
+    def _scale_sizes(self, s):
+        s = ((s - self.state.size_vmin) /
+             (self.state.size_vmax - self.state.size_vmin)) * 30
+        s *= self.state.size_scaling
+        return s
+
+    @defer_draw
+    def update_appended_rows(self, start, stop):
+
+        # Error bars are simply re-drawn from scratch
+        if (not self.enabled or len(self.mpl_artists) == 0 or
+                self.state.xerr_visible or self.state.yerr_visible):
+            self.update()
+            return
+
+        fixed = self.state.cmap_mode == 'Fixed' and self.state.size_mode == 'Fixed'
+
+        cids = [self._viewer_state.x_att, self._viewer_state.y_att]
+        if self.state.style == 'Scatter' and not fixed:
+            if self.state.cmap_mode != 'Fixed':
+                cids.append(self.state.cmap_att)
+            if self.state.size_mode != 'Fixed':
+                cids.append(self.state.size_att)
+
+        try:
+            values = [v.ravel() for v in self._get_appended_values(cids, start, stop)]
+        except IncompatibleAttribute:
+            self.update()
+            return
+
+        x, y = values[:2]
+
+        if self.state.style == 'Scatter' and not fixed:
+
+            offsets = np.vstack((self.scatter_artist.get_offsets(),
+                                 np.vstack((x, y)).transpose()))
+            self.scatter_artist.set_offsets(offsets)
+
+            if self.state.cmap_mode != 'Fixed':
+                c = np.hstack((self.scatter_artist.get_array(), values[2]))
+                self.scatter_artist.set_array(c)
+
+            if self.state.size_mode == 'Fixed':
+                s = broadcast_to(self.state.size * self.state.size_scaling, (len(offsets),))
+                self.scatter_artist.set_sizes(s ** 2)
+            else:
+                s = self._scale_sizes(values[-1])
+                self.scatter_artist.set_sizes(np.hstack((self.scatter_artist.get_sizes(), s ** 2)))
+
+        else:
+
+            if self.state.style == 'Scatter':
+                artist = self.plot_artist
+            elif self.state.style == 'Line':
+                artist = self.line_artist
+            else:
+                raise NotImplementedError(self.state.style)  # pragma: nocover
+
+            x_old, y_old = artist.get_data()
+            artist.set_data(np.hstack((x_old, x)), np.hstack((y_old, y)))
+
+        self.redraw()
+
+    @defer_draw
+    def update_region(self, region):
+
+        # For subsets, the points included in the layer may have changed, and
+        # error bars are simply re-drawn from scratch
+        if (not self.enabled or len(self.mpl_artists) == 0 or
+                not isinstance(self.layer, Data) or
+                self.state.xerr_visible or self.state.yerr_visible):
+            self.update()
+            return
+
+        fixed = self.state.cmap_mode == 'Fixed' and self.state.size_mode == 'Fixed'
+
+        cids = [self._viewer_state.x_att, self._viewer_state.y_att]
+        if self.state.style == 'Scatter' and not fixed:
+            if self.state.cmap_mode != 'Fixed':
+                cids.append(self.state.cmap_att)
+            if self.state.size_mode != 'Fixed':
+                cids.append(self.state.size_att)
+
+        try:
+            values = [self.layer[cid, region].ravel() for cid in cids]
+        except IncompatibleAttribute:
+            self.update()
+            return
+
+        # Find the positions of the changed values in the flattened arrays
+        # used for the plot, without creating arrays the size of the data
+        shape = self.layer.shape
+        index = np.ravel_multi_index(stack_view(shape, region), shape).ravel()
+
+        x, y = values[:2]
+
+        if self.state.style == 'Scatter' and not fixed:
+
+            offsets = np.array(self.scatter_artist.get_offsets())
+            offsets[index, 0] = x
+            offsets[index, 1] = y
+            self.scatter_artist.set_offsets(offsets)
+
+            if self.state.cmap_mode != 'Fixed':
+                c = np.array(self.scatter_artist.get_array())
+                c[index] = values[2]
+                self.scatter_artist.set_array(c)
+
+            if self.state.size_mode != 'Fixed':
+                s = np.array(self.scatter_artist.get_sizes())
+                s[index] = self._scale_sizes(values[-1]) ** 2
+                self.scatter_artist.set_sizes(s)
+
+        else:
+
+            if self.state.style == 'Scatter':
+                artist = self.plot_artist
+            elif self.state.style == 'Line':
+                artist = self.line_artist
+            else:
+                raise NotImplementedError(self.state.style)  # pragma: nocover
+
+            x_all, y_all = [np.array(v, dtype=float) for v in artist.get_data()]
+            x_all[index] = x
+            y_all[index] = y
+            artist.set_data(x_all, y_all)
+
+        self.redraw()
+
     @defer_draw
     def _update_scatter(self, force=False, **kwargs):
 
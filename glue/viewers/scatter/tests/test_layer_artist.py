@@ -0,0 +1,71 @@
+from numpy.testing import assert_equal, assert_allclose
+
+from glue.core import Data, DataCollection
+from ..layer_artist import ScatterLayerArtist
+from ..state import ScatterViewerState
+from matplotlib import pyplot as plt
+
+
+class TestScatterLayerArtist(object):
+
+    def setup_method(self, method):
+
+        self.viewer_state = ScatterViewerState()
+
+        ax = plt.subplot(1, 1, 1)
+
+        self.data = Data(x=[1., 2., 3., 4.], y=[2., 3., 4., 5.], z=[0., 1., 2., 3.])
+
+        dc = DataCollection([self.data])
+
+        # TODO: The following line shouldn't be needed
+        self.viewer_state.data_collection = dc
+
+        self.artist = ScatterLayerArtist(ax, self.viewer_state, layer=self.data)
+        self.layer_state = self.artist.state
+        self.viewer_state.layers.append(self.layer_state)
+
+    def test_update_region_fixed(self):
+
+        self.data.update_components({self.data.id['y']: [2., 3., 9., 5.]}, region=slice(2, 3))
+        self.artist.update_region(slice(2, 3))
+
+        x, y = self.artist.plot_artist.get_data()
+        assert_equal(x, [1, 2, 3, 4])
+        assert_equal(y, [2, 3, 9, 5])
+
+    def test_update_region_cmap(self):
+
+        self.layer_state.cmap_mode = 'Linear'
+        self.layer_state.cmap_att = self.data.id['z']
+        self.layer_state.size_mode = 'Linear'
+        self.layer_state.size_att = self.data.id['z']
+
+        sizes = self.artist.scatter_artist.get_sizes().copy()
+
+        self.data.update_components({self.data.id['y']: [2., 8., 4., 5.],
+                                     self.data.id['z']: [0., 3., 2., 3.]}, region=[1])
+        self.artist.update_region([1])
+
+        assert_equal(self.artist.scatter_artist.get_offsets(),
+                     [[1, 2], [2, 8], [3, 4], [4, 5]])
+        assert_equal(self.artist.scatter_artist.get_array(), [0, 3, 2, 3])
+        assert_allclose(self.artist.scatter_artist.get_sizes()[[0, 2, 3]], sizes[[0, 2, 3]])
+        assert_allclose(self.artist.scatter_artist.get_sizes()[1], sizes[3])
+
+    def test_update_region_2d(self):
+
+        data = Data(x=[[1., 2., 3.], [4., 5., 6.]], y=[[0., 0., 0.], [0., 0., 0.]])
+        self.viewer_state.data_collection.append(data)
+        artist = ScatterLayerArtist(self.artist.axes, self.viewer_state, layer=data)
+        self.viewer_state.layers.append(artist.state)
+        self.viewer_state.x_att = data.id['x']
+        self.viewer_state.y_att = data.id['y']
+
+        region = (slice(1, 2), slice(0, 3, 2))
+        data.update_components({data.id['y']: [[0., 0., 0.], [7., 0., 8.]]}, region=region)
+        artist.update_region(region)
+
+        x, y = artist.plot_artist.get_data()
+        assert_equal(x, [1, 2, 3, 4, 5, 6])
+        assert_equal(y, [0, 0, 0, 7, 0, 8])